@@ -11,50 +11,67 @@ Phase 1 includes:
 - FLUX2_StyleSelector: Artistic style control
 - FLUX2_SubjectCreator: Individual subject specification
 - FLUX2_SubjectArray: Multi-subject collection
+- FLUX2_SubjectArrayDynamic: Any number of subjects, chainable
 - FLUX2_CameraRig: Photography parameters
+- FLUX2_ImagePalette: Dominant colors from reference images
+- FLUX2_NearestPalette: Closest preset palettes to a set of colors
+- FLUX2_PromptSweep: Batch assembly over lists of field values
+- FLUX2_PromptTemplate: Placeholder templates filled from a variables table
+- FLUX2_VariationSampler: Seeded unique combinations of the preset tables
+- FLUX2_PromptExporter: Stream prompts to JSON Lines files
+- FLUX2_PromptDedup: Drop duplicate and near-duplicate prompts
+- FLUX2_PromptValidator: Check prompts against the FLUX.2 JSON schema
+- FLUX2_TokenBudget: Estimate token counts and flag or trim long prompts
+
+HTTP: POST /flux2/assemble assembles a JSON array of prompt specs
 
 Author: Claude & Team
 License: MIT
 """
 
-from .nodes.prompt_assembler import FLUX2_PromptAssembler
-from .nodes.scene_builder import FLUX2_SceneBuilder
-from .nodes.style_selector import FLUX2_StyleSelector
-from .nodes.subject_creator import FLUX2_SubjectCreator
-from .nodes.subject_array import FLUX2_SubjectArray
-from .nodes.camera_rig import FLUX2_CameraRig
-from .nodes.color_palette import FLUX2_ColorPalette, FLUX2_ColorPalettePreset
-
-# Node class mappings for ComfyUI registration
-NODE_CLASS_MAPPINGS = {
-    "FLUX2_PromptAssembler": FLUX2_PromptAssembler,
-    "FLUX2_SceneBuilder": FLUX2_SceneBuilder,
-    "FLUX2_StyleSelector": FLUX2_StyleSelector,
-    "FLUX2_SubjectCreator": FLUX2_SubjectCreator,
-    "FLUX2_SubjectArray": FLUX2_SubjectArray,
-    "FLUX2_CameraRig": FLUX2_CameraRig,
-    "FLUX2_ColorPalette": FLUX2_ColorPalette,
-    "FLUX2_ColorPalettePreset": FLUX2_ColorPalettePreset,
-}
-
-# Display name mappings for ComfyUI interface
-NODE_DISPLAY_NAME_MAPPINGS = {
-    "FLUX2_PromptAssembler": "FLUX2 Prompt Assembler 🎯",
-    "FLUX2_SceneBuilder": "FLUX2 Scene Builder 🏗️",
-    "FLUX2_StyleSelector": "FLUX2 Style Selector 🎨",
-    "FLUX2_SubjectCreator": "FLUX2 Subject Creator 👤",
-    "FLUX2_SubjectArray": "FLUX2 Subject Array 📋",
-    "FLUX2_CameraRig": "FLUX2 Camera Rig 📷",
-    "FLUX2_ColorPalette": "FLUX2 Color Palette 🎨",
-    "FLUX2_ColorPalettePreset": "FLUX2 Color Palette Preset 🌈",
-}
+import logging
+
+# Node classes are imported on first lookup, not at package import
+from .nodes.registry import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS
+
+logger = logging.getLogger(__name__)
+
+# Frontend extensions (dynamic subject slots)
+WEB_DIRECTORY = "./web"
 
 # Version and metadata
 __version__ = "1.0.0"
 __author__ = "Claude & Team"
 __description__ = "FLUX.2 JSON Prompt Builder - Phase 1: Core Foundation"
 
-print(f"\n{'='*60}")
-print(f"FLUX.2 JSON Prompt Builder v{__version__}")
-print(f"Phase 1: Core Foundation - 8 nodes loaded")
-print(f"{'='*60}\n")
+logger.info("FLUX.2 JSON Prompt Builder v%s: %d nodes registered",
+            __version__, len(NODE_CLASS_MAPPINGS))
+
+
+def __getattr__(name):
+    """Keep `from <package> import FLUX2_PromptAssembler` working lazily"""
+    if name in NODE_CLASS_MAPPINGS:
+        return NODE_CLASS_MAPPINGS[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _register_http_routes():
+    """
+    Add POST /flux2/assemble to ComfyUI's server. http_api (and aiohttp)
+    is only imported when ComfyUI's PromptServer is available.
+    """
+    try:
+        from server import PromptServer
+    except ImportError:
+        return False
+    if getattr(PromptServer, "instance", None) is None:
+        return False
+    try:
+        from .nodes.http_api import register_routes
+        return register_routes(PromptServer.instance.routes)
+    except Exception:
+        logger.exception("Could not add the FLUX.2 HTTP assemble route")
+        return False
+
+
+_register_http_routes()
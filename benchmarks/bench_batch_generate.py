@@ -0,0 +1,90 @@
+"""
+Measure batch generator throughput from a CSV file
+
+Writes a synthetic CSV (scene, style, two subjects, camera and palette
+columns per row), then streams it through nodes.batch_generate with one
+process and with a process pool, reporting prompts/s and prompts/hour.
+--memory adds a traced pass for the main process's peak memory, which
+stays flat as the row count grows.
+
+Run with:
+    python benchmarks/bench_batch_generate.py
+    python benchmarks/bench_batch_generate.py --rows 200000 --workers 8 --memory
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.batch_generate import generate, iter_rows
+
+SCENES = ["Urban Street", "Beach", "Forest", "Studio", "Mountain"]
+CAMERAS = ["Portrait", "Landscape", "Product", "Action"]
+MOODS = ["Calm", "Tense", "Joyful", "Mysterious"]
+
+
+def write_rows(path, count):
+    columns = ["scene.scene_type", "scene.time_of_day", "style.style_category",
+               "subject.description", "subject.color_1", "subject2.description",
+               "camera.preset", "camera.lens_mm", "mood", "color_palette"]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i in range(count):
+            writer.writerow([SCENES[i % 5], "Night" if i % 2 else "Morning", "Photorealistic",
+                             f"Red motorcycle number {i}", "#E30B17", f"Rider {i % 97}",
+                             CAMERAS[i % 4], 35 + i % 50, MOODS[i % 4], "cyan, #FF00FF"])
+
+
+def run(path, workers, chunk_rows, memory=False):
+    """Timed pass, plus a traced pass for peak memory when requested"""
+    start = time.perf_counter()
+    count = sum(len(lines) for lines, _ in generate(iter_rows(path), workers=workers,
+                                                     chunk_rows=chunk_rows))
+    elapsed = time.perf_counter() - start
+    
+    peak = None
+    if memory:
+        tracemalloc.start()
+        for _ in generate(iter_rows(path), workers=workers, chunk_rows=chunk_rows):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return count, count / elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="Rows in the synthetic CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the pooled run")
+    parser.add_argument("--chunk-rows", type=int, default=1000, help="Rows per chunk")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak traced memory")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rows.csv")
+        write_rows(path, args.rows)
+        rows = [("1 process", run(path, 1, args.chunk_rows, args.memory))]
+        if args.workers > 1:
+            rows.append((f"{args.workers} workers", run(path, args.workers, args.chunk_rows,
+                                                                   args.memory)))
+    
+    print(f"{str(args.rows) + ' rows':<16}{'prompts/s':>12}{'prompts/hour':>16}{'peak MiB':>12}")
+    print("-" * 56)
+    for name, (count, rate, peak) in rows:
+        memory = f"{peak / 2 ** 20:.1f}" if peak is not None else "-"
+        print(f"{name:<16}{rate:>12,.0f}{rate * 3600:>16,.0f}{memory:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Compare the shared color engine with the per-color parsing it replaced
+
+Normalizes the same batch of palette inputs (hex codes, shorthand, CSS
+names and invalid strings) with the old validate/format helpers and with
+colors.normalize_colors, cold (memo cleared each round) and warm.
+
+Run with:
+    python benchmarks/bench_colors.py
+    python benchmarks/bench_colors.py --batch 4
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import colors
+
+SAMPLES = ["#FF0000", "00ff00", "#00F", "ffff00", "navy", "Dark Slate Gray",
+           "not a color", "#GGGGGG", "  #c0c0c0  ", "12345"]
+
+
+def legacy_validate(color):
+    """validate_hex_color as it was before the color engine"""
+    if not color:
+        return False
+    color = color.strip()
+    if color.startswith('#'):
+        color = color[1:]
+    if len(color) not in (3, 6):
+        return False
+    try:
+        int(color, 16)
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_format(color):
+    """format_hex_color as it was before the color engine"""
+    if not color:
+        return ""
+    color = color.strip()
+    if not color.startswith('#'):
+        color = f"#{color}"
+    return color.upper()
+
+
+def legacy_palette(values):
+    """The per-color loop FLUX2_ColorPalette used to run"""
+    result = []
+    for color in values:
+        if color and color.strip() and legacy_validate(color):
+            result.append(legacy_format(color))
+    return result
+
+
+def cold_palette(values):
+    colors._memo.clear()
+    return colors.normalize_colors(values)[0]
+
+
+def ops_per_sec(func, min_time=0.2):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    return 1 / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch", type=int, default=len(SAMPLES),
+                        help="Colors per normalized batch")
+    args = parser.parse_args(argv)
+    
+    batch = (SAMPLES * (args.batch // len(SAMPLES) + 1))[:args.batch]
+    legacy = ops_per_sec(lambda: legacy_palette(batch))
+    rows = [
+        ("legacy validate + format", legacy),
+        ("normalize_colors (cold)", ops_per_sec(lambda: cold_palette(batch))),
+        ("normalize_colors (warm)", ops_per_sec(lambda: colors.normalize_colors(batch))),
+    ]
+    
+    print(f"{'batch of ' + str(args.batch) + ' colors':<40}{'batches/s':>14}{'speedup':>10}")
+    print("-" * 64)
+    for name, rate in rows:
+        print(f"{name:<40}{rate:>14,.0f}{rate / legacy:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
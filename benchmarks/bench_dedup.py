@@ -0,0 +1,90 @@
+"""
+Measure prompt dedup throughput and memory on a synthetic sweep
+
+Builds a stream of prompts in which about a third are exact duplicates
+(reordered keys, extra whitespace, empty fields) and a sixth are near
+duplicates (one word changed), then filters it with exact hashing alone
+and with MinHash/LSH enabled, reporting prompts/s and peak memory.
+
+Run with:
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --prompts 50000 --window 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.prompt_dedup import PromptDeduplicator
+
+WORDS = ("harbor market forest desert city mountain river bridge lantern fog rain "
+         "sunset dawn neon marble velvet copper glass silk shadow glow mist").split()
+STYLES = ["Oil painting", "Watercolor", "Cinematic photograph", "Ink sketch", "Pixel art"]
+
+
+def make_prompts(count, seed=7):
+    """Synthetic prompt stream with exact and near duplicates mixed in"""
+    rng = random.Random(seed)
+    prompts = []
+    for i in range(count):
+        roll = rng.random()
+        if prompts and roll < 0.33:
+            # Same prompt, different key order, spacing and empty fields
+            source = rng.choice(prompts)
+            prompts.append({"mood": "", **{key: f" {value} " for key, value in reversed(source.items())}})
+        elif prompts and roll < 0.5:
+            source = rng.choice(prompts)
+            words = source["scene"].split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            prompts.append(dict(source, scene=" ".join(words)))
+        else:
+            scene = " ".join(rng.choice(WORDS) for _ in range(24))
+            prompts.append({"scene": f"{scene} {i}", "style": rng.choice(STYLES)})
+    return prompts
+
+
+def run(prompts, **options):
+    """Timed pass, then a separate traced pass for peak memory"""
+    start = time.perf_counter()
+    kept = sum(1 for _ in PromptDeduplicator(**options).filter(prompts))
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    for _ in PromptDeduplicator(**options).filter(prompts):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, len(prompts) / elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompts", type=int, default=20000, help="Prompts in the stream")
+    parser.add_argument("--threshold", type=float, default=0.85, help="Near-duplicate threshold")
+    parser.add_argument("--window", type=int, default=0,
+                        help="Unique prompts remembered (0 = all)")
+    args = parser.parse_args(argv)
+    
+    prompts = make_prompts(args.prompts)
+    rows = [
+        ("exact", run(prompts, window=args.window)),
+        ("exact + MinHash/LSH", run(prompts, near_duplicates=True, threshold=args.threshold,
+                                    window=args.window)),
+    ]
+    
+    print(f"{str(args.prompts) + ' prompts':<24}{'kept':>10}{'prompts/s':>14}{'peak MiB':>12}")
+    print("-" * 60)
+    for name, (kept, rate, peak) in rows:
+        print(f"{name:<24}{kept:>10,}{rate:>14,.0f}{peak / 2 ** 20:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Load-test the HTTP batch assembly endpoint for requests/sec and latency
+
+Starts the standalone server (python -m nodes.http_api) in a subprocess,
+or targets a running ComfyUI with --url, and keeps --concurrency POST
+/flux2/assemble requests of --batch specs in flight until --requests
+have completed. Reports throughput in requests and prompts per second
+and the p50/p90/p99 request latency.
+
+Run with:
+    python benchmarks/bench_http.py
+    python benchmarks/bench_http.py --batch 1000 --concurrency 4 --workers 2
+    python benchmarks/bench_http.py --url http://127.0.0.1:8188
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.http_api import ROUTE
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def make_specs(count):
+    return [{"scene": f"Rainy neon street, take {index}",
+             "style": {"style_category": "Photography", "style_preset": "Cinematic"},
+             "subjects": [{"description": f"Commuter {index} with an umbrella",
+                           "position": "left side, foreground", "action": "walking"},
+                          {"description": "Street vendor", "position": "right side"}],
+             "camera": {"preset": "Street Photography"},
+             "lighting": "Neon signs reflected on wet asphalt"}
+            for index in range(count)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port, workers):
+    server = subprocess.Popen([sys.executable, "-m", "nodes.http_api", "--port", str(port),
+                               "--workers", str(workers)],
+                              cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def load(url, body, requests, concurrency):
+    latencies = []
+    remaining = iter(range(requests))
+    
+    async def post(session):
+        async with session.post(url, data=body,
+                                headers={"Content-Type": "application/json"}) as response:
+            result = await response.json()
+            if response.status != 200 or result["errors"]:
+                raise RuntimeError(f"HTTP {response.status}: {result}")
+    
+    async def client(session):
+        for _ in remaining:
+            start = time.perf_counter()
+            await post(session)
+            latencies.append(time.perf_counter() - start)
+    
+    async with aiohttp.ClientSession() as session:
+        # Warm up the server's node instances and connections
+        await asyncio.gather(*(post(session) for _ in range(concurrency)))
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        return time.perf_counter() - start, latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=None, help="Server to target (default: start one)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests to send")
+    parser.add_argument("--batch", type=int, default=50, help="Specs per request")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--workers", type=int, default=4, help="Assembly threads of the started server")
+    args = parser.parse_args(argv)
+    
+    if aiohttp is None:
+        parser.error("aiohttp is required to run the load test")
+    body = json.dumps(make_specs(args.batch)).encode("utf-8")
+    
+    server = None
+    base = args.url
+    if base is None:
+        port = free_port()
+        server = start_server(port, args.workers)
+        base = f"http://127.0.0.1:{port}"
+    try:
+        elapsed, latencies = asyncio.run(load(base.rstrip("/") + ROUTE, body,
+                                              args.requests, args.concurrency))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    
+    print(f"{args.requests} requests x {args.batch} specs, concurrency {args.concurrency} ({base})")
+    print(f"  {args.requests / elapsed:,.1f} req/s, {args.requests * args.batch / elapsed:,.0f} prompts/s")
+    print(f"  latency p50 {percentile(latencies, 0.5) * 1e3:,.1f} ms, "
+          f"p90 {percentile(latencies, 0.9) * 1e3:,.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1e3:,.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Time palette extraction on synthetic reference images
+
+Builds a smooth gradient image with noise (many distinct colors, like a
+photo) at several resolutions and times FLUX2_ImagePalette for each
+method. Inputs are torch tensors when torch is installed (as in ComfyUI),
+NumPy arrays otherwise.
+
+Run with:
+    python benchmarks/bench_image_palette.py
+    python benchmarks/bench_image_palette.py --max-ms 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.image_palette import FLUX2_ImagePalette
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+RESOLUTIONS = [("1024x1024", 1024, 1024), ("1920x1080", 1080, 1920), ("4K 3840x2160", 2160, 3840)]
+
+
+def synthetic_image(height, width, seed=0):
+    """[1, H, W, 3] float32 gradient image with per-pixel noise"""
+    rng = np.random.default_rng(seed)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    image = np.stack([x * np.ones_like(y), y * np.ones_like(x), (1 - x) * y], axis=-1)
+    image += rng.normal(0, 0.05, image.shape).astype(np.float32)
+    image = np.clip(image, 0, 1)[None]
+    return torch.from_numpy(image) if torch is not None else image
+
+
+def best_ms(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per case (best is reported)")
+    parser.add_argument("--colors", type=int, default=5, help="Colors to extract")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Exit with code 1 if any case is slower than this")
+    args = parser.parse_args(argv)
+    
+    node = FLUX2_ImagePalette()
+    print(f"input: {'torch' if torch is not None else 'numpy'}")
+    print(f"{'image':<20}{'method':<14}{'ms':>10}  palette")
+    print("-" * 78)
+    slowest = 0.0
+    for label, height, width in RESOLUTIONS:
+        image = synthetic_image(height, width)
+        for method in ("median_cut", "kmeans"):
+            colors, _ = node.extract_palette(image, num_colors=args.colors, method=method)
+            ms = best_ms(lambda: node.extract_palette(image, num_colors=args.colors,
+                                                      method=method), args.repeat)
+            slowest = max(slowest, ms)
+            print(f"{label:<20}{method:<14}{ms:>10.2f}  {' '.join(colors)}")
+    
+    if args.max_ms is not None and slowest > args.max_ms:
+        print(f"\nFAIL: slowest case {slowest:.2f} ms exceeds {args.max_ms} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+Import-time benchmark for the FLUX2 node pack
+
+Each run starts a fresh interpreter and loads the package the way
+ComfyUI does (by file location), then reports:
+- import: loading the package __init__ (what every ComfyUI start pays)
+- resolve: looking up every class in NODE_CLASS_MAPPINGS
+- object_info: building every node's INPUT_TYPES once
+
+With --comfyui a stand-in for ComfyUI's server module is loaded first
+(with aiohttp, as inside ComfyUI), so the import also covers adding the
+POST /flux2/assemble route.
+
+Run with:
+    python benchmarks/bench_import.py                  # median of 10 runs
+    python benchmarks/bench_import.py --comfyui        # as loaded by ComfyUI's server
+    python benchmarks/bench_import.py --importtime     # slowest modules (-X importtime)
+    python benchmarks/bench_import.py --max-ms 50      # exit 1 when import exceeds 50 ms
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "flux2_json_pack"
+
+# Executed in a fresh interpreter; prints one JSON line of timings in ms
+PROBE = f"""
+import importlib.util, json, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location(
+    {PACKAGE_NAME!r}, {os.path.join(ROOT, "__init__.py")!r},
+    submodule_search_locations=[{ROOT!r}])
+package = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = package
+spec.loader.exec_module(package)
+imported = time.perf_counter()
+if sys.argv[1:] == ["import-only"]:
+    sys.exit(0)
+classes = [package.NODE_CLASS_MAPPINGS[name] for name in package.NODE_CLASS_MAPPINGS]
+resolved = time.perf_counter()
+for node_class in classes:
+    node_class.INPUT_TYPES()
+finished = time.perf_counter()
+print(json.dumps({{"import": (imported - start) * 1000,
+                  "resolve": (resolved - imported) * 1000,
+                  "object_info": (finished - resolved) * 1000}}))
+"""
+
+
+# Prepended with --comfyui; ComfyUI has imported aiohttp and created its
+# server before custom nodes load
+SERVER_STUB = """
+import sys, types
+from aiohttp import web
+server = types.ModuleType("server")
+server.PromptServer = types.SimpleNamespace(
+    instance=types.SimpleNamespace(routes=web.RouteTableDef()))
+sys.modules["server"] = server
+"""
+
+
+def run_probe(comfyui=False):
+    """Run the probe once in a fresh interpreter and return its timings"""
+    probe = SERVER_STUB + PROBE if comfyui else PROBE
+    result = subprocess.run([sys.executable, "-c", probe],
+                            capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def importtime_report(limit, comfyui=False):
+    """Slowest modules imported by the package import alone (python -X importtime)"""
+    probe = SERVER_STUB + PROBE if comfyui else PROBE
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", probe, "import-only"],
+                            capture_output=True, text=True, check=True, cwd=ROOT).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), int(cumulative_us), name))
+    rows.sort(reverse=True)
+    
+    print(f"\n{'module':<48}{'self ms':>10}{'cumul ms':>10}")
+    print("-" * 68)
+    for self_us, cumulative_us, name in rows[:limit]:
+        print(f"{name.strip():<48}{self_us / 1000:>10.2f}{cumulative_us / 1000:>10.2f}")
+    
+    own = [row for row in rows if PACKAGE_NAME in row[2]]
+    print(f"\nPackage modules imported at startup: {len(own)}")
+    for self_us, _, name in own:
+        print(f"  {name.strip()} ({self_us / 1000:.2f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start")
+    parser.add_argument("--importtime", action="store_true",
+                        help="Also list the slowest modules using -X importtime")
+    parser.add_argument("--comfyui", action="store_true",
+                        help="Load a stand-in ComfyUI server first, so the HTTP route is added")
+    parser.add_argument("--limit", type=int, default=15, help="Modules shown with --importtime")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Fail (exit 1) when the median package import exceeds this")
+    args = parser.parse_args(argv)
+    
+    samples = {"import": [], "resolve": [], "object_info": []}
+    for _ in range(args.runs):
+        timings = run_probe(args.comfyui)
+        for phase, value in timings.items():
+            samples[phase].append(value)
+    
+    header = f"{'phase':<14}{'median ms':>12}{'min ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for phase, values in samples.items():
+        print(f"{phase:<14}{statistics.median(values):>12.2f}{min(values):>10.2f}{max(values):>10.2f}")
+    
+    if args.importtime:
+        importtime_report(args.limit, args.comfyui)
+    
+    median_import = statistics.median(samples["import"])
+    if args.max_ms is not None and median_import > args.max_ms:
+        print(f"\nPackage import {median_import:.2f} ms exceeds the {args.max_ms:.2f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Measure re-assembly with cached per-field fragments against a full encode
+
+Simulates the interactive loop: a prompt with a large subject array is
+assembled repeatedly while one field changes per run, as when tweaking
+a workflow and re-queuing. Compares, per run:
+- full: emit_prompt, which encodes every field each time
+- incremental: FLUX2_PromptAssembler's IncrementalEmitter, which
+  re-encodes only the changed field and splices the rest
+
+Run with:
+    python benchmarks/bench_incremental.py
+    python benchmarks/bench_incremental.py --subjects 500 --backend json
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import serialization
+from nodes.base import FLUX2Types
+from nodes.prompt_emitter import IncrementalEmitter, emit_prompt
+
+
+def make_fields(count, records):
+    subjects = []
+    for i in range(count):
+        values = (f"Person {i} in a tailored charcoal suit holding a coffee cup",
+                  "center foreground", "walking toward camera", "relaxed stride",
+                  ["#222222", "#C0A080"])
+        if records:
+            subjects.append(FLUX2Types.create_subject(*values))
+        else:
+            subjects.append(dict(zip(("description", "position", "action", "pose",
+                                      "color_palette"), values)))
+    return {"scene": "Crowded station concourse at rush hour",
+            "subjects": subjects,
+            "style": "Documentary photography",
+            "lighting": "Overcast daylight through a glass roof",
+            "camera": {"angle": "High angle", "distance": "Wide shot", "lens-mm": 24}}
+
+
+def edits(fields):
+    """One edit per run, cycling through the kinds of change a user makes"""
+    subjects = fields["subjects"]
+    step = 0
+    while True:
+        step += 1
+        kind = step % 3
+        if kind == 0:
+            fields["scene"] = f"Crowded station concourse, take {step}"
+        elif kind == 1:
+            fields["camera"]["lens-mm"] = 24 + step % 10
+        elif type(subjects[0]) is dict:
+            subjects[step % len(subjects)]["action"] = f"checking a watch ({step})"
+        else:
+            subjects[step % len(subjects)] = FLUX2Types.create_subject(
+                f"Person {step} checking a watch", "left")
+        yield
+
+
+def per_run(func, fields, number):
+    edit = edits(fields)
+    
+    def run():
+        next(edit)
+        func(**fields)
+    
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=200, help="Subjects in the prompt")
+    parser.add_argument("--runs", type=int, default=200, help="Edits per timing repeat")
+    parser.add_argument("--backend", default=None,
+                        help="JSON backend for the full encode (default: active backend)")
+    args = parser.parse_args(argv)
+    
+    if args.backend:
+        serialization.set_backend(args.backend)
+    backend = serialization.get_backend().name
+    
+    print(f"{args.subjects} subjects, one field changed per run ({backend})")
+    print(f"{'subjects as':<14}{'full us/run':>14}{'incremental':>14}{'speedup':>10}")
+    print("-" * 52)
+    for records in (False, True):
+        for pretty in (True, False):
+            fields = make_fields(args.subjects, records)
+            emitter = IncrementalEmitter(pretty)
+            assert emitter.emit(**fields) == emit_prompt(pretty, **fields)
+            full = per_run(lambda **f: emit_prompt(pretty, **f), fields, args.runs)
+            incremental = per_run(emitter.emit, fields, args.runs)
+            assert emitter.emit(**fields) == emit_prompt(pretty, **fields)
+            label = ("records" if records else "dicts") + (" pretty" if pretty else "")
+            print(f"{label:<14}{full * 1e6:>14,.1f}{incremental * 1e6:>14,.1f}"
+                  f"{full / incremental:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Benchmark suite for the FLUX2 node execute paths
+
+Times every node function over realistic and worst-case inputs and
+reports ops/sec plus memory behaviour per call:
+- peak: transient high-water mark of Python allocations during one call
+- blocks: allocations still alive after the call (the output it built)
+
+Raw ops/sec depends on the machine and its load, so every timing round
+is paired with a fixed pure-Python calibration workload and the baseline
+stores the ratio ("score"). Results can be stored as a baseline; later
+runs fail (exit code 1) when the score drops, or peak memory grows, by
+more than the allowed margin.
+
+Run with:
+    python benchmarks/bench_nodes.py                    # compare against baseline
+    python benchmarks/bench_nodes.py --save-baseline    # record a new baseline
+    python benchmarks/bench_nodes.py --margin 0.4 -k assemble
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import serialization
+from nodes.base import FLUX2BaseNode
+from nodes.camera_rig import FLUX2_CameraRig
+from nodes.color_palette import FLUX2_ColorPalette
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.scene_builder import FLUX2_SceneBuilder
+from nodes.style_selector import FLUX2_StyleSelector
+from nodes.subject_array import FLUX2_SubjectArray
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_MARGIN = 0.25
+
+
+def load_example_prompt():
+    """The Akira direct prompt from examples/ as a realistic assembler input"""
+    with open(os.path.join(ROOT, "examples", "t2i-Akira-Direct.json"), encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def deep_nested(depth, width):
+    """Nested dicts/lists with empty values sprinkled at every level"""
+    if depth == 0:
+        return {"text": "leaf value", "empty": "", "none": None, "list": ["a", "b"]}
+    return {
+        "value": f"level {depth}",
+        "blank": "   ",
+        "children": [deep_nested(depth - 1, width) for _ in range(width)],
+        "nested": {"inner": deep_nested(depth - 1, 1), "gone": []},
+    }
+
+
+def build_cases():
+    """Return (name, callable) pairs; each callable runs one node call"""
+    example = load_example_prompt()
+    long_text = "Highly detailed description with many descriptive clauses, " * 20
+    many_subjects = [dict(subject, description=f"{subject['description']} #{i}")
+                     for i, subject in enumerate(example["subjects"] * 32)]
+    worst_camera = {"angle": long_text, "distance": "Medium shot", "lens-mm": 85,
+                    "f-number": "f/2.0", "ISO": 200, "depth_of_field": long_text,
+                    "focus": long_text, "lens": "", "extra": None}
+    
+    assembler = FLUX2_PromptAssembler()
+    array = FLUX2_SubjectArray()
+    camera = FLUX2_CameraRig()
+    palette = FLUX2_ColorPalette()
+    style = FLUX2_StyleSelector()
+    scene = FLUX2_SceneBuilder()
+    
+    eight_subjects = {f"subject_{i}": {"description": long_text, "position": "center",
+                                       "color_palette": ["#000000", "#FFFFFF"]}
+                      for i in range(1, 9)}
+    deep = deep_nested(6, 3)
+    wide = {f"field_{i}": ("" if i % 3 == 0 else f"value {i}") for i in range(2000)}
+    
+    return [
+        ("assemble_prompt/example", lambda: assembler.assemble_prompt(**example)),
+        ("assemble_prompt/example_compact",
+         lambda: assembler.assemble_prompt(pretty_print=False, **example)),
+        ("assemble_prompt/64_subjects",
+         lambda: assembler.assemble_prompt(scene=example["scene"], subjects=many_subjects,
+                                           style=long_text, camera=worst_camera,
+                                           color_palette=example["color_palette"])),
+        ("collect_subjects/3", lambda: array.collect_subjects(
+            subject_1=example["subjects"][0], subject_2=example["subjects"][1],
+            subject_3=example["subjects"][0])),
+        ("collect_subjects/8_long", lambda: array.collect_subjects(**eight_subjects)),
+        ("setup_camera/preset", lambda: camera.setup_camera(preset="Portrait")),
+        ("setup_camera/full_custom", lambda: camera.setup_camera(
+            preset="Product Photography", angle=long_text, distance="Custom",
+            custom_distance=long_text, lens_mm=135, lens_description="Telephoto",
+            f_number="f/4", iso=800, depth_of_field=long_text, focus=long_text,
+            override_preset=True)),
+        ("create_palette/valid", lambda: palette.create_palette(
+            color_1="#FF0000", color_2="00ff00", color_3="#00F", color_4="FFFF00")),
+        ("create_palette/invalid", lambda: palette.create_palette(
+            color_1="not a color", color_2="#GGGGGG", color_3="12345", color_4="   ")),
+        ("select_style/preset", lambda: style.select_style(
+            style_category="Film Photography",
+            style_preset="Film Photography: Medium format film, Hasselblad with Kodak Ektar 100",
+            quality_level="Editorial quality")),
+        ("select_style/no_match", lambda: style.select_style(
+            style_category="Technical", style_preset="Technical: " + long_text,
+            additional_modifiers=long_text)),
+        ("build_scene/preset", lambda: scene.build_scene(
+            scene_type="Urban Street", time_of_day="Golden Hour", weather="Foggy",
+            environment_details="Wet asphalt reflecting neon")),
+        ("build_scene/custom", lambda: scene.build_scene(
+            scene_type="Custom", custom_description=long_text, time_of_day="Custom",
+            custom_time_of_day="Eclipse", weather="Custom", custom_weather=long_text,
+            environment_details=long_text)),
+        ("input_types/style_selector", FLUX2_StyleSelector.INPUT_TYPES),
+        ("input_types/camera_rig", FLUX2_CameraRig.INPUT_TYPES),
+        ("remove_empty_fields/deep", lambda: FLUX2BaseNode.remove_empty_fields(deep)),
+        ("remove_empty_fields/wide", lambda: FLUX2BaseNode.remove_empty_fields(wide)),
+    ]
+
+
+def calibration_workload():
+    """Fixed mix of dict, string and list work comparable to the nodes"""
+    data = {f"key_{i}": f" value {i} " for i in range(50)}
+    return ", ".join(value.strip() for key, value in sorted(data.items()) if key[-1] != "0")
+
+
+def timed_rounds(func, repeat, min_time):
+    """Seconds per call for each round, paired with the calibration workload"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    calibration = timeit.Timer(calibration_workload)
+    cal_number, _ = calibration.autorange()
+    cal_number = max(1, int(cal_number * min_time / 0.2))
+    
+    rounds = []
+    for _ in range(repeat):
+        case = timer.timeit(number) / number
+        reference = calibration.timeit(cal_number) / cal_number
+        rounds.append((case, reference))
+    return rounds
+
+
+def measure(func, repeat, min_time):
+    """Return ops/sec, calibrated score and per-call memory figures"""
+    rounds = timed_rounds(func, repeat, min_time)
+    best = min(case for case, _ in rounds)
+    ratios = sorted(reference / case for case, reference in rounds)
+    score = ratios[len(ratios) // 2]
+    
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        snapshot_before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot_after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in snapshot_after.compare_to(snapshot_before, "filename")
+                 if stat.count_diff > 0)
+    del result
+    
+    return {"ops_per_sec": round(1 / best, 1), "score": round(score, 4),
+            "peak_bytes": max(0, peak - before), "blocks": blocks}
+
+
+def compare(name, result, baseline, margin):
+    """Return a list of regression messages for one case"""
+    previous = baseline.get(name)
+    if not previous:
+        return []
+    problems = []
+    floor = previous["score"] * (1 - margin)
+    if result["score"] < floor:
+        problems.append(f"{name}: score {result['score']:.4f} < {floor:.4f} "
+                        f"(baseline {previous['score']:.4f} - {margin:.0%})")
+    ceiling = previous["peak_bytes"] * (1 + margin)
+    if result["peak_bytes"] > ceiling and result["peak_bytes"] - previous["peak_bytes"] > 1024:
+        problems.append(f"{name}: peak {result['peak_bytes']:,} B > {ceiling:,.0f} B "
+                        f"(baseline {previous['peak_bytes']:,} B + {margin:.0%})")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write results to the baseline file instead of comparing")
+    parser.add_argument("--margin", type=float,
+                        default=float(os.environ.get("FLUX2_BENCH_MARGIN", DEFAULT_MARGIN)),
+                        help="Allowed regression as a fraction (default 0.25, env FLUX2_BENCH_MARGIN)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Approximate seconds per timing round")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases containing this text")
+    args = parser.parse_args(argv)
+    
+    backend = serialization.get_backend().name
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            stored = json.load(handle)
+        baseline = stored.get("cases", {})
+        if stored.get("json_backend") not in (None, backend):
+            print(f"Note: baseline used the '{stored['json_backend']}' JSON backend, "
+                  f"this run uses '{backend}'\n")
+    
+    header = f"{'case':<36}{'ops/sec':>14}{'score':>10}{'peak':>12}{'blocks':>9}{'vs base':>10}"
+    print(header)
+    print("-" * len(header))
+    
+    results = {}
+    problems = []
+    for name, func in build_cases():
+        if args.filter not in name:
+            continue
+        result = measure(func, args.repeat, args.min_time)
+        results[name] = result
+        previous = baseline.get(name)
+        change = f"{result['score'] / previous['score'] - 1:+.0%}" if previous else "new"
+        print(f"{name:<36}{result['ops_per_sec']:>14,.0f}{result['score']:>10.4f}"
+              f"{result['peak_bytes']:>10,} B"
+              f"{result['blocks']:>9,}{change:>10}")
+        problems.extend(compare(name, result, baseline, args.margin))
+    
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as handle:
+                stored = json.load(handle).get("cases", {})
+        stored.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "json_backend": backend, "cases": dict(sorted(stored.items()))},
+                      handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    
+    if problems:
+        print(f"\n{len(problems)} regression(s) beyond {args.margin:.0%}:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    
+    print(f"\nNo regressions beyond {args.margin:.0%}" if baseline else "\nNo baseline to compare against")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
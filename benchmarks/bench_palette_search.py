@@ -0,0 +1,78 @@
+"""
+Time nearest-palette search against libraries of random palettes
+
+For each library size, builds a PaletteIndex over random 3-6 color
+palettes and times queries that are slightly perturbed copies of library
+palettes (as typed or extracted from a reference image), plus fully
+random queries (worst case: nothing in the library is close). Also checks
+that the perturbed palette's source is found first.
+
+Run with:
+    python benchmarks/bench_palette_search.py
+    python benchmarks/bench_palette_search.py --sizes 1000 30000 --metric CIE76
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.palette_search import METRICS, PaletteIndex
+
+
+def random_color(rng):
+    return "#%06X" % rng.randrange(1 << 24)
+
+
+def perturb(color, rng, amount):
+    channels = [min(255, max(0, int(color[i:i + 2], 16) + rng.randint(-amount, amount)))
+                for i in (1, 3, 5)]
+    return "#%02X%02X%02X" % tuple(channels)
+
+
+def ms_per_query(index, queries, metric):
+    start = time.perf_counter()
+    results = [index.search(query, top_k=5, metric=metric) for query in queries]
+    return (time.perf_counter() - start) / len(queries) * 1000, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 30000],
+                        help="Library sizes (palettes)")
+    parser.add_argument("--queries", type=int, default=100, help="Queries per case")
+    parser.add_argument("--jitter", type=int, default=4,
+                        help="Max per-channel change (0-255) applied to near-match queries")
+    parser.add_argument("--metric", choices=list(METRICS), default="CIEDE2000")
+    args = parser.parse_args(argv)
+    
+    rng = random.Random(0)
+    print(f"{'palettes':>10}{'colors':>10}{'build s':>10}{'near ms':>10}"
+          f"{'found':>8}{'random ms':>11}")
+    print("-" * 59)
+    for size in args.sizes:
+        palettes = {f"Palette {i}": [random_color(rng) for _ in range(rng.randint(3, 6))]
+                    for i in range(size)}
+        start = time.perf_counter()
+        index = PaletteIndex(palettes)
+        build = time.perf_counter() - start
+        
+        sources = rng.sample(list(palettes), min(args.queries, size))
+        near = [[perturb(color, rng, args.jitter) for color in palettes[name]] for name in sources]
+        far = [[random_color(rng) for _ in range(4)] for _ in range(args.queries)]
+        
+        near_ms, results = ms_per_query(index, near, args.metric)
+        found = sum(result[0][0] == name for result, name in zip(results, sources)) / len(sources)
+        far_ms, _ = ms_per_query(index, far, args.metric)
+        print(f"{size:>10,}{len(index.tree):>10,}{build:>10.2f}{near_ms:>10.3f}"
+              f"{found:>8.0%}{far_ms:>11.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Measure the persistent prompt cache against assembling from scratch
+
+Simulates a restarted worker answering a stream of prompts it has
+mostly seen before: a new FLUX2_PromptAssembler (no in-memory state)
+assembles each prompt, with and without the on-disk cache. Reports:
+- cold: every prompt assembled, with the cache lookup and write on top
+- warm: prompts answered from the cache written by the cold pass
+- uncached: the assembler with the cache disabled
+and the time for several processes to write one cache concurrently.
+
+Run with:
+    python benchmarks/bench_prompt_cache.py
+    python benchmarks/bench_prompt_cache.py --subjects 200 --prompts 500
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import prompt_cache
+from nodes.base import FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.prompt_cache import PromptCache
+
+
+def make_inputs(index, subjects):
+    return {"scene": f"Crowded station concourse, take {index}",
+            "subjects": [FLUX2Types.create_subject(
+                f"Person {i} in a tailored charcoal suit holding a coffee cup",
+                "center foreground", "walking toward camera", "relaxed stride",
+                ["#222222", "#C0A080"]) for i in range(subjects)],
+            "style": "Documentary photography",
+            "lighting": "Overcast daylight through a glass roof",
+            "camera": FLUX2Types.create_camera(angle="High angle", distance="Wide shot", lens_mm=24)}
+
+
+def per_prompt(cache, count, subjects):
+    # Fresh inputs each pass, as after a restart (no encodings cached in memory)
+    prompts = [make_inputs(index, subjects) for index in range(count)]
+    prompt_cache._shared, prompt_cache._configured = cache, True
+    start = time.perf_counter()
+    for inputs in prompts:
+        FLUX2_PromptAssembler().assemble_prompt(**inputs)
+    return (time.perf_counter() - start) / len(prompts)
+
+
+def write_worker(path, worker, subjects, count):
+    cache = PromptCache(path)
+    for index in range(count):
+        inputs = make_inputs(worker * count + index, subjects)
+        key = cache.key(**inputs)
+        if cache.get(key) is None:
+            cache.put(key, *FLUX2_PromptAssembler().assemble_prompt(**inputs))
+    cache.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subjects", type=int, default=50, help="Subjects per prompt")
+    parser.add_argument("--prompts", type=int, default=300, help="Distinct prompts")
+    parser.add_argument("--processes", type=int, default=4, help="Concurrent writer processes")
+    args = parser.parse_args(argv)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PromptCache(os.path.join(tmp, "prompts.db"))
+        per_prompt(None, args.prompts, args.subjects)  # warm up
+        uncached = per_prompt(None, args.prompts, args.subjects)
+        cold = per_prompt(cache, args.prompts, args.subjects)
+        warm = per_prompt(cache, args.prompts, args.subjects)
+        stats = cache.stats()
+        cache.close()
+        
+        print(f"{args.prompts} prompts x {args.subjects} subjects, "
+              f"{stats['bytes'] / 1024:,.0f} KiB cached")
+        print(f"{'pass':<10}{'us/prompt':>12}{'vs uncached':>14}")
+        print("-" * 36)
+        for label, seconds in (("uncached", uncached), ("cold", cold), ("warm", warm)):
+            print(f"{label:<10}{seconds * 1e6:>12,.1f}{uncached / seconds:>13.1f}x")
+        
+        path = os.path.join(tmp, "shared.db")
+        count = max(1, args.prompts // args.processes)
+        start = time.perf_counter()
+        workers = [multiprocessing.Process(target=write_worker, args=(path, worker, args.subjects, count))
+                   for worker in range(args.processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        shared = PromptCache(path)
+        entries = shared.stats()["entries"]
+        shared.close()
+        print(f"\n{args.processes} processes wrote {entries} entries in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Compare subject/camera records with the plain dict representation
+
+Measures, for the same field values:
+- memory: bytes held per subject/camera (tracemalloc, N live objects)
+- create: construction throughput
+- assemble: prompts per second when the same subjects and camera are
+  reused across a batch (records splice their cached JSON fragments)
+- cache key: cost of turning a subject into a cache key (hash of a
+  record vs canonical JSON fingerprint of a dict)
+
+Run with:
+    python benchmarks/bench_records.py
+    python benchmarks/bench_records.py --count 50000 --backend json
+"""
+
+import argparse
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import serialization
+from nodes.base import FLUX2BaseNode, FLUX2Presets, FLUX2Types
+from nodes.prompt_emitter import emit_prompt
+
+
+def subject_dict(description, position=None, action=None, pose=None, color_palette=None):
+    """The dict-building create_subject this package used before records"""
+    subject = {"description": description}
+    if position:
+        subject["position"] = position
+    if action:
+        subject["action"] = action
+    if pose:
+        subject["pose"] = pose
+    if color_palette:
+        subject["color_palette"] = color_palette
+    return subject
+
+
+def camera_dict(**preset):
+    """Dict form of a preset camera, as create_camera used to build it"""
+    return {key: value for key, value in preset.items() if key != "ISO"}
+
+
+def subject_fields(i):
+    return (f"Person {i} in a tailored charcoal suit holding a coffee cup",
+            "center foreground", "walking toward camera", "relaxed stride",
+            ["#222222", "#C0A080"])
+
+
+def memory_per_object(factory, count):
+    """Average traced bytes per live object built by factory(i)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        objects = [factory(i) for i in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # The list holding the objects is the same for both representations
+    container = 8 * count + 56
+    del objects
+    return (after - before - container) / count
+
+
+def ops_per_sec(func, min_time=0.2):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat=5, number=number)) / number
+    return 1 / best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=20000, help="Objects for the memory test")
+    parser.add_argument("--subjects", type=int, default=8, help="Subjects per assembled prompt")
+    parser.add_argument("--backend", default=None,
+                        help="JSON backend for the assemble test (default: active backend)")
+    args = parser.parse_args(argv)
+    
+    if args.backend:
+        serialization.set_backend(args.backend)
+    backend = serialization.get_backend().name
+    
+    # Strings are shared so only the containers are measured; each subject
+    # gets its own palette list, as FLUX2_SubjectCreator builds one per call
+    fields = [subject_fields(i) for i in range(args.count)]
+    memory = {
+        "dict": memory_per_object(
+            lambda i: subject_dict(*fields[i][:4], list(fields[i][4])), args.count),
+        "record": memory_per_object(
+            lambda i: FLUX2Types.create_subject(*fields[i][:4], list(fields[i][4])), args.count),
+    }
+    
+    preset = FLUX2Presets.CAMERA_PRESETS["Portrait"]
+    dict_subjects = [subject_dict(*subject_fields(i)) for i in range(args.subjects)]
+    record_subjects = [FLUX2Types.create_subject(*subject_fields(i)) for i in range(args.subjects)]
+    dict_camera = camera_dict(**preset)
+    record_camera = FLUX2Types.create_camera(**preset)
+    assert dict(record_camera) == dict_camera
+    
+    sample = fields[0]
+    rows = [
+        ("create subject",
+         ops_per_sec(lambda: subject_dict(*sample)),
+         ops_per_sec(lambda: FLUX2Types.create_subject(*sample))),
+        (f"assemble ({args.subjects} subjects, {backend})",
+         ops_per_sec(lambda: emit_prompt(scene="Busy street", subjects=dict_subjects,
+                                         camera=dict_camera)),
+         ops_per_sec(lambda: emit_prompt(scene="Busy street", subjects=record_subjects,
+                                         camera=record_camera))),
+        ("cache key",
+         ops_per_sec(lambda: FLUX2BaseNode.fingerprint_inputs(subject=dict_subjects[0])),
+         ops_per_sec(lambda: hash(record_subjects[0]))),
+    ]
+    
+    assert (emit_prompt(scene="Busy street", subjects=dict_subjects, camera=dict_camera)
+            == emit_prompt(scene="Busy street", subjects=record_subjects, camera=record_camera))
+    
+    print(f"{'memory per subject':<40}{'dict':>14}{'record':>14}{'change':>10}")
+    print("-" * 78)
+    print(f"{'bytes (' + str(args.count) + ' live subjects)':<40}{memory['dict']:>14,.0f}"
+          f"{memory['record']:>14,.0f}{memory['record'] / memory['dict'] - 1:>+10.0%}")
+    print()
+    print(f"{'throughput':<40}{'dict ops/s':>14}{'record ops/s':>14}{'speedup':>10}")
+    print("-" * 78)
+    for name, dict_rate, record_rate in rows:
+        print(f"{name:<40}{dict_rate:>14,.0f}{record_rate:>14,.0f}{record_rate / dict_rate:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
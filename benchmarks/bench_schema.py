@@ -0,0 +1,105 @@
+"""
+Compare the compiled FLUX2 schema validator with a generic jsonschema pass
+
+Validates a batch of prompts built from the presets (a configurable share
+of them broken in typical ways: wrong types, misspelled fields, subjects
+without a description) and reports prompts per second for:
+- compiled: SchemaValidator.validate_batch (errors collected per record)
+- jsonschema: Draft7Validator.iter_errors over FLUX2_SCHEMA, if installed
+
+Run with:
+    python benchmarks/bench_schema.py
+    python benchmarks/bench_schema.py --count 100000 --invalid 0.05
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.prompt_schema import FLUX2_SCHEMA, SchemaValidator
+from nodes.records import to_plain
+from nodes.variation_sampler import VariationSampler
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+
+def break_prompt(prompt, rng):
+    """Introduce one of the mistakes hand-written or generated prompts contain"""
+    kind = rng.randrange(4)
+    if kind == 0:
+        prompt["camera"]["lens-mm"] = str(prompt["camera"]["lens-mm"])
+    elif kind == 1:
+        prompt["colour_palette"] = prompt.pop("color_palette", ["#FFFFFF"])
+    elif kind == 2:
+        del prompt["subjects"][0]["description"]
+    else:
+        prompt["subjects"][-1]["color_palette"] = "#FF0000"
+    return prompt
+
+
+def make_prompts(count, invalid, seed):
+    rng = random.Random(seed)
+    sampler = VariationSampler(seed)
+    prompts = []
+    for index in range(count):
+        sample = sampler[index % len(sampler)]
+        prompt = {
+            "scene": sample["scene"],
+            "subjects": [{"description": f"Subject {index}-{i}", "position": sample["position"],
+                          "color_palette": ["#222222", "#C0A080"]} for i in range(rng.randint(1, 3))],
+            "style": sample["style"],
+            "color_palette": sample["palette"],
+            "mood": sample["mood"],
+            "camera": to_plain(sample["camera"]),
+        }
+        if rng.random() < invalid:
+            break_prompt(prompt, rng)
+        prompts.append(prompt)
+    return prompts
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000, help="Prompts to validate")
+    parser.add_argument("--invalid", type=float, default=0.05, help="Share of broken prompts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    
+    prompts = make_prompts(args.count, args.invalid, args.seed)
+    
+    compile_time, validator = timed(SchemaValidator)
+    compiled, report = timed(lambda: validator.validate_batch(prompts))
+    print(f"{args.count:,} prompts, {report.invalid:,} invalid; schema compiled in {compile_time * 1e3:.2f} ms")
+    print(f"{'validator':<14}{'seconds':>10}{'prompts/s':>14}{'speedup':>10}")
+    print("-" * 48)
+    print(f"{'compiled':<14}{compiled:>10.3f}{args.count / compiled:>14,.0f}{'':>10}")
+    
+    if jsonschema is None:
+        print("jsonschema is not installed (pip install jsonschema) - generic pass skipped")
+        return 0
+    
+    generic_validator = jsonschema.Draft7Validator(FLUX2_SCHEMA)
+    generic, invalid = timed(lambda: sum(1 for prompt in prompts
+                                         if any(True for _ in generic_validator.iter_errors(prompt))))
+    assert invalid == report.invalid, (invalid, report.invalid)
+    print(f"{'jsonschema':<14}{generic:>10.3f}{args.count / generic:>14,.0f}{generic / compiled:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Micro-benchmark for the JSON serialization backends
+
+Compares every registered backend on the prompts shipped in examples/,
+plus synthetic variants with larger subject arrays, and the assembler's
+single-pass emitter against remove_empty_fields + stdlib json.dumps.
+
+Run with: python benchmarks/bench_serialization.py [--repeat 5] [--number 2000]
+"""
+
+import argparse
+import copy
+import glob
+import json
+import os
+import sys
+import timeit
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes import serialization
+from nodes.base import FLUX2BaseNode
+from nodes.prompt_emitter import PromptEmitter, build_prompt_dict
+
+
+def load_example_prompts():
+    """Collect assembled prompts from examples/ (raw JSON and workflow text widgets)"""
+    prompts = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "examples", "*.json"))):
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+        if "nodes" not in data:
+            prompts.append((os.path.basename(path), data))
+            continue
+        for node in data["nodes"]:
+            for value in node.get("widgets_values") or []:
+                if not isinstance(value, str) or not value.lstrip().startswith("{"):
+                    continue
+                try:
+                    prompt = json.loads(value)
+                except ValueError:
+                    continue
+                if isinstance(prompt, dict) and "subjects" in prompt:
+                    prompts.append((os.path.basename(path), prompt))
+                    break
+    return prompts
+
+
+def scale_subjects(prompt, count):
+    """Repeat the subjects of a prompt until it holds count subjects"""
+    scaled = copy.deepcopy(prompt)
+    subjects = prompt.get("subjects") or [{"description": "Subject"}]
+    scaled["subjects"] = [copy.deepcopy(subjects[i % len(subjects)]) for i in range(count)]
+    return scaled
+
+
+def run(repeat, number):
+    examples = load_example_prompts()
+    if not examples:
+        print("No example prompts found in examples/")
+        return
+    
+    base_name, base_prompt = max(examples, key=lambda item: len(json.dumps(item[1])))
+    cases = [(name, prompt) for name, prompt in examples]
+    for count in (8, 32):
+        cases.append((f"{base_name} x{count} subjects", scale_subjects(base_prompt, count)))
+    
+    modes = [
+        ("pretty", {"pretty": True}),
+        ("compact", {"pretty": False}),
+        ("canonical", {"pretty": False, "canonical": True}),
+    ]
+    
+    print(f"Backends: {', '.join(serialization.BACKENDS)}")
+    print(f"Timing: best of {repeat} x {number} calls\n")
+    header = f"{'case':<58} {'mode':<10}" + "".join(f"{name:>14}" for name in serialization.BACKENDS)
+    print(header)
+    print("-" * len(header))
+    
+    for name, prompt in cases:
+        size = len(serialization.dumps(prompt, pretty=False, backend="json"))
+        label = f"{name[:44]} ({size} B)"
+        for mode_name, options in modes:
+            row = f"{label:<58} {mode_name:<10}"
+            for backend in serialization.BACKENDS:
+                timer = timeit.Timer(lambda: serialization.dumps(prompt, backend=backend, **options))
+                best = min(timer.repeat(repeat=repeat, number=number)) / number
+                row += f"{1 / best:>10,.0f}/s  "
+            print(row)
+
+    print("\nAssembly with remove_empty (stdlib backend)\n")
+    header = f"{'case':<58} {'mode':<10}{'legacy':>14}{'emitter':>14}"
+    print(header)
+    print("-" * len(header))
+    for name, prompt in cases:
+        for pretty in (True, False):
+            emitter = PromptEmitter(pretty=pretty)
+            legacy = lambda: serialization.dumps(
+                FLUX2BaseNode.remove_empty_fields(build_prompt_dict(prompt)),
+                pretty=pretty, backend="json")
+            single = lambda: emitter.emit(**prompt)
+            row = f"{name[:56]:<58} {'pretty' if pretty else 'compact':<10}"
+            for fn in (legacy, single):
+                best = min(timeit.Timer(fn).repeat(repeat=repeat, number=number)) / number
+                row += f"{1 / best:>10,.0f}/s  "
+            print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per case")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per timing round")
+    args = parser.parse_args()
+    run(args.repeat, args.number)
+
+
+if __name__ == "__main__":
+    main()
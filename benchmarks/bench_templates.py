@@ -0,0 +1,69 @@
+"""
+Compare compiled placeholder templates with per-row string building
+
+Renders "{product} on {surface}, {time} lighting" for a table of rows
+with a bound PromptTemplate, with str.format_map on the raw template,
+and by calling FLUX2_SceneBuilder per row (the wiring templates replace).
+
+Run with:
+    python benchmarks/bench_templates.py
+    python benchmarks/bench_templates.py --rows 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.prompt_template import compile_template
+from nodes.scene_builder import FLUX2_SceneBuilder
+
+TEMPLATE = "{product} on {surface}, {time} lighting"
+COLUMNS = ["product", "surface", "time"]
+
+
+def rate(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="Rows rendered per variant")
+    args = parser.parse_args(argv)
+    
+    rows = [[f"Product {i}", f"surface {i % 13}", ("morning", "noon", "evening")[i % 3]]
+            for i in range(args.rows)]
+    render = compile_template(TEMPLATE).bind(COLUMNS)
+    builder = FLUX2_SceneBuilder()
+    
+    def format_map(row):
+        return TEMPLATE.format_map(dict(zip(COLUMNS, row)))
+    
+    def scene_builder(row):
+        return builder.build_scene(custom_description=f"{row[0]} on {row[1]}",
+                                   time_of_day="Custom", custom_time_of_day=row[2])[0]
+    
+    assert render(rows[0]) == format_map(rows[0])
+    results = [
+        ("FLUX2_SceneBuilder per row", rate(scene_builder, rows)),
+        ("str.format_map per row", rate(format_map, rows)),
+        ("compiled PromptTemplate", rate(render, rows)),
+    ]
+    
+    baseline = results[0][1]
+    print(f"{str(args.rows) + ' rows':<32}{'rows/s':>14}{'speedup':>10}")
+    print("-" * 56)
+    for name, value in results:
+        print(f"{name:<32}{value:>14,.0f}{value / baseline:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
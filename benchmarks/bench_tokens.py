@@ -0,0 +1,76 @@
+"""
+Measure token estimation throughput with and without the fragment cache
+
+Counts the tokens of a batch of assembled prompts (preset combinations
+with a few subjects each) with:
+- bundled: VocabTokenizer on the whole text of every prompt
+- bundled + cache: TokenCounter, which memoizes per-fragment counts
+- heuristic + cache: the character-class fallback behind the same cache
+
+Run with:
+    python benchmarks/bench_tokens.py
+    python benchmarks/bench_tokens.py --count 20000 --subjects 6
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.base import FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.token_budget import HeuristicTokenizer, TokenCounter, VocabTokenizer
+from nodes.variation_sampler import VariationSampler
+
+
+def make_prompts(count, subjects, seed=0):
+    sampler = VariationSampler(seed)
+    assembler = FLUX2_PromptAssembler()
+    prompts = []
+    for index in range(count):
+        sample = sampler[index]
+        people = [FLUX2Types.create_subject(f"Traveller {i} with a canvas backpack and a paper map",
+                                            sample["position"], "looking for the platform")
+                  for i in range(subjects)]
+        prompts.append(assembler.assemble_prompt(scene=sample["scene"], subjects=people,
+                                                 style=sample["style"], mood=sample["mood"],
+                                                 color_palette=sample["palette"],
+                                                 camera=sample["camera"])[0])
+    return prompts
+
+
+def rate(count_tokens, prompts):
+    start = time.perf_counter()
+    total = sum(map(count_tokens, prompts))
+    return len(prompts) / (time.perf_counter() - start), total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000, help="Prompts to count")
+    parser.add_argument("--subjects", type=int, default=4, help="Subjects per prompt")
+    args = parser.parse_args(argv)
+    
+    prompts = make_prompts(args.count, args.subjects)
+    vocab = VocabTokenizer()
+    rows = [
+        ("bundled", *rate(vocab.count, prompts)),
+        ("bundled + cache", *rate(TokenCounter(vocab).count, prompts)),
+        ("heuristic + cache", *rate(TokenCounter(HeuristicTokenizer()).count, prompts)),
+    ]
+    
+    print(f"{args.count:,} prompts with {args.subjects} subjects")
+    print(f"{'tokenizer':<20}{'prompts/s':>12}{'avg tokens':>12}{'speedup':>10}")
+    print("-" * 54)
+    for name, prompts_per_sec, total in rows:
+        print(f"{name:<20}{prompts_per_sec:>12,.0f}{total / args.count:>12.1f}"
+              f"{prompts_per_sec / rows[0][1]:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""
+Compare the seeded variation sampler with materializing the preset product
+
+Drawing N unique combinations the direct way means building every
+combination of the preset tables and shuffling (random.sample). The
+sampler permutes indices instead and decodes only the N it returns.
+Measures time and peak memory for each, per draw size.
+
+Run with:
+    python benchmarks/bench_variation_sampler.py
+    python benchmarks/bench_variation_sampler.py --dimensions scene style camera mood palette
+    python benchmarks/bench_variation_sampler.py --draws 10 1000 --skip-materialized
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Add the package to path for benchmarking
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nodes.variation_sampler import DIMENSIONS, VariationSampler, preset_axes
+
+
+def sampled(count, seed, dimensions):
+    sampler = VariationSampler(seed, dimensions)
+    return [sampler.space[sampler.permutation[index]] for index in range(count)]
+
+
+def materialized(count, seed, dimensions):
+    axes = preset_axes(dimensions)
+    names = [name for name, _ in axes]
+    combinations = list(itertools.product(*(values for _, values in axes)))
+    return [dict(zip(names, item)) for item in random.Random(seed).sample(combinations, count)]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--draws", type=int, nargs="+", default=[10, 1000, 100000],
+                        help="Numbers of samples to draw")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dimensions", nargs="+", choices=DIMENSIONS, default=list(DIMENSIONS),
+                        help="Dimensions to vary (all of them by default)")
+    parser.add_argument("--skip-materialized", action="store_true",
+                        help="Only time the sampler (the full product needs several GB)")
+    args = parser.parse_args(argv)
+    
+    size = len(VariationSampler(args.seed, args.dimensions))
+    print(f"{size:,} combinations of {', '.join(args.dimensions)}")
+    print(f"{'draw':>10}{'sampler ms':>14}{'peak MiB':>10}{'product ms':>14}{'peak MiB':>10}")
+    print("-" * 58)
+    for count in args.draws:
+        count = min(count, size)
+        fast, fast_peak = measure(sampled, count, args.seed, args.dimensions)
+        line = f"{count:>10,}{fast * 1e3:>14,.1f}{fast_peak / 2 ** 20:>10,.1f}"
+        if not args.skip_materialized:
+            slow, slow_peak = measure(materialized, count, args.seed, args.dimensions)
+            line += f"{slow * 1e3:>14,.1f}{slow_peak / 2 ** 20:>10,.1f}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,15 @@
 Base class and utilities for FLUX.2 Prompt Builder nodes
 """
 
-import json
+import functools
+import hashlib
+from collections.abc import Mapping, Sequence
 from typing import Dict, List, Any, Optional, Union
 
+from . import colors, instrumentation, serialization
+from .preset_library import PresetLibrary
+from .records import camera_record, subject_record
+
 
 class FLUX2BaseNode:
     """
@@ -16,6 +22,12 @@ class FLUX2BaseNode:
     RETURN_TYPES = ()
     FUNCTION = "execute"
     
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Only wraps FUNCTION when FLUX2_METRICS is set; otherwise a no-op
+        if instrumentation.ENABLED:
+            instrumentation.instrument(cls)
+    
     @classmethod
     def INPUT_TYPES(cls):
         """Override this in subclasses to define inputs"""
@@ -27,29 +39,27 @@ class FLUX2BaseNode:
     
     @staticmethod
     def validate_hex_color(color: str) -> bool:
-        """Validate hex color format"""
+        """Validate hex color format (#RGB or #RRGGBB, # optional)"""
         if not color:
             return False
-        color = color.strip()
-        if color.startswith('#'):
-            color = color[1:]
-        if len(color) not in (3, 6):
-            return False
-        try:
-            int(color, 16)
-            return True
-        except ValueError:
-            return False
+        return colors.normalize_hex(color) is not None
     
     @staticmethod
     def format_hex_color(color: str) -> str:
-        """Format hex color consistently with # prefix"""
+        """Format hex color consistently as #RRGGBB"""
         if not color:
             return ""
-        color = color.strip()
-        if not color.startswith('#'):
-            color = f"#{color}"
-        return color.upper()
+        formatted = colors.normalize_hex(color)
+        if formatted is None:
+            # Not valid hex: keep the old prefix-and-uppercase behaviour
+            color = color.strip()
+            formatted = (color if color.startswith('#') else f"#{color}").upper()
+        return formatted
+    
+    @staticmethod
+    def normalize_colors(values, keep_unknown: bool = False):
+        """Normalize a list of hex codes and CSS color names (see colors.normalize_colors)"""
+        return colors.normalize_colors(values, keep_unknown=keep_unknown)
     
     @staticmethod
     def remove_empty_fields(data: Dict) -> Dict:
@@ -88,11 +98,31 @@ class FLUX2BaseNode:
         return cleaned
     
     @staticmethod
-    def format_json_output(data: Dict, pretty: bool = True) -> str:
-        """Format dictionary as JSON string"""
-        if pretty:
-            return json.dumps(data, indent=2, ensure_ascii=False)
-        return json.dumps(data, ensure_ascii=False)
+    def format_json_output(data: Dict, pretty: bool = True, canonical: bool = False) -> str:
+        """
+        Format dictionary as JSON string.
+        Uses the active serialization backend (see nodes/serialization.py);
+        canonical=True sorts keys, and without pretty gives compact output.
+        """
+        return serialization.dumps(data, pretty=pretty, canonical=canonical)
+    
+    @staticmethod
+    def fingerprint_inputs(**kwargs) -> str:
+        """
+        Build a stable content hash of node inputs for IS_CHANGED.
+        Keys are sorted at every level so dict ordering never changes the
+        result, while list order (e.g. subject order) is preserved.
+        """
+        canonical = serialization.dumps(kwargs, pretty=False, canonical=True,
+                                        default=_fingerprint_default)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def subject_list(subjects) -> Optional[List[Dict]]:
+        """Materialize a SUBJECT_ARRAY (plain list or shared SubjectArray) as a list"""
+        if subjects is None or isinstance(subjects, list):
+            return subjects
+        return list(subjects)
     
     @staticmethod
     def merge_color_palettes(global_palette: Optional[List[str]], 
@@ -106,6 +136,37 @@ class FLUX2BaseNode:
         return global_palette
 
 
+def _fingerprint_default(value):
+    """Hash records and shared sequences like the dicts and lists they represent"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return list(value)
+    return str(value)
+
+
+def cached_input_types(build):
+    """
+    Cache a node's INPUT_TYPES per class.
+    ComfyUI calls INPUT_TYPES on every /object_info request and prompt
+    validation; the tables are rebuilt only when FLUX2Presets.version
+    changes (see FLUX2Presets.mark_changed).
+    Apply below @classmethod.
+    """
+    cache = {}
+    
+    @functools.wraps(build)
+    def wrapper(cls):
+        entry = cache.get(cls)
+        if entry is None or entry[0] != FLUX2Presets.version:
+            entry = (FLUX2Presets.version, build(cls))
+            cache[cls] = entry
+        return entry[1]
+    
+    wrapper.cache_clear = cache.clear
+    return wrapper
+
+
 # Custom type definitions for ComfyUI
 class FLUX2Types:
     """Custom data types for FLUX2 nodes"""
@@ -116,70 +177,81 @@ class FLUX2Types:
     COLOR_ARRAY = "FLUX2_COLOR_ARRAY"
     JSON_OBJECT = "FLUX2_JSON"
     
-    @staticmethod
-    def create_subject(description: str, 
-                       position: Optional[str] = None,
-                       action: Optional[str] = None,
-                       pose: Optional[str] = None,
-                       color_palette: Optional[List[str]] = None) -> Dict:
-        """Create a subject object with validation"""
-        subject = {"description": description}
-        
-        if position:
-            subject["position"] = position
-        if action:
-            subject["action"] = action
-        if pose:
-            subject["pose"] = pose
-        if color_palette:
-            subject["color_palette"] = color_palette
-        
-        return subject
-    
-    @staticmethod
-    def create_camera(angle: Optional[str] = None,
-                     distance: Optional[str] = None,
-                     lens: Optional[str] = None,
-                     lens_mm: Optional[int] = None,
-                     f_number: Optional[str] = None,
-                     iso: Optional[int] = None,
-                     depth_of_field: Optional[str] = None,
-                     focus: Optional[str] = None,
-                     **kwargs) -> Dict:
-        """Create a camera object with validation"""
-        camera = {}
-        
-        if angle:
-            camera["angle"] = angle
-        if distance:
-            camera["distance"] = distance
-        if lens:
-            camera["lens"] = lens
-        
-        # Handle both lens_mm and lens-mm (from presets)
-        lens_val = lens_mm or kwargs.get("lens-mm")
-        if lens_val is not None:
-            camera["lens-mm"] = lens_val
-        
-        # Handle both f_number and f-number (from presets)
-        f_val = f_number or kwargs.get("f-number")
-        if f_val:
-            camera["f-number"] = f_val
-        
-        if iso is not None:
-            camera["ISO"] = iso
-        if depth_of_field:
-            camera["depth_of_field"] = depth_of_field
-        if focus:
-            camera["focus"] = focus
-        
-        return camera
+    # Immutable records; empty fields are left out (see nodes/records.py)
+    create_subject = staticmethod(subject_record)
+    create_camera = staticmethod(camera_record)
 
 
 # Preset libraries
 class FLUX2Presets:
     """Preset libraries for common configurations"""
     
+    # Bumped whenever preset contents change; invalidates cached INPUT_TYPES
+    version = 0
+    
+    @classmethod
+    def mark_changed(cls):
+        """Call after modifying any preset table at runtime"""
+        cls.version += 1
+        cls._plain = {}
+    
+    # House presets from external JSON directories, indexed on first use
+    library = PresetLibrary()
+    
+    # kind -> built-in mapping for kinds the library adds nothing to, so
+    # their lookups never touch the library; emptied by mark_changed
+    _plain: Dict[str, Dict[str, Any]] = {}
+    
+    @classmethod
+    def _plain_table(cls, kind: str) -> Optional[Dict[str, Any]]:
+        """Built-in mapping of kind, or None when library files add presets"""
+        if cls.library.names(kind):
+            return None
+        plain = cls._plain[kind] = cls.builtin(kind)
+        return plain
+    
+    @classmethod
+    def builtin(cls, kind: str) -> Dict[str, Any]:
+        """Built-in presets of a kind as a name -> value mapping"""
+        if kind == "scene_types":
+            return cls.SCENE_TYPES
+        if kind == "style_categories":
+            return cls.STYLE_CATEGORIES
+        if kind == "camera_presets":
+            return cls.CAMERA_PRESETS
+        if kind == "mood_presets":
+            return {mood: mood for mood in cls.MOOD_PRESETS}
+        return {}
+    
+    @classmethod
+    def names(cls, kind: str, builtin: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Built-in preset names followed by names added by library files"""
+        plain = cls._plain.get(kind)
+        if plain is None:
+            plain = cls._plain_table(kind)
+        if builtin is None:
+            builtin = cls.builtin(kind) if plain is None else plain
+        names = list(builtin)
+        if plain is None:
+            names.extend(name for name in cls.library.names(kind) if name not in builtin)
+        return names
+    
+    @classmethod
+    def get(cls, kind: str, name: str, default: Any = None,
+            builtin: Optional[Dict[str, Any]] = None) -> Any:
+        """Look up one preset; library files override built-ins of the same name"""
+        plain = cls._plain.get(kind)
+        if plain is None:
+            plain = cls._plain_table(kind)
+            if plain is None:
+                value = cls.library.get(kind, name)
+                if value is not None:
+                    return value
+                plain = cls.builtin(kind)
+        if builtin is None:
+            builtin = plain
+        return builtin.get(name, default)
+    
     SCENE_TYPES = {
         "Studio": "Professional photography studio with seamless backdrop",
         "Interior": "Indoor space with natural or artificial lighting",
@@ -344,3 +416,7 @@ class FLUX2Presets:
             "Center background, upper third",
         ]
     }
+
+
+# Reload cached node definitions when preset files change on disk
+FLUX2Presets.library.on_change(FLUX2Presets.mark_changed)
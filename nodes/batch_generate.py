@@ -0,0 +1,468 @@
+"""
+Command-line batch prompt generator
+
+Reads rows from CSV or JSON Lines files and maps their columns onto the
+inputs of the scene, style, subject, camera, palette and assembler nodes.
+The prompts are written as JSON Lines in input order. Rows are read and
+processed in chunks across a process pool, so files of any size stream
+through with constant memory.
+
+Columns are named <node>.<input>; bare names go to the assembler:
+    
+    scene.scene_type, scene.custom_description, ...   FLUX2_SceneBuilder
+    style.style_category, style.style_preset, ...     FLUX2_StyleSelector
+    subject.description, subject2.pose, ...           FLUX2_SubjectCreator (one per number)
+    camera.preset, camera.lens_mm, ...                FLUX2_CameraRig
+    palette.color_1 ... palette.color_4               FLUX2_ColorPalette
+    palette.preset                                    FLUX2_ColorPalettePreset
+    scene, style, lighting, mood, background,         FLUX2_PromptAssembler
+    composition, color_palette
+
+JSON Lines rows may nest the same names ({"camera": {"preset": "Portrait"}},
+"subjects": [{...}, {...}]). Empty cells keep the node's default, and a
+bare scene or style value takes precedence over the builder columns.
+
+--template COLUMN=TEXT fills a column from a placeholder template over the
+row's other columns ("{product} on {surface}"); templates are compiled once
+and checked against the input header before any row is processed.
+
+Run with:
+    python -m nodes.batch_generate rows.csv -o prompts.jsonl --workers 8
+    python -m nodes.batch_generate rows.jsonl.gz -o prompts.jsonl.gz
+    python -m nodes.batch_generate rows.csv --template "scene={product} on {surface}"
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .prompt_exporter import JSONLWriter
+from .prompt_template import TemplateError, compile_template
+from .registry import NODE_CLASS_MAPPINGS
+from .workflow_eval import widget_inputs
+
+logger = logging.getLogger(__name__)
+
+# Column prefix -> node class name ("palette.preset" columns use palette_preset)
+NODE_PREFIXES = {
+    "scene": "FLUX2_SceneBuilder",
+    "style": "FLUX2_StyleSelector",
+    "subject": "FLUX2_SubjectCreator",
+    "camera": "FLUX2_CameraRig",
+    "palette": "FLUX2_ColorPalette",
+    "palette_preset": "FLUX2_ColorPalettePreset",
+}
+# Assembler input fed by each node's first output (subjects are collected)
+NODE_FIELDS = {
+    "scene": "scene",
+    "style": "style",
+    "camera": "camera",
+    "palette": "color_palette",
+    "palette_preset": "color_palette",
+}
+ASSEMBLER_FIELDS = ("scene", "style", "lighting", "mood", "background", "composition",
+                    "color_palette")
+
+DEFAULT_CHUNK_ROWS = 1000
+_SUBJECT_COLUMN = re.compile(r"subject_?(\d*)$")
+_LIST_SEPARATORS = re.compile(r"[,;\n]")
+_TRUE = {"1", "true", "yes", "y", "on"}
+
+
+class BatchError(ValueError):
+    """Raised for unusable input files, column names or templates"""
+
+
+def _coerce(value: Any, kind: str) -> Any:
+    """Convert a cell to the widget type of the input it feeds"""
+    if not isinstance(value, str):
+        return value
+    if kind == "INT":
+        return int(float(value))
+    if kind == "FLOAT":
+        return float(value)
+    if kind == "BOOLEAN":
+        return value.strip().lower() in _TRUE
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def flatten_row(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """Nested JSON row -> flat <node>.<input> columns"""
+    flat = {}
+    for key, value in row.items():
+        if key == "subjects" and isinstance(value, list):
+            for number, subject in enumerate(value, 1):
+                if isinstance(subject, Mapping):
+                    for name, item in subject.items():
+                        flat[f"subject{number}.{name}"] = item
+        elif isinstance(value, Mapping):
+            for name, item in value.items():
+                flat[f"{key}.{name}"] = item
+        else:
+            flat[key] = value
+    return flat
+
+
+class RowMapper:
+    """
+    Column layout compiled once per distinct set of column names.
+    
+    Each column is resolved to (node, input, widget type) up front; building
+    a prompt then only coerces non-empty cells and calls the node functions.
+    """
+    
+    def __init__(self, columns: Sequence[str], variables: Iterable[str] = (), warn: bool = True):
+        """
+        Args:
+            columns: Column names of the rows
+            variables: Columns read by templates, not reported as unused
+            warn: Log the unused columns (callers reporting them per row pass False)
+        """
+        self.columns = tuple(columns)
+        # Group key -> [(column, input name, widget type)]
+        self.groups: Dict[Tuple[str, int], List[Tuple[str, str, str]]] = {}
+        self.assembler: List[Tuple[str, str]] = []
+        self.ignored: List[str] = []
+        
+        kinds = {prefix: {name: kind for name, kind, _ in widget_inputs(NODE_CLASS_MAPPINGS[node])}
+                 for prefix, node in NODE_PREFIXES.items()}
+        
+        for column in self.columns:
+            prefix, dot, name = column.strip().partition(".")
+            if not dot:
+                if prefix in ASSEMBLER_FIELDS:
+                    self.assembler.append((column, prefix))
+                else:
+                    self.ignored.append(column)
+                continue
+            number = 0
+            match = _SUBJECT_COLUMN.match(prefix)
+            if match:
+                prefix, number = "subject", int(match.group(1) or 1)
+            elif prefix == "palette" and name == "preset":
+                prefix = "palette_preset"
+            kind = kinds.get(prefix, {}).get(name)
+            if kind is None:
+                self.ignored.append(column)
+                continue
+            self.groups.setdefault((prefix, number), []).append((column, name, kind))
+        
+        variables = set(variables)
+        self.unused = [column for column in self.ignored if column not in variables]
+        if self.unused and warn:
+            logger.warning("Ignoring columns that match no node input: %s", ", ".join(self.unused))
+    
+    def node_inputs(self, row: Mapping[str, Any]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Coerced, non-empty inputs per node group for one row"""
+        inputs = {}
+        for group, columns in self.groups.items():
+            values = {name: _coerce(row[column], kind) for column, name, kind in columns
+                      if not _is_empty(row.get(column))}
+            if values:
+                inputs[group] = values
+        return inputs
+
+
+class PromptBuilder:
+    """Runs the FLUX2 node functions for rows; one instance per worker process"""
+    
+    # Column layouts kept, least recently used dropped first
+    CACHE_SIZE = 256
+    
+    def __init__(self, templates: Optional[Mapping[str, str]] = None, strict: bool = False):
+        """
+        Args:
+            templates: Column -> template text, rendered before mapping
+            strict: Raise BatchError for rows with columns that match no
+                node input, instead of logging and ignoring them
+        """
+        self._nodes = {name: NODE_CLASS_MAPPINGS[name]()
+                       for name in list(NODE_PREFIXES.values()) + ["FLUX2_PromptAssembler"]}
+        self.strict = strict
+        self._mappers: "OrderedDict[Tuple[str, ...], RowMapper]" = OrderedDict()
+        self._templates = [(column, compile_template(text))
+                           for column, text in (templates or {}).items()]
+        self._renderers: "OrderedDict[Tuple[str, ...], List]" = OrderedDict()
+    
+    def _call(self, node_name: str, **kwargs):
+        node = self._nodes[node_name]
+        return getattr(node, node.FUNCTION)(**kwargs)
+    
+    def _remember(self, cache: OrderedDict, columns: Tuple[str, ...], value):
+        if len(cache) >= self.CACHE_SIZE:
+            cache.popitem(last=False)
+        cache[columns] = value
+        return value
+    
+    def mapper(self, columns: Iterable[str]) -> RowMapper:
+        columns = tuple(columns)
+        mapper = self._mappers.get(columns)
+        if mapper is None:
+            variables = {name for _, template in self._templates for name in template.variables}
+            mapper = self._remember(self._mappers, columns,
+                                    RowMapper(columns, variables, warn=not self.strict))
+        else:
+            self._mappers.move_to_end(columns)
+        return mapper
+    
+    def bind_templates(self, columns: Iterable[str]) -> List:
+        """
+        (column, renderer) per template for rows with these columns.
+        
+        Raises:
+            TemplateError: If a template uses a variable that is not a column
+        """
+        columns = tuple(columns)
+        renderers = self._renderers.get(columns)
+        if renderers is None:
+            renderers = self._remember(self._renderers, columns,
+                                       [(column, template.bind(columns))
+                                        for column, template in self._templates])
+        else:
+            self._renderers.move_to_end(columns)
+        return renderers
+    
+    def build(self, row: Mapping[str, Any]) -> str:
+        """
+        Compact JSON prompt for one (flat) row.
+        
+        Raises:
+            BatchError: In strict mode, if a column matches no node input
+        """
+        if self._templates:
+            renderers = self.bind_templates(row)
+            values = tuple(row.values())
+            row = dict(row)
+            for column, render in renderers:
+                row[column] = render(values)
+        mapper = self.mapper(row)
+        if self.strict and mapper.unused:
+            raise BatchError(f"Unknown keys: {', '.join(mapper.unused)}")
+        inputs = mapper.node_inputs(row)
+        fields: Dict[str, Any] = {}
+        
+        subjects = []
+        for (prefix, _), values in sorted(inputs.items()):
+            output = self._call(NODE_PREFIXES[prefix], **values)[0]
+            if prefix == "subject":
+                subjects.append(output)
+            else:
+                fields[NODE_FIELDS[prefix]] = output
+        if subjects:
+            fields["subjects"] = subjects
+        
+        for column, name in mapper.assembler:
+            value = row.get(column)
+            if _is_empty(value):
+                continue
+            if name == "color_palette":
+                if isinstance(value, str):
+                    value = _LIST_SEPARATORS.split(value)
+                value, _ = self._nodes["FLUX2_ColorPalette"].normalize_colors(value)
+            fields[name] = value
+        
+        return self._call("FLUX2_PromptAssembler", pretty_print=False, **fields)[0]
+    
+    def build_chunk(self, start: int, rows: List[Mapping[str, Any]]) -> Tuple[List[bytes], List[str]]:
+        """
+        Encoded JSON lines for a chunk of rows, plus one message per row
+        that failed (rows are numbered from 1 across the whole input).
+        """
+        lines = []
+        errors = []
+        for number, row in enumerate(rows, start + 1):
+            try:
+                lines.append(self.build(row).encode("utf-8") + b"\n")
+            except Exception as e:
+                errors.append(f"row {number}: {e}")
+        return lines, errors
+
+
+_worker: Optional[PromptBuilder] = None
+
+
+def _init_worker(templates: Optional[Mapping[str, str]]):
+    """Process-pool initializer: one builder per worker process"""
+    global _worker
+    _worker = PromptBuilder(templates)
+
+
+def _build_chunk(start: int, rows: List[Mapping[str, Any]]) -> Tuple[List[bytes], List[str]]:
+    """Process-pool entry point"""
+    return _worker.build_chunk(start, rows)
+
+
+def _open_text(path: str):
+    if path == "-":
+        return io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def input_format(path: str) -> str:
+    """"csv", "tsv" or "jsonl" from the file name (ignoring a .gz suffix)"""
+    name = (path[:-3] if path.endswith(".gz") else path).lower()
+    if name.endswith(".csv"):
+        return "csv"
+    return "tsv" if name.endswith(".tsv") else "jsonl"
+
+
+def iter_rows(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream flat rows from a CSV, TSV or JSON Lines file ("-" for stdin)"""
+    fmt = fmt or input_format(path)
+    with _open_text(path) as f:
+        if fmt in ("csv", "tsv"):
+            yield from csv.DictReader(f, dialect="excel-tab" if fmt == "tsv" else "excel")
+            return
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise BatchError(f"{path}:{number}: invalid JSON: {e}") from e
+            if not isinstance(row, Mapping):
+                raise BatchError(f"{path}:{number}: expected a JSON object per line")
+            yield flatten_row(row)
+
+
+def generate(rows: Iterable[Mapping[str, Any]], workers: int = 0,
+             chunk_rows: int = DEFAULT_CHUNK_ROWS,
+             templates: Optional[Mapping[str, str]] = None) -> Iterator[Tuple[List[bytes], List[str]]]:
+    """
+    Build prompts for rows in chunks, yielding (encoded lines, errors) per
+    chunk in input order.
+    
+    With workers > 1 chunks are processed by a process pool. At most two
+    chunks per worker are in flight, so memory does not grow with the
+    input size.
+    
+    Args:
+        rows: Flat rows (column -> value)
+        workers: Worker processes; 0 or 1 runs in this process
+        chunk_rows: Rows per chunk
+        templates: Optional column -> placeholder template filled per row
+    """
+    chunks = _chunked(iter(rows), chunk_rows)
+    
+    if workers <= 1:
+        builder = PromptBuilder(templates)
+        for start, chunk in chunks:
+            yield builder.build_chunk(start, chunk)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(dict(templates or {}),)) as executor:
+        pending = deque()
+        for start, chunk in chunks:
+            pending.append(executor.submit(_build_chunk, start, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _chunked(rows: Iterator, size: int) -> Iterator[Tuple[int, List]]:
+    start = 0
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate FLUX.2 JSON prompts from CSV or JSON Lines rows")
+    parser.add_argument("inputs", nargs="+", help="CSV/TSV or JSON Lines files, optionally .gz ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="Output JSON Lines file (.gz to compress); default stdout")
+    parser.add_argument("--format", choices=["csv", "tsv", "jsonl"],
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (1 = run in this process)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Rows per chunk sent to a worker")
+    parser.add_argument("--append", action="store_true", help="Append to the output file")
+    parser.add_argument("--max-errors", type=int, default=0,
+                        help="Stop after this many failed rows (0 = never stop)")
+    parser.add_argument("--template", action="append", default=[], metavar="COLUMN=TEXT",
+                        help="Fill COLUMN from a {placeholder} template over the row's columns")
+    args = parser.parse_args(argv)
+    
+    templates = {}
+    for item in args.template:
+        column, separator, text = item.partition("=")
+        if not separator or not column.strip():
+            parser.error(f"--template expects COLUMN=TEXT, got {item!r}")
+        templates[column.strip()] = text
+    
+    rows = itertools.chain.from_iterable(iter_rows(path, args.format) for path in args.inputs)
+    if templates:
+        # Check the templates against the header before any row is built
+        try:
+            first = next(rows, None)
+            builder = PromptBuilder(templates)
+            if first is not None:
+                builder.bind_templates(first)
+                rows = itertools.chain([first], rows)
+        except (OSError, BatchError, TemplateError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    
+    if args.output == "-":
+        writer = None
+        out = sys.stdout.buffer
+    else:
+        writer = JSONLWriter(args.output, compress=args.output.endswith(".gz"),
+                             append=args.append, chunk_records=args.chunk_rows)
+    
+    written = failed = 0
+    started = time.perf_counter()
+    try:
+        for lines, errors in generate(rows, workers=args.workers, chunk_rows=args.chunk_rows,
+                                      templates=templates):
+            if writer is not None:
+                writer.write_encoded(lines)
+            else:
+                out.write(b"".join(lines))
+            written += len(lines)
+            failed += len(errors)
+            for message in errors:
+                print(message, file=sys.stderr)
+            if args.max_errors and failed >= args.max_errors:
+                print(f"Stopping after {failed} failed rows", file=sys.stderr)
+                break
+    except (OSError, BatchError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if writer is not None:
+            writer.close()
+        else:
+            out.flush()
+    
+    elapsed = time.perf_counter() - started
+    rate = written / elapsed if elapsed > 0 else 0.0
+    print(f"{written} prompts written, {failed} rows failed ({rate:,.0f} prompts/s)", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 FLUX2_CameraRig - Complete camera parameter control for photorealistic results
 """
 
-from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets
+from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets, cached_input_types
 
 
 class FLUX2_CameraRig(FLUX2BaseNode):
@@ -12,10 +12,11 @@ class FLUX2_CameraRig(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "preset": (["None"] + list(FLUX2Presets.CAMERA_PRESETS.keys()), {
+                "preset": (["None"] + FLUX2Presets.names("camera_presets"), {
                     "default": "None"
                 }),
             },
@@ -125,7 +126,7 @@ class FLUX2_CameraRig(FLUX2BaseNode):
         
         # Start with preset if selected and not overridden
         if preset != "None" and not override_preset:
-            camera_data = FLUX2Presets.CAMERA_PRESETS.get(preset, {}).copy()
+            camera_data = FLUX2Presets.get("camera_presets", preset, {}).copy()
         else:
             camera_data = {}
         
@@ -234,10 +235,11 @@ class FLUX2_CameraPreset(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "preset": (list(FLUX2Presets.CAMERA_PRESETS.keys()), {
+                "preset": (FLUX2Presets.names("camera_presets"), {
                     "default": "Portrait"
                 }),
             }
@@ -251,6 +253,6 @@ class FLUX2_CameraPreset(FLUX2BaseNode):
     
     def load_preset(self, preset="Portrait"):
         """Load a camera preset directly."""
-        camera_data = FLUX2Presets.CAMERA_PRESETS.get(preset, {})
+        camera_data = FLUX2Presets.get("camera_presets", preset, {})
         camera = FLUX2Types.create_camera(**camera_data)
         return (camera,)
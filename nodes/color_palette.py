@@ -1,13 +1,15 @@
 """
-FLUX2_ColorPalette - Create color palettes from hex color codes
+FLUX2_ColorPalette - Create color palettes from hex color codes and color names
 """
 
-from .base import FLUX2BaseNode, FLUX2Types
+import re
+
+from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets, cached_input_types
 
 
 class FLUX2_ColorPalette(FLUX2BaseNode):
     """
-    Create a color palette from up to 4 hex color codes.
+    Create a color palette from up to 4 hex color codes or CSS color names.
     Output is compatible with prompt_assembler's color_palette input.
     """
     
@@ -19,22 +21,22 @@ class FLUX2_ColorPalette(FLUX2BaseNode):
                 "color_1": ("STRING", {
                     "multiline": False,
                     "default": "",
-                    "placeholder": "e.g., #FF0000 or FF0000"
+                    "placeholder": "e.g., #FF0000, F00 or red"
                 }),
                 "color_2": ("STRING", {
                     "multiline": False,
                     "default": "",
-                    "placeholder": "e.g., #00FF00 or 00FF00"
+                    "placeholder": "e.g., #00FF00, 0F0 or lime"
                 }),
                 "color_3": ("STRING", {
                     "multiline": False,
                     "default": "",
-                    "placeholder": "e.g., #0000FF or 0000FF"
+                    "placeholder": "e.g., #0000FF, 00F or blue"
                 }),
                 "color_4": ("STRING", {
                     "multiline": False,
                     "default": "",
-                    "placeholder": "e.g., #FFFF00 or FFFF00"
+                    "placeholder": "e.g., #FFFF00, FF0 or yellow"
                 }),
             }
         }
@@ -51,36 +53,20 @@ class FLUX2_ColorPalette(FLUX2BaseNode):
                       color_3="",
                       color_4=""):
         """
-        Create a color palette from hex color inputs.
+        Create a color palette from hex color or color name inputs.
         
         Args:
-            color_1: First hex color
-            color_2: Second hex color
-            color_3: Third hex color
-            color_4: Fourth hex color
+            color_1: First color
+            color_2: Second color
+            color_3: Third color
+            color_4: Fourth color
         
         Returns:
             Tuple of (color_array, preview_string)
         """
         
-        colors = []
-        invalid_colors = []
-        
-        # Process each color input
-        for i, color in enumerate([color_1, color_2, color_3, color_4], 1):
-            if not color or not color.strip():
-                continue
-            
-            color = color.strip()
-            
-            # Validate the color
-            if self.validate_hex_color(color):
-                # Format and add to palette
-                formatted = self.format_hex_color(color)
-                colors.append(formatted)
-            else:
-                # Track invalid colors for preview
-                invalid_colors.append(f"Color {i}: '{color}' (invalid)")
+        colors, unknown = self.normalize_colors([color_1, color_2, color_3, color_4])
+        invalid_colors = [f"Color {i}: '{color}' (invalid)" for i, color in unknown]
         
         # Create preview string
         if colors:
@@ -95,10 +81,6 @@ class FLUX2_ColorPalette(FLUX2BaseNode):
         
         preview = "\n".join(preview_lines)
         
-        # Return empty list if no valid colors
-        if not colors:
-            colors = []
-        
         return (colors, preview)
     
     # Description for display in UI
@@ -109,10 +91,11 @@ Input Format:
 - Accepts hex colors with or without # prefix
 - Examples: #FF0000, FF0000, #f00, f00
 - 3-digit (#RGB) or 6-digit (#RRGGBB) formats supported
+- CSS color names: red, navy, Dark Slate Gray, rebeccapurple
 
 The palette will:
 - Automatically validate each color
-- Format with # prefix and uppercase
+- Format as uppercase #RRGGBB (shorthand expanded, names resolved)
 - Skip empty or invalid colors
 - Output as COLOR_ARRAY for prompt_assembler
 
@@ -142,10 +125,11 @@ class FLUX2_ColorPalettePreset(FLUX2BaseNode):
     }
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "preset": (list(cls.PALETTE_PRESETS.keys()), {
+                "preset": (FLUX2Presets.names("palettes", builtin=cls.PALETTE_PRESETS), {
                     "default": "Vibrant Primary"
                 }),
             }
@@ -159,7 +143,8 @@ class FLUX2_ColorPalettePreset(FLUX2BaseNode):
     
     def load_preset(self, preset="Vibrant Primary"):
         """Load a preset color palette."""
-        colors = self.PALETTE_PRESETS.get(preset, [])
+        colors, _ = self.normalize_colors(
+            FLUX2Presets.get("palettes", preset, [], builtin=self.PALETTE_PRESETS))
         
         # Create info string
         info_lines = [f"Preset: {preset}"]
@@ -187,3 +172,94 @@ Available Presets:
 
 Connect output to prompt_assembler's color_palette input.
 """
+
+
+class FLUX2_NearestPalette(FLUX2BaseNode):
+    """
+    Find the preset palettes closest to a set of colors.
+    Searches built-in and library palettes by perceptual (Lab) distance.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "top_k": ("INT", {
+                    "default": 3,
+                    "min": 1,
+                    "max": 20,
+                    "step": 1
+                }),
+                # palette_search.METRICS, listed here so it loads on first search
+                "metric": (["CIEDE2000", "CIE76"], {
+                    "default": "CIEDE2000"
+                }),
+            },
+            "optional": {
+                "color_palette": (FLUX2Types.COLOR_ARRAY,),
+                "colors": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "Colors separated by commas or lines, e.g. #FF4500, gold"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = (FLUX2Types.COLOR_ARRAY, "STRING", "STRING")
+    RETURN_NAMES = ("color_palette", "palette_name", "matches")
+    FUNCTION = "find_nearest"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Utilities"
+    
+    def find_nearest(self, top_k=3, metric="CIEDE2000", color_palette=None, colors=""):
+        """
+        Find the closest preset palettes to the given colors.
+        
+        Args:
+            top_k: Number of matches to list
+            metric: Color difference used for ranking ("CIEDE2000" or "CIE76")
+            color_palette: Colors from a palette node (e.g. Image Palette)
+            colors: Extra colors typed as text
+        
+        Returns:
+            Tuple of (best palette colors, best palette name, ranked matches)
+        """
+        from .palette_search import preset_palette_index
+        
+        query = list(color_palette or [])
+        query.extend(re.split(r"[,\n]", colors or ""))
+        index = preset_palette_index(FLUX2_ColorPalettePreset.PALETTE_PRESETS)
+        matches = index.search(query, top_k=top_k, metric=metric)
+        
+        if not matches:
+            return ([], "", "No valid colors provided")
+        
+        best_name = matches[0][0]
+        best_colors, _ = self.normalize_colors(FLUX2Presets.get(
+            "palettes", best_name, [], builtin=FLUX2_ColorPalettePreset.PALETTE_PRESETS))
+        
+        info_lines = [f"Nearest palettes ({metric}, {len(index)} searched):"]
+        info_lines.extend([f"  {i+1}. {name} (ΔE {distance:.1f})"
+                           for i, (name, distance) in enumerate(matches)])
+        return (best_colors, best_name, "\n".join(info_lines))
+    
+    # Description for display in UI
+    DESCRIPTION = """
+Find the preset palettes that best match a set of colors.
+
+Inputs:
+- color_palette: Colors from Color Palette or Image Palette
+- colors: Hex codes or color names, separated by commas or lines
+- top_k: Number of matches listed
+- metric: CIEDE2000 (perceptual) or CIE76 (plain Lab distance)
+
+Palettes are compared color by color in CIELAB space: each color is
+matched to the closest color of the other palette, both ways. Built-in
+presets and palettes from preset library files are searched through a
+KD-tree index; a search takes a few milliseconds. CIE76 results are
+exact unless hundreds of palettes must be compared. CIEDE2000 results are approximate: close matches are reliable,
+but for colors far from every palette the best match can be missed.
+
+Outputs the best palette's colors and name, plus the ranked matches
+with their average color difference (ΔE).
+"""
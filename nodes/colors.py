@@ -0,0 +1,258 @@
+"""
+Shared color normalization for FLUX2 nodes
+
+Every color input (palette nodes, subject colors, preset palettes) goes
+through normalize_colors, which turns a whole list of user strings into
+canonical "#RRGGBB" codes in one call:
+
+- "#ff0000", "FF0000"       -> "#FF0000"
+- "#f00", "f00"             -> "#FF0000" (3-digit shorthand expanded)
+- "red", "Dark Slate Gray"  -> CSS/X11 named color, e.g. "#2F4F4F"
+
+Validation uses precomputed translation tables instead of parsing each
+string as an integer, names resolve with a single dict lookup, and
+normalized results are memoized per input string, so repeated palettes
+cost one dict hit per color.
+
+hex_to_lab, delta_e_76 and delta_e_2000 provide the perceptual (CIELAB)
+color distances used by palette search.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+HEX_DIGITS = "0123456789abcdefABCDEF"
+
+# CSS Color Module Level 4 named colors (the X11 set plus rebeccapurple),
+# keyed by lowercase name without separators
+CSS_COLORS: Dict[str, str] = {
+    "aliceblue": "#F0F8FF", "antiquewhite": "#FAEBD7", "aqua": "#00FFFF",
+    "aquamarine": "#7FFFD4", "azure": "#F0FFFF", "beige": "#F5F5DC",
+    "bisque": "#FFE4C4", "black": "#000000", "blanchedalmond": "#FFEBCD",
+    "blue": "#0000FF", "blueviolet": "#8A2BE2", "brown": "#A52A2A",
+    "burlywood": "#DEB887", "cadetblue": "#5F9EA0", "chartreuse": "#7FFF00",
+    "chocolate": "#D2691E", "coral": "#FF7F50", "cornflowerblue": "#6495ED",
+    "cornsilk": "#FFF8DC", "crimson": "#DC143C", "cyan": "#00FFFF",
+    "darkblue": "#00008B", "darkcyan": "#008B8B", "darkgoldenrod": "#B8860B",
+    "darkgray": "#A9A9A9", "darkgreen": "#006400", "darkgrey": "#A9A9A9",
+    "darkkhaki": "#BDB76B", "darkmagenta": "#8B008B", "darkolivegreen": "#556B2F",
+    "darkorange": "#FF8C00", "darkorchid": "#9932CC", "darkred": "#8B0000",
+    "darksalmon": "#E9967A", "darkseagreen": "#8FBC8F", "darkslateblue": "#483D8B",
+    "darkslategray": "#2F4F4F", "darkslategrey": "#2F4F4F", "darkturquoise": "#00CED1",
+    "darkviolet": "#9400D3", "deeppink": "#FF1493", "deepskyblue": "#00BFFF",
+    "dimgray": "#696969", "dimgrey": "#696969", "dodgerblue": "#1E90FF",
+    "firebrick": "#B22222", "floralwhite": "#FFFAF0", "forestgreen": "#228B22",
+    "fuchsia": "#FF00FF", "gainsboro": "#DCDCDC", "ghostwhite": "#F8F8FF",
+    "gold": "#FFD700", "goldenrod": "#DAA520", "gray": "#808080",
+    "green": "#008000", "greenyellow": "#ADFF2F", "grey": "#808080",
+    "honeydew": "#F0FFF0", "hotpink": "#FF69B4", "indianred": "#CD5C5C",
+    "indigo": "#4B0082", "ivory": "#FFFFF0", "khaki": "#F0E68C",
+    "lavender": "#E6E6FA", "lavenderblush": "#FFF0F5", "lawngreen": "#7CFC00",
+    "lemonchiffon": "#FFFACD", "lightblue": "#ADD8E6", "lightcoral": "#F08080",
+    "lightcyan": "#E0FFFF", "lightgoldenrodyellow": "#FAFAD2", "lightgray": "#D3D3D3",
+    "lightgreen": "#90EE90", "lightgrey": "#D3D3D3", "lightpink": "#FFB6C1",
+    "lightsalmon": "#FFA07A", "lightseagreen": "#20B2AA", "lightskyblue": "#87CEFA",
+    "lightslategray": "#778899", "lightslategrey": "#778899", "lightsteelblue": "#B0C4DE",
+    "lightyellow": "#FFFFE0", "lime": "#00FF00", "limegreen": "#32CD32",
+    "linen": "#FAF0E6", "magenta": "#FF00FF", "maroon": "#800000",
+    "mediumaquamarine": "#66CDAA", "mediumblue": "#0000CD", "mediumorchid": "#BA55D3",
+    "mediumpurple": "#9370DB", "mediumseagreen": "#3CB371", "mediumslateblue": "#7B68EE",
+    "mediumspringgreen": "#00FA9A", "mediumturquoise": "#48D1CC",
+    "mediumvioletred": "#C71585", "midnightblue": "#191970", "mintcream": "#F5FFFA",
+    "mistyrose": "#FFE4E1", "moccasin": "#FFE4B5", "navajowhite": "#FFDEAD",
+    "navy": "#000080", "oldlace": "#FDF5E6", "olive": "#808000",
+    "olivedrab": "#6B8E23", "orange": "#FFA500", "orangered": "#FF4500",
+    "orchid": "#DA70D6", "palegoldenrod": "#EEE8AA", "palegreen": "#98FB98",
+    "paleturquoise": "#AFEEEE", "palevioletred": "#DB7093", "papayawhip": "#FFEFD5",
+    "peachpuff": "#FFDAB9", "peru": "#CD853F", "pink": "#FFC0CB",
+    "plum": "#DDA0DD", "powderblue": "#B0E0E6", "purple": "#800080",
+    "rebeccapurple": "#663399", "red": "#FF0000", "rosybrown": "#BC8F8F",
+    "royalblue": "#4169E1", "saddlebrown": "#8B4513", "salmon": "#FA8072",
+    "sandybrown": "#F4A460", "seagreen": "#2E8B57", "seashell": "#FFF5EE",
+    "sienna": "#A0522D", "silver": "#C0C0C0", "skyblue": "#87CEEB",
+    "slateblue": "#6A5ACD", "slategray": "#708090", "slategrey": "#708090",
+    "snow": "#FFFAFA", "springgreen": "#00FF7F", "steelblue": "#4682B4",
+    "tan": "#D2B48C", "teal": "#008080", "thistle": "#D8BFD8",
+    "tomato": "#FF6347", "turquoise": "#40E0D0", "violet": "#EE82EE",
+    "wheat": "#F5DEB3", "white": "#FFFFFF", "whitesmoke": "#F5F5F5",
+    "yellow": "#FFFF00", "yellowgreen": "#9ACD32",
+}
+
+# str.translate tables: deleting every hex digit leaves "" only for hex
+# strings; names are looked up without spaces, underscores and hyphens
+_DELETE_HEX = str.maketrans("", "", HEX_DIGITS)
+_NAME_SEPARATORS = str.maketrans("", "", " _-")
+
+MEMO_SIZE = 4096
+_memo: Dict[str, Optional[str]] = {}
+_MISSING = object()
+
+
+def normalize_hex(color: str) -> Optional[str]:
+    """
+    Canonical "#RRGGBB" for a 3- or 6-digit hex code with or without #;
+    None for anything else (color names included).
+    """
+    color = color.strip()
+    digits = color[1:] if color.startswith("#") else color
+    if len(digits) not in (3, 6) or digits.translate(_DELETE_HEX):
+        return None
+    if len(digits) == 3:
+        r, g, b = digits
+        digits = r + r + g + g + b + b
+    return "#" + digits.upper()
+
+
+def _normalize(color: str) -> Optional[str]:
+    """Uncached normalization of one input string"""
+    result = normalize_hex(color)
+    if result is None and not color.lstrip().startswith("#"):
+        result = CSS_COLORS.get(color.strip().lower().translate(_NAME_SEPARATORS))
+    return result
+
+
+def normalize_color(color: str) -> Optional[str]:
+    """
+    Canonical "#RRGGBB" for a hex code (with or without #, 3 or 6 digits)
+    or CSS color name; None when the string is not a color.
+    """
+    try:
+        result = _memo.get(color, _MISSING)
+    except TypeError:
+        return None
+    if result is not _MISSING:
+        return result
+    result = _normalize(color) if isinstance(color, str) else None
+    if len(_memo) >= MEMO_SIZE:
+        _memo.clear()
+    _memo[color] = result
+    return result
+
+
+def is_color(color: str) -> bool:
+    """True when normalize_color accepts the string"""
+    return normalize_color(color) is not None
+
+
+def normalize_colors(colors: Iterable[Optional[str]],
+                     keep_unknown: bool = False) -> Tuple[List[str], List[Tuple[int, str]]]:
+    """
+    Normalize a batch of color strings in one pass.
+    
+    Blank or missing entries are skipped. Entries that are not colors are
+    reported as (position, stripped text) in the second list; with
+    keep_unknown=True they are also kept, stripped, in the output (for
+    free-text color descriptions such as "warm beige").
+    
+    Returns:
+        Tuple of (normalized colors, unrecognized entries)
+    """
+    normalized = []
+    unknown = []
+    for index, color in enumerate(colors, 1):
+        if not color:
+            continue
+        result = normalize_color(color)
+        if result is not None:
+            normalized.append(result)
+            continue
+        text = color.strip() if isinstance(color, str) else ""
+        if not text:
+            continue
+        unknown.append((index, text))
+        if keep_unknown:
+            normalized.append(text)
+    return normalized, unknown
+
+
+# ----------------------------------------------------------------------
+# CIELAB conversion and color difference
+# ----------------------------------------------------------------------
+
+Lab = Tuple[float, float, float]
+
+# sRGB channel value (0-255) -> linear light, precomputed for all 256 values
+_LINEAR = [c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+           for c in (v / 255 for v in range(256))]
+
+# D65 reference white
+_WHITE = (0.95047, 1.0, 1.08883)
+
+_lab_memo: Dict[str, Lab] = {}
+
+
+def _lab_f(t: float) -> float:
+    return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+
+def hex_to_lab(color: str) -> Lab:
+    """CIELAB (D65) coordinates of a normalized "#RRGGBB" color"""
+    lab = _lab_memo.get(color)
+    if lab is not None:
+        return lab
+    r, g, b = (_LINEAR[int(color[i:i + 2], 16)] for i in (1, 3, 5))
+    x = (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / _WHITE[0]
+    y = (0.2126729 * r + 0.7151522 * g + 0.0721750 * b) / _WHITE[1]
+    z = (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / _WHITE[2]
+    fx, fy, fz = _lab_f(x), _lab_f(y), _lab_f(z)
+    lab = (116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz))
+    if len(_lab_memo) >= MEMO_SIZE:
+        _lab_memo.clear()
+    _lab_memo[color] = lab
+    return lab
+
+
+def delta_e_76(lab1: Lab, lab2: Lab) -> float:
+    """CIE76 color difference (Euclidean distance in Lab)"""
+    return math.dist(lab1, lab2)
+
+
+_POW25_7 = 25.0 ** 7
+
+
+def delta_e_2000(lab1: Lab, lab2: Lab) -> float:
+    """CIEDE2000 color difference (Sharma, Wu and Dalal formulation)"""
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+    
+    c_bar7 = ((math.hypot(a1, b1) + math.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - math.sqrt(c_bar7 / (c_bar7 + _POW25_7)))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = math.hypot(a1p, b1), math.hypot(a2p, b2)
+    h1p = math.degrees(math.atan2(b1, a1p)) % 360 if (a1p or b1) else 0.0
+    h2p = math.degrees(math.atan2(b2, a2p)) % 360 if (a2p or b2) else 0.0
+    
+    delta_lp = L2 - L1
+    delta_cp = c2p - c1p
+    chroma_product = c1p * c2p
+    if chroma_product == 0:
+        delta_hp = 0.0
+        h_bar = h1p + h2p
+    else:
+        delta_hp = h2p - h1p
+        if delta_hp > 180:
+            delta_hp -= 360
+        elif delta_hp < -180:
+            delta_hp += 360
+        h_bar = (h1p + h2p) / 2
+        if abs(h1p - h2p) > 180:
+            h_bar += 180 if h_bar < 180 else -180
+    delta_big_hp = 2 * math.sqrt(chroma_product) * math.sin(math.radians(delta_hp / 2))
+    
+    l_bar = (L1 + L2) / 2
+    c_bar_p = (c1p + c2p) / 2
+    t = (1 - 0.17 * math.cos(math.radians(h_bar - 30))
+         + 0.24 * math.cos(math.radians(2 * h_bar))
+         + 0.32 * math.cos(math.radians(3 * h_bar + 6))
+         - 0.20 * math.cos(math.radians(4 * h_bar - 63)))
+    delta_theta = 30 * math.exp(-(((h_bar - 275) / 25) ** 2))
+    c_bar_p7 = c_bar_p ** 7
+    r_c = 2 * math.sqrt(c_bar_p7 / (c_bar_p7 + _POW25_7))
+    l50 = (l_bar - 50) ** 2
+    s_l = 1 + 0.015 * l50 / math.sqrt(20 + l50)
+    s_c = 1 + 0.045 * c_bar_p
+    s_h = 1 + 0.015 * c_bar_p * t
+    r_t = -math.sin(math.radians(2 * delta_theta)) * r_c
+    
+    dl, dc, dh = delta_lp / s_l, delta_cp / s_c, delta_big_hp / s_h
+    return math.sqrt(dl * dl + dc * dc + dh * dh + r_t * dc * dh)
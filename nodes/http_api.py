@@ -0,0 +1,220 @@
+"""
+HTTP endpoint for batch prompt assembly
+
+POST /flux2/assemble takes a JSON array of prompt specs and returns the
+assembled prompts without building or queuing a graph. Specs use the
+nested layout batch_generate reads from JSON Lines:
+    
+    [{"scene": {"scene_type": "Studio"}, "style": "Film noir",
+      "subjects": [{"description": "Detective", "position": "left"}],
+      "camera": {"preset": "Portrait"}}, ...]
+
+The response is {"prompts": [...], "errors": [...]}: one prompt object
+per spec, in order, with null for specs that failed and an
+{"index", "error"} entry for each of them. Keys that match no node input
+fail the spec rather than being ignored.
+
+Specs are assembled in chunks on a thread pool (FLUX2_ASSEMBLE_WORKERS,
+default up to 4), as are the JSON parses of bodies of PARSE_INLINE_MAX
+bytes or more, so the server's event loop stays free. Chunks are written
+as they complete; batches of STREAM_MIN specs or more are sent with
+chunked transfer encoding instead of being buffered.
+
+Inside ComfyUI the route is added to PromptServer when the package loads.
+create_app() builds a standalone aiohttp application with the same route
+for tests and load testing:
+    
+    python -m nodes.http_api --port 8189
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from aiohttp import web
+except ImportError:
+    # Only ComfyUI's server and create_app need it
+    web = None
+
+ROUTE = "/flux2/assemble"
+# Largest accepted batch, and the batch size from which responses stream
+MAX_SPECS = 100_000
+STREAM_MIN = 256
+CHUNK_SPECS = 64
+# Bodies this large are parsed on the thread pool instead of the event loop
+PARSE_INLINE_MAX = 64 << 10
+WORKERS = int(os.environ.get("FLUX2_ASSEMBLE_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+
+_local = threading.local()
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+def assemble_chunk(start: int, specs: Sequence[Any]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """
+    Compact JSON prompt per spec ("null" where it failed), plus one
+    {"index", "error"} entry per failure. Each thread or process builds
+    with its own node instances.
+    """
+    from .batch_generate import PromptBuilder, flatten_row
+    
+    builder = getattr(_local, "builder", None)
+    if builder is None:
+        builder = _local.builder = PromptBuilder(strict=True)
+    prompts = []
+    errors = []
+    for index, spec in enumerate(specs, start):
+        try:
+            if not isinstance(spec, Mapping):
+                raise ValueError(f"expected a JSON object, got {type(spec).__name__}")
+            prompts.append(builder.build(flatten_row(spec)))
+        except Exception as e:
+            prompts.append("null")
+            errors.append({"index": index, "error": str(e)})
+    return prompts, errors
+
+
+def shared_executor() -> Executor:
+    """Thread pool shared by every request to the ComfyUI route"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="flux2-assemble")
+        return _executor
+
+
+async def assemble_stream(specs: Sequence[Any], executor: Optional[Executor] = None,
+                          workers: int = WORKERS, chunk_specs: int = CHUNK_SPECS) -> AsyncIterator[bytes]:
+    """
+    Encoded response body for specs, one piece per chunk in input order.
+    
+    Chunks run on executor; at most two per worker are in flight, so a
+    large batch never holds more than a few chunks of output in memory.
+    Chunks not yet started are cancelled if the stream is closed early.
+    """
+    loop = asyncio.get_running_loop()
+    executor = executor or shared_executor()
+    pending = deque()
+    errors: List[Dict[str, Any]] = []
+    separator = b""
+    starts = iter(range(0, len(specs), chunk_specs))
+    try:
+        yield b'{"prompts":['
+        while True:
+            for start in starts:
+                pending.append(loop.run_in_executor(executor, assemble_chunk, start,
+                                                    specs[start:start + chunk_specs]))
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            prompts, chunk_errors = await pending.popleft()
+            errors.extend(chunk_errors)
+            yield separator + ",".join(prompts).encode("utf-8")
+            separator = b","
+        yield b'],"errors":' + json.dumps(errors, ensure_ascii=False).encode("utf-8") + b"}"
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _require_aiohttp():
+    if web is None:
+        raise ImportError("aiohttp is required for the HTTP assemble endpoint")
+
+
+def _error(status: int, message: str):
+    return web.json_response({"error": message}, status=status)
+
+
+class AssembleHandler:
+    """aiohttp request handler for POST /flux2/assemble"""
+    
+    def __init__(self, executor: Optional[Executor] = None, workers: int = WORKERS):
+        self.executor = executor
+        self.workers = workers
+    
+    async def handle(self, request):
+        body = await request.read()
+        try:
+            if len(body) < PARSE_INLINE_MAX:
+                specs = json.loads(body)
+            else:
+                specs = await asyncio.get_running_loop().run_in_executor(
+                    self.executor or shared_executor(), json.loads, body)
+        except ValueError as e:
+            return _error(400, f"Invalid JSON body: {e}")
+        if not isinstance(specs, list):
+            return _error(400, "Expected a JSON array of prompt specs")
+        if len(specs) > MAX_SPECS:
+            return _error(413, f"At most {MAX_SPECS} specs per request, got {len(specs)}")
+        
+        stream = assemble_stream(specs, self.executor, self.workers)
+        try:
+            if len(specs) < STREAM_MIN:
+                body = b"".join([piece async for piece in stream])
+                return web.Response(body=body, content_type="application/json")
+            response = web.StreamResponse()
+            response.content_type = "application/json"
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            async for piece in stream:
+                await response.write(piece)
+            await response.write_eof()
+            return response
+        finally:
+            await stream.aclose()
+
+
+def create_app(executor: Optional[Executor] = None, workers: int = WORKERS):
+    """
+    Standalone aiohttp application serving the assemble route, a local
+    stand-in for ComfyUI's PromptServer.
+    """
+    _require_aiohttp()
+    app = web.Application(client_max_size=256 << 20)
+    app.router.add_post(ROUTE, AssembleHandler(executor, workers).handle)
+    return app
+
+
+def register_routes(routes=None) -> bool:
+    """
+    Add the assemble route to routes, by default those of ComfyUI's
+    PromptServer. Returns False when there is no server to add it to.
+    """
+    if web is None:
+        return False
+    if routes is None:
+        try:
+            from server import PromptServer
+        except ImportError:
+            return False
+        if getattr(PromptServer, "instance", None) is None:
+            return False
+        routes = PromptServer.instance.routes
+    routes.post(ROUTE)(AssembleHandler().handle)
+    return True
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8189, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Assembly threads")
+    args = parser.parse_args(argv)
+    
+    _require_aiohttp()
+    executor = ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="flux2-assemble")
+    web.run_app(create_app(executor, args.workers), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
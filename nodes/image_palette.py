@@ -0,0 +1,213 @@
+"""
+FLUX2_ImagePalette - Extract a dominant-color palette from reference images
+"""
+
+import math
+from typing import List, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # ComfyUI always ships numpy; only bare test setups lack it
+    np = None
+
+from .base import FLUX2BaseNode, FLUX2Types
+
+# Colors are first binned at 5 bits per channel (32768 bins); each bin keeps
+# the mean of its pixels, so clustering runs on at most 32768 weighted points
+BIN_BITS = 5
+KMEANS_ITERATIONS = 10
+
+
+def sample_pixels(image, max_pixels: int):
+    """
+    RGB pixels of an IMAGE batch ([B, H, W, C] floats in 0-1, torch tensor or
+    array) as an (N, 3) uint8 array, strided so at most about max_pixels
+    pixels are read. Striding happens before the tensor is copied to NumPy.
+    """
+    if np is None:
+        raise RuntimeError("FLUX2_ImagePalette requires numpy")
+    if len(image.shape) == 3:
+        image = image[None]
+    if len(image.shape) != 4 or image.shape[-1] < 3:
+        raise ValueError(f"Expected an IMAGE batch [B, H, W, C], got shape {tuple(image.shape)}")
+    
+    batch, height, width = image.shape[:3]
+    per_image = max(1, max_pixels // batch)
+    stride = max(1, math.ceil(math.sqrt(height * width / per_image)))
+    sample = image[:, ::stride, ::stride, :3]
+    if hasattr(sample, "detach"):
+        sample = sample.detach().cpu().numpy()
+    
+    pixels = np.asarray(sample, dtype=np.float32).reshape(-1, 3)
+    return np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
+
+
+def color_histogram(pixels):
+    """
+    Bin pixels at BIN_BITS per channel.
+    
+    Returns:
+        Tuple of (mean color per occupied bin as (M, 3) floats, pixel count per bin)
+    """
+    shift = 8 - BIN_BITS
+    channels = pixels.astype(np.int32) >> shift
+    bins = (channels[:, 0] << (2 * BIN_BITS)) | (channels[:, 1] << BIN_BITS) | channels[:, 2]
+    size = 1 << (3 * BIN_BITS)
+    
+    counts = np.bincount(bins, minlength=size)
+    occupied = np.flatnonzero(counts)
+    sums = np.stack([np.bincount(bins, weights=pixels[:, c], minlength=size)[occupied]
+                     for c in range(3)], axis=1)
+    weights = counts[occupied].astype(np.float64)
+    return sums / weights[:, None], weights
+
+
+def median_cut(points, weights, count: int) -> List:
+    """
+    Split weighted points into up to count boxes, each time cutting the
+    box with the largest (channel range x weight) at its weighted median.
+    Returns the index array of each box.
+    """
+    def box_entry(indices):
+        ranges = np.ptp(points[indices], axis=0)
+        channel = int(ranges.argmax())
+        return indices, channel, float(ranges[channel] * weights[indices].sum())
+    
+    boxes = [box_entry(np.arange(len(points)))]
+    while len(boxes) < count:
+        best = max(range(len(boxes)), key=lambda i: boxes[i][2])
+        indices, channel, score = boxes[best]
+        if score <= 0 or len(indices) < 2:
+            break
+        order = indices[np.argsort(points[indices, channel], kind="stable")]
+        cumulative = np.cumsum(weights[order])
+        cut = int(np.searchsorted(cumulative, cumulative[-1] / 2)) + 1
+        cut = min(max(cut, 1), len(order) - 1)
+        boxes[best] = box_entry(order[:cut])
+        boxes.append(box_entry(order[cut:]))
+    return [indices for indices, _, _ in boxes]
+
+
+def refine_kmeans(points, weights, centers, iterations: int = KMEANS_ITERATIONS):
+    """
+    Weighted Lloyd iterations over the histogram bins, starting from the
+    median-cut centers. Returns (centers, weight per center).
+    """
+    point_norms = (points ** 2).sum(axis=1)[:, None]
+    for _ in range(iterations):
+        distances = point_norms - 2 * points @ centers.T + (centers ** 2).sum(axis=1)[None, :]
+        labels = distances.argmin(axis=1)
+        totals = np.bincount(labels, weights=weights, minlength=len(centers))
+        sums = np.stack([np.bincount(labels, weights=weights * points[:, c], minlength=len(centers))
+                         for c in range(3)], axis=1)
+        filled = totals > 0
+        updated = centers.copy()
+        updated[filled] = sums[filled] / totals[filled, None]
+        converged = np.allclose(updated, centers, atol=0.5)
+        centers = updated
+        if converged:
+            break
+    return centers, totals
+
+
+def extract_palette(image, num_colors: int = 5, method: str = "median_cut",
+                    max_pixels: int = 65536) -> List[Tuple[str, float]]:
+    """
+    Dominant colors of an IMAGE batch as (#RRGGBB, share of pixels), most
+    common first. Colors that round to the same hex code are merged.
+    """
+    points, weights = color_histogram(sample_pixels(image, max_pixels))
+    boxes = median_cut(points, weights, num_colors)
+    box_weights = np.array([weights[box].sum() for box in boxes])
+    centers = np.stack([(points[box] * weights[box, None]).sum(axis=0) / weights[box].sum()
+                        for box in boxes])
+    if method == "kmeans":
+        centers, box_weights = refine_kmeans(points, weights, centers)
+    
+    total = float(weights.sum())
+    shares = {}
+    for center, weight in zip(np.clip(np.rint(centers), 0, 255).astype(int), box_weights):
+        if weight <= 0:
+            continue
+        code = "#{:02X}{:02X}{:02X}".format(*center)
+        shares[code] = shares.get(code, 0.0) + float(weight) / total
+    return sorted(shares.items(), key=lambda item: -item[1])
+
+
+class FLUX2_ImagePalette(FLUX2BaseNode):
+    """
+    Extract a COLOR_ARRAY of dominant colors from an IMAGE batch.
+    Output is compatible with prompt_assembler's color_palette input.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "num_colors": ("INT", {
+                    "default": 5,
+                    "min": 1,
+                    "max": 16,
+                    "step": 1
+                }),
+                "method": (["median_cut", "kmeans"], {
+                    "default": "median_cut"
+                }),
+            },
+            "optional": {
+                "max_pixels": ("INT", {
+                    "default": 65536,
+                    "min": 1024,
+                    "max": 4194304,
+                    "step": 1024
+                }),
+            }
+        }
+    
+    RETURN_TYPES = (FLUX2Types.COLOR_ARRAY, "STRING")
+    RETURN_NAMES = ("color_palette", "palette_info")
+    FUNCTION = "extract_palette"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Utilities"
+    
+    def extract_palette(self, image, num_colors=5, method="median_cut", max_pixels=65536):
+        """
+        Extract dominant colors from a reference image batch.
+        
+        Args:
+            image: ComfyUI IMAGE batch [B, H, W, C]
+            num_colors: Maximum number of colors to return
+            method: "median_cut", or "kmeans" to refine the median-cut colors
+            max_pixels: Pixels sampled across the batch (larger images are strided)
+        
+        Returns:
+            Tuple of (color_array, info_string)
+        """
+        palette = extract_palette(image, num_colors=num_colors, method=method,
+                                  max_pixels=max_pixels)
+        colors = [code for code, _ in palette]
+        
+        info_lines = [f"Extracted colors ({len(colors)}, {method}):"]
+        info_lines.extend([f"  {i+1}. {code} ({share:.0%})"
+                           for i, (code, share) in enumerate(palette)])
+        info = "\n".join(info_lines)
+        
+        return (colors, info)
+    
+    # Description for display in UI
+    DESCRIPTION = """
+Extract a color palette from a reference image.
+
+Inputs:
+- image: Reference IMAGE (the whole batch is sampled)
+- num_colors: Up to 16 dominant colors
+- method: median_cut (fast) or kmeans (median cut refined by k-means)
+- max_pixels: Sample budget; large images are strided down to it, so a
+  4K reference is processed in milliseconds
+
+Colors are returned most common first as #RRGGBB codes, with the share
+of the image each covers in palette_info.
+
+Connect output to prompt_assembler's color_palette input.
+"""
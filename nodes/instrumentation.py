@@ -0,0 +1,217 @@
+"""
+Optional execution metrics for FLUX2 nodes
+
+Enable with the FLUX2_METRICS environment variable (1/true/on). When it is
+unset, node functions are left untouched, so there is no overhead.
+
+When enabled, every node's FUNCTION is wrapped to record call counts, errors,
+a latency histogram and an output size histogram (approximate compact JSON
+bytes). Set FLUX2_METRICS_FILE to export snapshots: files ending in .json get
+a JSON snapshot, anything else the Prometheus text format (e.g. for the
+node_exporter textfile collector). The file is rewritten at most every
+FLUX2_METRICS_INTERVAL seconds (default 15) and at interpreter exit.
+"""
+
+import atexit
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from . import serialization
+
+ENABLED = os.environ.get("FLUX2_METRICS", "").strip().lower() in ("1", "true", "yes", "on")
+
+# Histogram upper bounds (the +Inf bucket is implicit)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                   0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Fixed-bucket histogram (non-cumulative counts, one per bucket plus +Inf)"""
+    
+    __slots__ = ("bounds", "counts", "total", "count")
+    
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+    
+    def cumulative(self):
+        """(upper bound label, cumulative count) pairs as Prometheus expects"""
+        running = 0
+        pairs = []
+        for bound, count in zip(list(self.bounds) + ["+Inf"], self.counts):
+            running += count
+            pairs.append((bound if bound == "+Inf" else repr(bound), running))
+        return pairs
+    
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class NodeMetrics:
+    """Counters and histograms for one node class"""
+    
+    __slots__ = ("calls", "errors", "latency", "output_bytes")
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.output_bytes = Histogram(SIZE_BUCKETS)
+
+
+def output_size(result) -> int:
+    """Approximate size of a node result in bytes of compact JSON"""
+    if isinstance(result, dict) and "result" in result:
+        # OUTPUT_NODE style {"ui": ..., "result": (...)}
+        result = result["result"]
+    size = 0
+    for value in result if isinstance(result, tuple) else (result,):
+        if isinstance(value, str):
+            size += len(value)
+        elif value is not None:
+            size += len(serialization.dumps(value, pretty=False, default=str))
+    return size
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-node metrics with JSON and Prometheus export"""
+    
+    def __init__(self, path: Optional[str] = None, interval: float = 15.0):
+        self.path = path
+        self.interval = interval
+        self._nodes: Dict[str, NodeMetrics] = {}
+        self._lock = threading.Lock()
+        self._last_write = time.monotonic()
+    
+    def record(self, node: str, seconds: float, size: Optional[int], error: bool = False):
+        with self._lock:
+            metrics = self._nodes.get(node)
+            if metrics is None:
+                metrics = self._nodes[node] = NodeMetrics()
+            metrics.calls += 1
+            metrics.latency.observe(seconds)
+            if error:
+                metrics.errors += 1
+            else:
+                metrics.output_bytes.observe(size)
+            due = self.path and time.monotonic() - self._last_write >= self.interval
+        if due:
+            self.write()
+    
+    def reset(self):
+        with self._lock:
+            self._nodes.clear()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-compatible snapshot of every node's metrics"""
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "nodes": {
+                    name: {
+                        "calls": metrics.calls,
+                        "errors": metrics.errors,
+                        "latency_seconds": metrics.latency.to_dict(),
+                        "output_bytes": metrics.output_bytes.to_dict(),
+                    }
+                    for name, metrics in sorted(self._nodes.items())
+                },
+            }
+    
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            nodes = sorted(self._nodes.items())
+            
+            for metric, attribute, help_text in (
+                ("flux2_node_calls_total", "calls", "Node function calls"),
+                ("flux2_node_errors_total", "errors", "Node function calls that raised"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} counter")
+                for name, metrics in nodes:
+                    lines.append(f'{metric}{{node="{name}"}} {getattr(metrics, attribute)}')
+            
+            for metric, attribute, help_text in (
+                ("flux2_node_latency_seconds", "latency", "Node function latency"),
+                ("flux2_node_output_bytes", "output_bytes", "Approximate node output size"),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for name, metrics in nodes:
+                    histogram = getattr(metrics, attribute)
+                    for bound, count in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{node="{name}",le="{bound}"}} {count}')
+                    lines.append(f'{metric}_sum{{node="{name}"}} {histogram.total!r}')
+                    lines.append(f'{metric}_count{{node="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path: Optional[str] = None):
+        """Atomically write a snapshot; .json files get JSON, others Prometheus text"""
+        path = path or self.path
+        if not path:
+            return
+        if path.endswith(".json"):
+            text = json.dumps(self.snapshot(), indent=2)
+        else:
+            text = self.to_prometheus()
+        
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(temp_path, path)
+        self._last_write = time.monotonic()
+
+
+METRICS = MetricsRegistry(path=os.environ.get("FLUX2_METRICS_FILE") or None,
+                          interval=float(os.environ.get("FLUX2_METRICS_INTERVAL", "15")))
+
+if ENABLED and METRICS.path:
+    atexit.register(METRICS.write)
+
+
+def instrument(cls, registry: Optional[MetricsRegistry] = None):
+    """
+    Wrap the FUNCTION a node class defines so every call is recorded.
+    Inherited functions are already wrapped by the class that defines them;
+    calls are recorded under the runtime class name.
+    """
+    registry = registry or METRICS
+    function = cls.__dict__.get(getattr(cls, "FUNCTION", None))
+    if not callable(function) or getattr(function, "__flux2_instrumented__", False):
+        return cls
+    
+    @functools.wraps(function)
+    def timed(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = function(self, *args, **kwargs)
+        except Exception:
+            registry.record(type(self).__name__, time.perf_counter() - start, None, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+        registry.record(type(self).__name__, elapsed, output_size(result))
+        return result
+    
+    timed.__flux2_instrumented__ = True
+    setattr(cls, cls.FUNCTION, timed)
+    return cls
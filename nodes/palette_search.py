@@ -0,0 +1,332 @@
+"""
+Perceptual nearest-palette search over preset and library palettes
+
+Palettes are compared by palette distance: the symmetric mean
+nearest-color difference (each color matched to the closest color of the
+other palette, averaged both ways).
+
+Every distinct color of the indexed palettes is converted to CIELAB once
+and stored in a KD-tree. A search walks outwards from each query color,
+scoring the palettes that own the library colors it reaches, until no
+palette left unscored can beat the current shortlist: an unscored palette
+has no color within radius r_i of query color i, so its distance is at
+least (mean(r) + min(r)) / 2. With NumPy, palettes are scored in
+vectorized batches from one flat array of every palette's Lab colors.
+
+CIE76 results (the tree's Euclidean Lab metric) are exact unless more
+than MAX_SCORED palettes have to be scored. CIEDE2000 results are
+approximate: the CIE76 shortlist of at least RERANK_MIN palettes is
+re-ranked with CIEDE2000, and a palette outside it is never considered,
+although the two metrics can order palettes differently. Near matches
+are found reliably; for queries far from every palette the CIEDE2000
+nearest can be missed.
+
+Only palettes with colors near the query are ever scored, so lookups for
+palettes resembling the library stay fast with tens of thousands of
+entries.
+"""
+
+import bisect
+import heapq
+import math
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # ComfyUI always ships numpy; without it palettes are scored in Python
+    np = None
+
+from .base import FLUX2Presets
+from .colors import Lab, delta_e_76, delta_e_2000, hex_to_lab, normalize_colors
+
+METRICS: Dict[str, Callable[[Lab, Lab], float]] = {
+    "CIEDE2000": delta_e_2000,
+    "CIE76": delta_e_76,
+}
+
+# Library colors first looked up per query color; grown 4x per round
+NEIGHBORS_PER_COLOR = 16
+# CIE76 shortlist size per requested result when re-ranking by CIEDE2000,
+# and the smallest shortlist re-ranked
+RERANK_FACTOR = 4
+RERANK_MIN = 32
+# Palettes scored before the search settles for its best so far
+MAX_SCORED = 512
+# Palettes scored per vectorized batch
+SCORE_BATCH = 64
+
+
+class LabKDTree:
+    """
+    Static KD-tree over Lab points for k-nearest-neighbour queries.
+    Internal nodes are (axis, split, left, right) tuples and leaves are
+    lists of point indices.
+    """
+    
+    LEAF_SIZE = 16
+    
+    def __init__(self, points: Sequence[Lab]):
+        self.points = list(points)
+        self._axes = [[point[axis] for point in self.points] for axis in range(3)]
+        self._root = self._build(list(range(len(self.points)))) if self.points else []
+    
+    def __len__(self):
+        return len(self.points)
+    
+    def _build(self, indices: List[int]):
+        if len(indices) <= self.LEAF_SIZE:
+            return indices
+        # Split the axis with the widest spread at its median
+        spreads = []
+        for axis in range(3):
+            values = [self._axes[axis][i] for i in indices]
+            spreads.append(max(values) - min(values))
+        axis = spreads.index(max(spreads))
+        indices.sort(key=self._axes[axis].__getitem__)
+        middle = len(indices) // 2
+        split = self._axes[axis][indices[middle]]
+        return (axis, split, self._build(indices[:middle]), self._build(indices[middle:]))
+    
+    def nearest(self, target: Lab, k: int = 1) -> List[Tuple[float, int]]:
+        """The k closest points to target as (squared distance, index), closest first"""
+        points = self.points
+        tx, ty, tz = target
+        heap: List[Tuple[float, int]] = []  # (-squared distance, index)
+        stack = [(self._root, 0.0)]  # (node, lower bound on squared distance)
+        
+        while stack:
+            node, bound = stack.pop()
+            if len(heap) == k and bound >= -heap[0][0]:
+                continue
+            if type(node) is list:
+                for index in node:
+                    px, py, pz = points[index]
+                    distance = (px - tx) ** 2 + (py - ty) ** 2 + (pz - tz) ** 2
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, index))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, index))
+                continue
+            axis, split, left, right = node
+            offset = target[axis] - split
+            near, far = (left, right) if offset < 0 else (right, left)
+            # Points across the split are at least |offset| away
+            stack.append((far, max(bound, offset * offset)))
+            stack.append((near, bound))
+        
+        return sorted((-negative, index) for negative, index in heap)
+
+
+def palette_distance(first: Sequence[Lab], second: Sequence[Lab],
+                     metric: Callable[[Lab, Lab], float] = delta_e_2000) -> float:
+    """Symmetric mean nearest-color difference between two Lab palettes"""
+    if metric is delta_e_76:
+        metric = math.dist
+    rows = [[metric(a, b) for b in second] for a in first]
+    forward = sum(map(min, rows)) / len(first)
+    backward = sum(map(min, zip(*rows))) / len(second)
+    return (forward + backward) / 2
+
+
+def delta_e_2000_array(lab1, lab2):
+    """
+    CIEDE2000 differences between Lab arrays of shape (..., 3), broadcast
+    against each other; the vectorized form of colors.delta_e_2000
+    """
+    L1, a1, b1 = np.moveaxis(np.asarray(lab1, dtype=float), -1, 0)
+    L2, a2, b2 = np.moveaxis(np.asarray(lab2, dtype=float), -1, 0)
+    
+    c_bar7 = ((np.hypot(a1, b1) + np.hypot(a2, b2)) / 2) ** 7
+    g = 0.5 * (1 - np.sqrt(c_bar7 / (c_bar7 + 25.0 ** 7)))
+    a1p, a2p = (1 + g) * a1, (1 + g) * a2
+    c1p, c2p = np.hypot(a1p, b1), np.hypot(a2p, b2)
+    # atan2(0, 0) is 0, matching the scalar version's gray hue
+    h1p = np.degrees(np.arctan2(b1, a1p)) % 360
+    h2p = np.degrees(np.arctan2(b2, a2p)) % 360
+    
+    delta_lp = L2 - L1
+    delta_cp = c2p - c1p
+    chroma_product = c1p * c2p
+    gray = chroma_product == 0
+    delta_hp = h2p - h1p
+    delta_hp = np.where(delta_hp > 180, delta_hp - 360,
+                        np.where(delta_hp < -180, delta_hp + 360, delta_hp))
+    delta_hp = np.where(gray, 0.0, delta_hp)
+    h_sum = h1p + h2p
+    h_bar = np.where(np.abs(h1p - h2p) > 180,
+                     np.where(h_sum < 360, h_sum / 2 + 180, h_sum / 2 - 180), h_sum / 2)
+    h_bar = np.where(gray, h_sum, h_bar)
+    delta_big_hp = 2 * np.sqrt(chroma_product) * np.sin(np.radians(delta_hp / 2))
+    
+    l_bar = (L1 + L2) / 2
+    c_bar_p = (c1p + c2p) / 2
+    t = (1 - 0.17 * np.cos(np.radians(h_bar - 30))
+         + 0.24 * np.cos(np.radians(2 * h_bar))
+         + 0.32 * np.cos(np.radians(3 * h_bar + 6))
+         - 0.20 * np.cos(np.radians(4 * h_bar - 63)))
+    delta_theta = 30 * np.exp(-(((h_bar - 275) / 25) ** 2))
+    c_bar_p7 = c_bar_p ** 7
+    r_c = 2 * np.sqrt(c_bar_p7 / (c_bar_p7 + 25.0 ** 7))
+    l50 = (l_bar - 50) ** 2
+    s_l = 1 + 0.015 * l50 / np.sqrt(20 + l50)
+    s_c = 1 + 0.045 * c_bar_p
+    s_h = 1 + 0.015 * c_bar_p * t
+    r_t = -np.sin(np.radians(2 * delta_theta)) * r_c
+    
+    dl, dc, dh = delta_lp / s_l, delta_cp / s_c, delta_big_hp / s_h
+    return np.sqrt(dl * dl + dc * dc + dh * dh + r_t * dc * dh)
+
+
+class PaletteIndex:
+    """Nearest-palette search over a fixed name -> colors mapping"""
+    
+    def __init__(self, palettes: Mapping[str, Iterable[str]]):
+        self.names: List[str] = []
+        self.palettes: List[List[Lab]] = []
+        point_ids: Dict[str, int] = {}
+        points: List[Lab] = []
+        self._owners: List[List[int]] = []
+        
+        for name, colors in palettes.items():
+            codes, _ = normalize_colors(colors)
+            if not codes:
+                continue
+            palette_id = len(self.names)
+            self.names.append(name)
+            self.palettes.append([hex_to_lab(code) for code in codes])
+            for code in dict.fromkeys(codes):
+                point_id = point_ids.get(code)
+                if point_id is None:
+                    point_id = point_ids[code] = len(points)
+                    points.append(hex_to_lab(code))
+                    self._owners.append([])
+                self._owners[point_id].append(palette_id)
+        
+        self.tree = LabKDTree(points)
+        if np is not None:
+            # Palette i's colors are _colors[_starts[i]:_starts[i] + _sizes[i]]
+            self._sizes = np.array([len(palette) for palette in self.palettes], dtype=np.intp)
+            self._starts = np.cumsum(self._sizes) - self._sizes
+            self._colors = np.array([lab for palette in self.palettes for lab in palette],
+                                    dtype=float).reshape(-1, 3)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def shortlist(self, query: Sequence[Lab], size: int) -> List[Tuple[float, int]]:
+        """
+        Up to size palettes close to the query Lab colors under CIE76
+        palette distance, as (distance, palette id) pairs, closest first.
+        The first is the exact nearest palette unless more than MAX_SCORED
+        palettes had to be scored; the rest are the best of those scored.
+        """
+        scored: Dict[int, float] = {}
+        batch = SCORE_BATCH if np is not None else 1
+        k = NEIGHBORS_PER_COLOR
+        while True:
+            radii = []
+            # Distance from each query color to the nearest color of each
+            # palette reached; exact, since neighbors come closest first
+            reached: List[Dict[int, float]] = []
+            for lab in query:
+                neighbors = self.tree.nearest(lab, k)
+                radii.append(math.sqrt(neighbors[-1][0]) if len(neighbors) == k else math.inf)
+                nearest: Dict[int, float] = {}
+                for squared, point_id in neighbors:
+                    for palette_id in self._owners[point_id]:
+                        if palette_id not in nearest:
+                            nearest[palette_id] = math.sqrt(squared)
+                reached.append(nearest)
+            
+            # Lower bound on each reached palette's forward (query -> palette)
+            # term; the palette distance is at least half of it
+            candidates = set().union(*reached)
+            forward = sorted((sum(nearest.get(palette_id, radius)
+                                  for nearest, radius in zip(reached, radii)) / len(query),
+                              palette_id) for palette_id in candidates)
+            best: List[Tuple[float, int]] = []
+            for start in range(0, len(forward), batch):
+                if len(best) == size and forward[start][0] / 2 >= best[-1][0]:
+                    break
+                palette_ids = [palette_id for _, palette_id in forward[start:start + batch]]
+                unscored = [palette_id for palette_id in palette_ids if palette_id not in scored]
+                if unscored:
+                    scored.update(zip(unscored, self.distances(query, unscored, delta_e_76)))
+                for palette_id in palette_ids:
+                    bisect.insort(best, (scored[palette_id], palette_id))
+                del best[size:]
+            
+            # Lower bound on the distance of every palette not reached yet
+            bound = (sum(radii) / len(radii) + min(radii)) / 2
+            if (bound == math.inf or len(scored) >= MAX_SCORED
+                    or (len(best) == size and best[0][0] <= bound)):
+                return best
+            k *= 4
+    
+    def distances(self, query: Sequence[Lab], palette_ids: Sequence[int],
+                  metric: Callable[[Lab, Lab], float] = delta_e_2000) -> List[float]:
+        """
+        Palette distance from the query Lab colors to each given palette.
+        With NumPy the built-in metrics are computed from one (query x all
+        colors of the given palettes) matrix.
+        """
+        if not len(palette_ids):
+            return []
+        if np is None or metric not in (delta_e_76, delta_e_2000):
+            return [palette_distance(query, self.palettes[palette_id], metric)
+                    for palette_id in palette_ids]
+        
+        palette_ids = np.asarray(palette_ids, dtype=np.intp)
+        sizes = self._sizes[palette_ids]
+        starts = np.cumsum(sizes) - sizes
+        # Gather each palette's colors into one contiguous block
+        gather = np.arange(starts[-1] + sizes[-1]) + np.repeat(self._starts[palette_ids] - starts, sizes)
+        colors = self._colors[gather][None, :, :]
+        labs = np.asarray(query, dtype=float)[:, None, :]
+        if metric is delta_e_76:
+            rows = np.sqrt(((labs - colors) ** 2).sum(axis=-1))
+        else:
+            rows = delta_e_2000_array(labs, colors)
+        # Forward: each query color's closest color per palette, averaged;
+        # backward: each palette color's closest query color, averaged
+        forward = np.minimum.reduceat(rows, starts, axis=1).mean(axis=0)
+        backward = np.add.reduceat(rows.min(axis=0), starts) / sizes
+        return ((forward + backward) / 2).tolist()
+    
+    def search(self, colors: Iterable[str], top_k: int = 5,
+               metric: str = "CIEDE2000") -> List[Tuple[str, float]]:
+        """
+        Closest palettes to the given colors (hex codes or color names).
+        CIEDE2000 rankings are approximate (see the module docstring).
+        
+        Returns:
+            List of (palette name, distance) pairs, closest first
+        """
+        codes, _ = normalize_colors(colors)
+        if not codes or not self.names:
+            return []
+        query = [hex_to_lab(code) for code in codes]
+        measure = METRICS[metric]
+        size = top_k if measure is delta_e_76 else max(top_k * RERANK_FACTOR, RERANK_MIN)
+        
+        ranked = self.shortlist(query, min(len(self.names), size))
+        if measure is not delta_e_76:
+            palette_ids = [palette_id for _, palette_id in ranked]
+            ranked = sorted(zip(self.distances(query, palette_ids, measure), palette_ids))
+        return [(self.names[palette_id], distance) for distance, palette_id in ranked[:top_k]]
+
+
+_preset_index: Optional[Tuple[int, PaletteIndex]] = None
+
+
+def preset_palette_index(builtin: Mapping[str, List[str]]) -> PaletteIndex:
+    """
+    Index over the built-in palettes plus palettes from preset library
+    files, rebuilt when FLUX2Presets.version changes.
+    """
+    global _preset_index
+    if _preset_index is None or _preset_index[0] != FLUX2Presets.version:
+        palettes = {name: FLUX2Presets.get("palettes", name, [], builtin=builtin)
+                    for name in FLUX2Presets.names("palettes", builtin=builtin)}
+        _preset_index = (FLUX2Presets.version, PaletteIndex(palettes))
+    return _preset_index[1]
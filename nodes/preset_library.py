@@ -0,0 +1,324 @@
+"""
+External preset libraries loaded lazily from user directories of JSON files
+
+Layout (one subdirectory per preset kind, any number of JSON files each):
+    
+    <root>/scene_types/*.json       {"Name": "Scene description", ...}
+    <root>/style_categories/*.json  {"Category": ["Style 1", "Style 2"], ...}
+    <root>/camera_presets/*.json    {"Name": {"angle": ..., "lens-mm": 85}, ...}
+    <root>/mood_presets/*.json      {"Name": "Mood description", ...}
+    <root>/palettes/*.json          {"Name": ["#RRGGBB", ...], ...}
+
+Roots come from the FLUX2_PRESET_DIRS environment variable (os.pathsep
+separated) plus the package's own presets/ directory.
+
+Nothing is read until a kind is first used. Each kind directory keeps an
+on-disk offset index (.flux2_index.json) mapping every preset name to the
+byte range of its value, so listing names reads only the index and
+fetching one preset parses only that preset. Files are re-scanned only
+when their size or mtime changes, and a polling watcher invalidates the
+in-memory index when files are added, edited or removed.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from json.decoder import scanstring
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PRESET_KINDS = ("scene_types", "style_categories", "camera_presets", "mood_presets", "palettes")
+INDEX_FILENAME = ".flux2_index.json"
+INDEX_FORMAT = 1
+PACKAGE_PRESET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "presets")
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+
+def scan_offsets(data: bytes) -> Dict[str, List[int]]:
+    """
+    Map each top-level key of a JSON object to the [offset, length] byte
+    range of its value.
+    """
+    text = data.decode("utf-8-sig")
+    bom = len(data) - len(text.encode("utf-8"))
+    ascii_only = len(text) + bom == len(data)
+    
+    # Character -> byte offset conversion, advanced incrementally
+    char_pos = 0
+    byte_pos = bom
+    
+    def to_bytes(index):
+        nonlocal char_pos, byte_pos
+        if ascii_only:
+            return index + bom
+        byte_pos += len(text[char_pos:index].encode("utf-8"))
+        char_pos = index
+        return byte_pos
+    
+    pos = _WHITESPACE.match(text, 0).end()
+    if text[pos:pos + 1] != "{":
+        raise ValueError("preset file must contain a JSON object")
+    pos = _WHITESPACE.match(text, pos + 1).end()
+    
+    entries: Dict[str, List[int]] = {}
+    if text[pos:pos + 1] == "}":
+        return entries
+    
+    while True:
+        if text[pos:pos + 1] != '"':
+            raise ValueError(f"expected a preset name at character {pos}")
+        name, pos = scanstring(text, pos + 1)
+        pos = _WHITESPACE.match(text, pos).end()
+        if text[pos:pos + 1] != ":":
+            raise ValueError(f"expected ':' at character {pos}")
+        start = _WHITESPACE.match(text, pos + 1).end()
+        _, end = _decoder.raw_decode(text, start)
+        
+        byte_start = to_bytes(start)
+        entries[name] = [byte_start, to_bytes(end) - byte_start]
+        
+        pos = _WHITESPACE.match(text, end).end()
+        delimiter = text[pos:pos + 1]
+        if delimiter == "}":
+            return entries
+        if delimiter != ",":
+            raise ValueError(f"expected ',' or '}}' at character {pos}")
+        pos = _WHITESPACE.match(text, pos + 1).end()
+
+
+def _validate(kind: str, name: str, value: Any, path: str) -> Any:
+    """Check a fetched preset has the shape its kind requires"""
+    if kind in ("scene_types", "mood_presets"):
+        valid = isinstance(value, str)
+    elif kind == "camera_presets":
+        valid = isinstance(value, dict)
+    else:
+        valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+    if not valid:
+        raise ValueError(f"Preset '{name}' in {path} has the wrong type for {kind}")
+    return value
+
+
+class PresetLibrary:
+    """
+    Lazily indexed preset files from one or more root directories.
+    Later roots and files override earlier ones for the same name.
+    """
+    
+    VALUE_CACHE_SIZE = 4096
+    
+    def __init__(self, roots: Optional[List[str]] = None, watch_interval: Optional[float] = None):
+        self._configured_roots = roots
+        if watch_interval is None:
+            watch_interval = float(os.environ.get("FLUX2_PRESET_WATCH_INTERVAL", "2.0"))
+        self.watch_interval = watch_interval
+        
+        self._lock = threading.RLock()
+        self._indexes: Dict[str, Dict[str, Tuple[str, int, int]]] = {}
+        self._values: Dict[Tuple[str, str], Any] = {}
+        self._signature = None
+        self._callbacks: List[Callable[[], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @property
+    def roots(self) -> List[str]:
+        if self._configured_roots is not None:
+            return list(self._configured_roots)
+        roots = [PACKAGE_PRESET_DIR]
+        extra = os.environ.get("FLUX2_PRESET_DIRS", "")
+        roots.extend(path for path in extra.split(os.pathsep) if path.strip())
+        return roots
+    
+    def on_change(self, callback: Callable[[], None]):
+        """Register a callback run whenever the preset files change"""
+        self._callbacks.append(callback)
+    
+    # ------------------------------------------------------------------
+    # Lookup
+    
+    def names(self, kind: str) -> List[str]:
+        """Preset names for a kind, in file order"""
+        return list(self._index(kind))
+    
+    def get(self, kind: str, name: str, default: Any = None) -> Any:
+        """Fetch one preset, parsing only its byte range"""
+        location = self._index(kind).get(name)
+        if location is None:
+            return default
+        
+        key = (kind, name)
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        
+        path, offset, length = location
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            raw = handle.read(length)
+        value = _validate(kind, name, json.loads(raw), path)
+        
+        with self._lock:
+            if len(self._values) >= self.VALUE_CACHE_SIZE:
+                self._values.clear()
+            self._values[key] = value
+        return value
+    
+    def __contains__(self, item):
+        kind, name = item
+        return name in self._index(kind)
+    
+    # ------------------------------------------------------------------
+    # Indexing
+    
+    def _index(self, kind: str) -> Dict[str, Tuple[str, int, int]]:
+        if kind not in PRESET_KINDS:
+            raise ValueError(f"Unknown preset kind '{kind}', expected one of {PRESET_KINDS}")
+        index = self._indexes.get(kind)
+        if index is not None:
+            return index
+        
+        with self._lock:
+            index = self._indexes.get(kind)
+            if index is None:
+                if self._signature is None:
+                    self._signature = self._compute_signature()
+                    self._start_watcher()
+                index = {}
+                for root in self.roots:
+                    index.update(self._load_directory(os.path.join(root, kind)))
+                self._indexes[kind] = index
+        return index
+    
+    def _load_directory(self, directory: str) -> Dict[str, Tuple[str, int, int]]:
+        """Index every JSON file in a kind directory, reusing the sidecar when fresh"""
+        if not os.path.isdir(directory):
+            return {}
+        
+        sidecar_path = os.path.join(directory, INDEX_FILENAME)
+        sidecar = {"format": INDEX_FORMAT, "files": {}}
+        try:
+            with open(sidecar_path, encoding="utf-8") as handle:
+                stored = json.load(handle)
+            if stored.get("format") == INDEX_FORMAT:
+                sidecar = stored
+        except (OSError, ValueError):
+            pass
+        
+        files = {}
+        dirty = False
+        index: Dict[str, Tuple[str, int, int]] = {}
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json") or filename == INDEX_FILENAME:
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            
+            entry = sidecar["files"].get(filename)
+            if not entry or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                try:
+                    with open(path, "rb") as handle:
+                        offsets = scan_offsets(handle.read())
+                except (OSError, ValueError) as e:
+                    logger.warning("Skipping preset file %s: %s", path, e)
+                    continue
+                entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "entries": offsets}
+                dirty = True
+            
+            files[filename] = entry
+            for name, (offset, length) in entry["entries"].items():
+                index[name] = (path, offset, length)
+        
+        if dirty or files.keys() != sidecar["files"].keys():
+            self._write_sidecar(sidecar_path, {"format": INDEX_FORMAT, "files": files})
+        return index
+    
+    @staticmethod
+    def _write_sidecar(path: str, data: Dict):
+        """Atomically replace the on-disk index (read-only directories are fine)"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(data, handle, ensure_ascii=False, separators=(",", ":"))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.debug("Could not write preset index %s: %s", path, e)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
+    # ------------------------------------------------------------------
+    # Change detection
+    
+    def _compute_signature(self):
+        """Cheap fingerprint of every preset file (name, size, mtime)"""
+        signature = []
+        for root in self.roots:
+            for kind in PRESET_KINDS:
+                directory = os.path.join(root, kind)
+                try:
+                    entries = os.scandir(directory)
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        if entry.name.endswith(".json") and entry.name != INDEX_FILENAME:
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            signature.append((directory, entry.name, stat.st_size, stat.st_mtime_ns))
+        return sorted(signature)
+    
+    def invalidate(self):
+        """Drop the in-memory index and notify listeners"""
+        with self._lock:
+            self._indexes.clear()
+            self._values.clear()
+            self._signature = None
+        for callback in self._callbacks:
+            callback()
+    
+    def refresh(self) -> bool:
+        """Invalidate if any preset file changed since it was indexed"""
+        with self._lock:
+            if self._signature is None:
+                return False
+            changed = self._compute_signature() != self._signature
+        if changed:
+            logger.info("Preset files changed, reloading preset index")
+            self.invalidate()
+        return changed
+    
+    def _start_watcher(self):
+        # Only poll when some preset directory actually holds files
+        if self._watcher is not None or self.watch_interval <= 0 or not self._signature:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="flux2-preset-watcher",
+                                         daemon=True)
+        self._watcher.start()
+    
+    def _watch(self):
+        while not self._stop.wait(self.watch_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Preset watcher failed")
+    
+    def stop_watcher(self):
+        """Stop the background watcher (mainly for tests)"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+        self._watcher = None
+        self._stop = threading.Event()
@@ -3,6 +3,9 @@ FLUX2_PromptAssembler - Master node for assembling complete JSON prompts
 """
 
 from .base import FLUX2BaseNode, FLUX2Types
+from .prompt_cache import prompt_cache
+from .prompt_emitter import IncrementalEmitter, emit_prompt
+from .records import to_plain
 
 
 class FLUX2_PromptAssembler(FLUX2BaseNode):
@@ -55,6 +58,9 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
                 "remove_empty": ("BOOLEAN", {
                     "default": True
                 }),
+                "always_refresh": ("BOOLEAN", {
+                    "default": False
+                }),
             }
         }
     
@@ -76,7 +82,8 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
                        composition="",
                        camera=None,
                        pretty_print=True,
-                       remove_empty=True):
+                       remove_empty=True,
+                       always_refresh=False):
         """
         Assemble all components into final JSON prompt.
         
@@ -92,11 +99,47 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
             camera: Camera object with parameters
             pretty_print: Format JSON with indentation
             remove_empty: Remove empty/null fields from output
+            always_refresh: Force re-execution on every queue (see IS_CHANGED)
         
         Returns:
             Tuple of (json_string, json_object)
         """
         
+        subjects = self.subject_list(subjects)
+        inputs = dict(scene=scene, subjects=subjects, style=style,
+                      color_palette=color_palette, lighting=lighting, mood=mood,
+                      background=background, composition=composition, camera=camera)
+        
+        # Answer repeated prompts from the on-disk cache when it is enabled
+        cache = prompt_cache()
+        if cache is None:
+            return self._assemble(pretty_print, remove_empty, **inputs)
+        key = cache.key(pretty_print=pretty_print, remove_empty=remove_empty, **inputs)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        json_string, prompt = self._assemble(pretty_print, remove_empty, **inputs)
+        cache.put(key, json_string)  # json_object is json_string decoded
+        return (json_string, prompt)
+    
+    def _assemble(self, pretty_print, remove_empty, scene, subjects, style, color_palette,
+                  lighting, mood, background, composition, camera):
+        # Drop empty fields while encoding, in a single pass, re-encoding
+        # only the fields that changed since this node's previous run.
+        # This beats cleaning in Python and encoding with orjson as well,
+        # except on a first run (see benchmarks/bench_incremental.py).
+        if remove_empty:
+            return self.incremental_emitter(pretty_print).emit(
+                scene=scene,
+                subjects=subjects,
+                style=style,
+                color_palette=color_palette,
+                lighting=lighting,
+                mood=mood,
+                background=background,
+                composition=composition,
+                camera=camera)
+        
         # Build the prompt dictionary
         prompt = {}
         
@@ -105,7 +148,7 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
             prompt["scene"] = scene.strip()
         
         if subjects:
-            prompt["subjects"] = subjects
+            prompt["subjects"] = to_plain(subjects)
         
         if style:
             prompt["style"] = style.strip()
@@ -126,11 +169,7 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
             prompt["composition"] = composition.strip()
         
         if camera:
-            prompt["camera"] = camera
-        
-        # Remove empty fields if requested
-        if remove_empty:
-            prompt = self.remove_empty_fields(prompt)
+            prompt["camera"] = to_plain(camera)
         
         # Format as JSON string
         json_string = self.format_json_output(prompt, pretty=pretty_print)
@@ -138,10 +177,21 @@ class FLUX2_PromptAssembler(FLUX2BaseNode):
         # Return both string and dict
         return (json_string, prompt)
     
+    def incremental_emitter(self, pretty: bool) -> IncrementalEmitter:
+        """This node's emitter for one layout (ComfyUI reuses node instances across runs)"""
+        emitters = self.__dict__.setdefault("_emitters", {})
+        emitter = emitters.get(bool(pretty))
+        if emitter is None:
+            emitter = emitters[bool(pretty)] = IncrementalEmitter(bool(pretty))
+        return emitter
+    
     @classmethod
-    def IS_CHANGED(cls, **kwargs):
-        # Always execute to ensure updates propagate
-        return float("nan")
+    def IS_CHANGED(cls, always_refresh=False, **kwargs):
+        # Only re-execute when the assembled content could differ, so
+        # unchanged prompts keep downstream encoder/sampler caches valid
+        if always_refresh:
+            return float("nan")
+        return cls.fingerprint_inputs(**kwargs)
 
 
 # For display in UI
@@ -158,4 +208,5 @@ Outputs:
 Options:
 - pretty_print: Format with indentation for readability
 - remove_empty: Automatically remove empty/null fields
+- always_refresh: Re-run on every queue even if inputs are unchanged
 """
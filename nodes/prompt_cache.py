@@ -0,0 +1,352 @@
+"""
+Persistent cache of assembled prompts
+
+Enable with the FLUX2_PROMPT_CACHE environment variable: a path to the
+cache database, or 1/true/on for flux2_prompt_cache.db in the ComfyUI
+user directory (~/.cache/flux2-prompt-builder outside ComfyUI). When it
+is unset the Prompt Assembler does not touch the disk at all.
+
+Entries are keyed by a SHA-256 of the canonical JSON of the assembler
+inputs and hold both outputs, so a restarted worker answers repeated
+prompts without reassembling them. The cache is a SQLite database in WAL
+mode: any number of processes on the host can read while one writes, and
+every write is a single transaction, so a crash never leaves a partial
+entry. Size is bounded by FLUX2_PROMPT_CACHE_MAX_MB (default 256, least
+recently used entries go first) and age by FLUX2_PROMPT_CACHE_MAX_AGE_DAYS
+(default 30, 0 = no limit).
+
+Usage:
+    python -m nodes.prompt_cache --stats
+    python -m nodes.prompt_cache --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Optional, Tuple
+
+from . import serialization
+from .records import Record, to_plain
+
+try:
+    import folder_paths
+except ImportError:
+    # Running outside ComfyUI (tests, scripts)
+    folder_paths = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the assembler output format changes to ignore older entries
+CACHE_VERSION = 1
+
+DEFAULT_MAX_MB = 256
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Access times are refreshed at most this often, so hits rarely write
+TOUCH_INTERVAL = 60.0
+# Writes between size checks, and the share of max_bytes kept after eviction
+CHECK_EVERY = 256
+EVICT_TO = 0.9
+# Seconds between flushes of the hit/miss counters to the database
+STATS_INTERVAL = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prompts (
+    key TEXT PRIMARY KEY,
+    json_string TEXT NOT NULL,
+    json_object TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prompts_accessed ON prompts (accessed);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+_COUNTERS = ("hits", "misses", "writes", "evictions", "expired")
+
+
+def _key_default(value):
+    if isinstance(value, Record):
+        return {type(value).__name__: value.fingerprint()}
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return list(value)
+    raise TypeError(f"Cannot hash {type(value).__name__} input")
+
+
+def _decode(text: str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity, which only the stdlib accepts
+    return json.loads(text)
+
+
+class PromptCache:
+    """
+    SQLite-backed cache of (json_string, json_object) assembler outputs.
+    
+    Each process (and each fork) opens its own connection on first use;
+    calls from several threads share it under a lock. Counters are kept
+    per process and added to database totals every few seconds and when
+    the cache is closed.
+    """
+    
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_MB << 20,
+                 max_age: float = DEFAULT_MAX_AGE_DAYS * 86400.0, timeout: float = 10.0):
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.timeout = timeout
+        self.counts = dict.fromkeys(_COUNTERS, 0)
+        self._flushed = dict.fromkeys(_COUNTERS, 0)
+        self._last_flush = time.monotonic()
+        self._writes_since_check = CHECK_EVERY
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = None
+    
+    # -- connection --------------------------------------------------------
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        # A connection inherited through fork must not be used by the child
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+        self._pid = os.getpid()
+        self._flushed = dict(self.counts)
+        return connection
+    
+    def close(self):
+        """Flush the counters and close this process's connection"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._flush_stats(self._connection)
+                self._connection.close()
+            self._connection = None
+    
+    # -- keys and entries --------------------------------------------------
+    
+    @staticmethod
+    def key(**inputs) -> str:
+        """
+        Canonical hash of assembler inputs (dict order never matters).
+        Records stand in as their own cached fingerprint, so hashing a
+        prompt built from reused subjects does not re-encode them.
+        """
+        canonical = serialization.dumps(dict(inputs, cache_version=CACHE_VERSION), pretty=False,
+                                        canonical=True, default=_key_default)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """(json_string, json_object) stored under key, or None"""
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT json_string, json_object, created, accessed FROM prompts WHERE key = ?",
+                (key,)).fetchone()
+            if row is not None and self.max_age and now - row[2] > self.max_age:
+                connection.execute("DELETE FROM prompts WHERE key = ? AND created = ?", (key, row[2]))
+                self.counts["expired"] += 1
+                row = None
+            if row is None:
+                self.counts["misses"] += 1
+            else:
+                self.counts["hits"] += 1
+                if now - row[3] > TOUCH_INTERVAL:
+                    connection.execute("UPDATE prompts SET accessed = ? WHERE key = ?", (now, key))
+            self._maybe_flush(connection)
+        if row is None:
+            return None
+        return row[0], _decode(row[1] if row[1] is not None else row[0])
+    
+    def put(self, key: str, json_string: str, json_object: Optional[Dict] = None):
+        """
+        Store an assembler result (replacing an older entry for key).
+        Pass json_object only when it is not simply json_string decoded;
+        otherwise it is rebuilt from json_string on a hit.
+        """
+        encoded = None
+        size = len(key) + len(json_string.encode("utf-8"))
+        if json_object is not None:
+            encoded = serialization.dumps(to_plain(json_object), pretty=False)
+            size += len(encoded.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO prompts (key, json_string, json_object, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, json_string, encoded, size, now, now))
+            self.counts["writes"] += 1
+            self._writes_since_check += 1
+            if self._writes_since_check >= CHECK_EVERY:
+                self._writes_since_check = 0
+                self._evict(connection, now)
+            self._maybe_flush(connection)
+    
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM prompts")
+            connection.execute("DELETE FROM stats")
+            self.counts = dict.fromkeys(_COUNTERS, 0)
+            self._flushed = dict.fromkeys(_COUNTERS, 0)
+    
+    # -- eviction ----------------------------------------------------------
+    
+    def evict(self):
+        """Drop expired entries and, when over max_bytes, the least recently used ones"""
+        with self._lock:
+            self._evict(self._connect(), time.time())
+    
+    def _evict(self, connection, now):
+        if self.max_age:
+            deleted = connection.execute("DELETE FROM prompts WHERE created < ?",
+                                         (now - self.max_age,)).rowcount
+            self.counts["expired"] += max(deleted, 0)
+        if not self.max_bytes:
+            return
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM prompts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            # Oldest access first, until enough bytes are freed
+            keys = []
+            for key, size in connection.execute("SELECT key, size FROM prompts ORDER BY accessed"):
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM prompts WHERE key = ?", keys)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        self.counts["evictions"] += len(keys)
+    
+    # -- statistics --------------------------------------------------------
+    
+    def _maybe_flush(self, connection):
+        if time.monotonic() - self._last_flush >= STATS_INTERVAL:
+            self._flush_stats(connection)
+    
+    def _flush_stats(self, connection):
+        self._last_flush = time.monotonic()
+        deltas = [(name, self.counts[name] - self._flushed[name]) for name in _COUNTERS]
+        deltas = [(name, delta) for name, delta in deltas if delta]
+        if not deltas:
+            return
+        connection.executemany(
+            "INSERT INTO stats (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", deltas)
+        self._flushed = dict(self.counts)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Entry count and size, this process's counters, and the totals of
+        every process that used the database (including this one).
+        """
+        with self._lock:
+            connection = self._connect()
+            self._flush_stats(connection)
+            entries, size = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM prompts").fetchone()
+            totals = dict.fromkeys(_COUNTERS, 0)
+            totals.update(connection.execute("SELECT name, value FROM stats"))
+        lookups = totals["hits"] + totals["misses"]
+        return {
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "process": dict(self.counts),
+            "total": totals,
+            "hit_rate": totals["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def _enabled_path() -> Optional[str]:
+    value = os.environ.get("FLUX2_PROMPT_CACHE", "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() not in ("1", "true", "yes", "on"):
+        return value
+    if folder_paths is not None:
+        return os.path.join(folder_paths.get_user_directory(), "flux2_prompt_cache.db")
+    return os.path.join(os.path.expanduser("~"), ".cache", "flux2-prompt-builder",
+                        "flux2_prompt_cache.db")
+
+
+_shared: Optional[PromptCache] = None
+_configured = False
+
+
+def prompt_cache() -> Optional[PromptCache]:
+    """The cache configured by FLUX2_PROMPT_CACHE, or None when it is disabled"""
+    global _shared, _configured
+    if not _configured:
+        path = _enabled_path()
+        _shared = None
+        if path is not None:
+            _shared = PromptCache(
+                path,
+                max_bytes=int(float(os.environ.get("FLUX2_PROMPT_CACHE_MAX_MB", DEFAULT_MAX_MB)) * (1 << 20)),
+                max_age=float(os.environ.get("FLUX2_PROMPT_CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)) * 86400.0)
+            import atexit
+            atexit.register(_shared.close)
+        _configured = True
+    return _shared
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--path", help="Cache database (default: from FLUX2_PROMPT_CACHE)")
+    parser.add_argument("--stats", action="store_true", help="Print entry count, size and hit rate")
+    parser.add_argument("--evict", action="store_true", help="Apply the size and age limits now")
+    parser.add_argument("--clear", action="store_true", help="Delete every entry and counter")
+    args = parser.parse_args(argv)
+    
+    if args.path:
+        cache = PromptCache(args.path)
+    else:
+        cache = prompt_cache()
+        if cache is None:
+            parser.error("set FLUX2_PROMPT_CACHE or pass --path")
+    if args.clear:
+        cache.clear()
+    if args.evict:
+        cache.evict()
+    if args.stats or not (args.clear or args.evict):
+        print(json.dumps(cache.stats(), indent=2))
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
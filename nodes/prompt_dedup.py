@@ -0,0 +1,344 @@
+"""
+FLUX2_PromptDedup - Drop duplicate and near-duplicate prompts from batches
+"""
+
+import hashlib
+import json
+import random
+import re
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # ComfyUI always ships numpy; without it signatures are built in Python
+    np = None
+
+from .base import FLUX2BaseNode, FLUX2Types
+from .prompt_exporter import iter_records
+from .records import to_plain
+
+_WORD = re.compile(r"\w+")
+_MASK64 = (1 << 64) - 1
+
+
+def _normalize(value: Any) -> Any:
+    value = to_plain(value)
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, Mapping):
+        cleaned = {}
+        for key, item in value.items():
+            item = _normalize(item)
+            if item is None or item == "" or item == [] or item == {}:
+                continue
+            cleaned[key] = item
+        return cleaned
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def canonical_prompt(prompt: Any) -> Any:
+    """
+    Normalized copy of a prompt (dict or JSON text): runs of whitespace in
+    strings collapse to one space, and empty strings, lists and dicts are
+    dropped. Key order is left to the encoder.
+    """
+    if isinstance(prompt, str):
+        try:
+            prompt = json.loads(prompt)
+        except ValueError:
+            pass
+    return _normalize(prompt)
+
+
+def _encode(canonical: Any) -> str:
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"),
+                      ensure_ascii=False, default=str)
+
+
+def canonical_text(prompt: Any) -> str:
+    """Canonical compact JSON of a prompt (sorted keys, normalized strings)"""
+    return _encode(canonical_prompt(prompt))
+
+
+def prompt_words(prompt: Any) -> str:
+    """
+    The text content of a canonical prompt (string and number values in
+    key order), without the JSON keys shared by every prompt.
+    """
+    if isinstance(prompt, Mapping):
+        return " ".join(prompt_words(prompt[key]) for key in sorted(prompt))
+    if isinstance(prompt, list):
+        return " ".join(prompt_words(item) for item in prompt)
+    return str(prompt)
+
+
+def _hash32(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=4).digest(), "little")
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1 / bands) ** (1 / rows) is closest to the similarity threshold.
+    """
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)
+               if num_perm % bands == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles.
+    
+    Each shingle is hashed once to 32 bits. Permutation i is the seeded
+    multiply-add-shift hash h -> ((a_i * h + b_i) mod 2^64) >> 32, a
+    2-independent family for 32-bit keys, with a_i and b_i drawn
+    independently per permutation; signature entry i is its minimum over
+    the shingle hashes. With NumPy a signature is one vectorized pass in
+    wrapping 64-bit arithmetic; the Python fallback gives the same values.
+    """
+    
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._params = [(rng.getrandbits(64), rng.getrandbits(64)) for _ in range(num_perm)]
+        if np is not None:
+            self._a = np.array([a for a, _ in self._params], dtype=np.uint64)[:, None]
+            self._b = np.array([b for _, b in self._params], dtype=np.uint64)[:, None]
+    
+    def shingles(self, text: str) -> set:
+        """Hashes of the lowercase word k-grams of text"""
+        words = _WORD.findall(text.lower())
+        size = self.shingle_size
+        if len(words) <= size:
+            return {_hash32(" ".join(words).encode("utf-8"))}
+        return {_hash32(" ".join(words[i:i + size]).encode("utf-8"))
+                for i in range(len(words) - size + 1)}
+    
+    def signature(self, text: str) -> array:
+        hashes = self.shingles(text)
+        if np is not None:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            return array("Q", ((self._a * values + self._b) >> np.uint64(32)).min(axis=1).tobytes())
+        return array("Q", [min(((a * h + b) & _MASK64) >> 32 for h in hashes)
+                           for a, b in self._params])
+    
+    @staticmethod
+    def similarity(first: array, second: array) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+class PromptDeduplicator:
+    """
+    Streaming duplicate filter for prompts.
+    
+    Exact duplicates are found by a 128-bit hash of the canonical prompt
+    text, so prompts differing only in whitespace, key order or empty
+    fields collapse together. With near_duplicates=True, MinHash
+    signatures are bucketed by LSH bands and a candidate sharing a bucket
+    is a duplicate when its estimated similarity reaches threshold.
+    
+    Only hashes and signatures are kept, never the prompts. With window > 0
+    just the most recent window unique prompts are remembered, bounding
+    memory for arbitrarily long streams.
+    """
+    
+    def __init__(self, near_duplicates: bool = False, threshold: float = 0.85,
+                 num_perm: int = 64, shingle_size: int = 3, window: int = 0):
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.window = window
+        self.seen = 0
+        self.exact_duplicates = 0
+        self.near_duplicates_found = 0
+        
+        # Insertion-ordered so the oldest entries are evicted first
+        self._digests: Dict[bytes, Optional[int]] = {}
+        self._signatures: Dict[int, array] = {}
+        self._next_id = 0
+        
+        if near_duplicates:
+            self._hasher = MinHasher(num_perm, shingle_size)
+            self.bands, self.rows = lsh_bands(num_perm, threshold)
+            self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+    
+    @property
+    def unique(self) -> int:
+        return self.seen - self.exact_duplicates - self.near_duplicates_found
+    
+    def _band_keys(self, signature: array) -> Iterator[Tuple[int, int]]:
+        rows = self.rows
+        for band in range(self.bands):
+            yield band, hash(tuple(signature[band * rows:(band + 1) * rows]))
+    
+    def check(self, prompt: Any) -> Optional[str]:
+        """
+        Classify one prompt and remember it when it is new.
+        
+        Returns:
+            "exact" or "near" for duplicates, None for a new prompt
+        """
+        self.seen += 1
+        prompt = canonical_prompt(prompt)
+        digest = hashlib.blake2b(_encode(prompt).encode("utf-8"), digest_size=16).digest()
+        if digest in self._digests:
+            self.exact_duplicates += 1
+            return "exact"
+        
+        prompt_id = None
+        if self.near_duplicates:
+            signature = self._hasher.signature(prompt_words(prompt))
+            keys = list(self._band_keys(signature))
+            checked = set()
+            for band, key in keys:
+                for candidate in self._buckets[band].get(key, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    if MinHasher.similarity(signature, self._signatures[candidate]) >= self.threshold:
+                        self.near_duplicates_found += 1
+                        return "near"
+            prompt_id = self._next_id
+            self._next_id += 1
+            self._signatures[prompt_id] = signature
+            for band, key in keys:
+                self._buckets[band].setdefault(key, []).append(prompt_id)
+        
+        self._digests[digest] = prompt_id
+        if self.window and len(self._digests) > self.window:
+            self._evict()
+        return None
+    
+    def _evict(self):
+        """Forget the oldest remembered prompt"""
+        digest = next(iter(self._digests))
+        prompt_id = self._digests.pop(digest)
+        if prompt_id is None:
+            return
+        signature = self._signatures.pop(prompt_id)
+        for band, key in self._band_keys(signature):
+            bucket = self._buckets[band][key]
+            bucket.remove(prompt_id)
+            if not bucket:
+                del self._buckets[band][key]
+    
+    def filter(self, prompts: Iterable[Any]) -> Iterator[Any]:
+        """Yield only the prompts that are not duplicates, consuming lazily"""
+        for prompt in prompts:
+            if self.check(prompt) is None:
+                yield prompt
+    
+    def summary(self) -> str:
+        lines = [f"Prompts: {self.seen}, unique: {self.unique}",
+                 f"Exact duplicates removed: {self.exact_duplicates}"]
+        if self.near_duplicates:
+            lines.append(f"Near duplicates removed: {self.near_duplicates_found} "
+                         f"(threshold {self.threshold:.2f}, {self.bands} bands x {self.rows} rows)")
+        return "\n".join(lines)
+
+
+class FLUX2_PromptDedup(FLUX2BaseNode):
+    """
+    Remove duplicate prompts from a batch before generation.
+    Accepts single prompts or whole lists from batch nodes.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "json_object": (FLUX2Types.JSON_OBJECT,),
+            },
+            "optional": {
+                "near_duplicates": ("BOOLEAN", {
+                    "default": False
+                }),
+                "threshold": ("FLOAT", {
+                    "default": 0.85,
+                    "min": 0.5,
+                    "max": 1.0,
+                    "step": 0.01
+                }),
+                "num_perm": ("INT", {
+                    "default": 64,
+                    "min": 16,
+                    "max": 256,
+                    "step": 16
+                }),
+                "window": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 10_000_000,
+                    "step": 1000
+                }),
+                "pretty_print": ("BOOLEAN", {
+                    "default": True
+                }),
+            }
+        }
+    
+    # Receive list outputs (e.g. from FLUX2_PromptSweep) in a single call
+    INPUT_IS_LIST = True
+    
+    RETURN_TYPES = ("STRING", FLUX2Types.JSON_OBJECT, "INT", "STRING")
+    RETURN_NAMES = ("json_strings", "json_objects", "unique_count", "report")
+    OUTPUT_IS_LIST = (True, True, False, False)
+    FUNCTION = "dedupe_prompts"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Core"
+    
+    def dedupe_prompts(self,
+                       json_object,
+                       near_duplicates=(False,),
+                       threshold=(0.85,),
+                       num_perm=(64,),
+                       window=(0,),
+                       pretty_print=(True,)):
+        """
+        Drop duplicate prompts, keeping the first occurrence of each.
+        
+        Args:
+            json_object: List of prompt dicts (INPUT_IS_LIST)
+            near_duplicates: Also drop prompts similar to an earlier one
+            threshold: Estimated Jaccard similarity counted as a near duplicate
+            num_perm: MinHash signature length (higher = more accurate)
+            window: Remember only this many recent unique prompts (0 = all)
+            pretty_print: Format the json_strings output with indentation
+        
+        Returns:
+            Tuple of (json_strings, json_objects, unique_count, report)
+        """
+        dedup = PromptDeduplicator(near_duplicates=near_duplicates[0],
+                                   threshold=threshold[0],
+                                   num_perm=num_perm[0],
+                                   window=window[0])
+        kept = [to_plain(prompt) for prompt in dedup.filter(iter_records(json_object))]
+        json_strings = [self.format_json_output(prompt, pretty_print[0]) for prompt in kept]
+        return (json_strings, kept, len(kept), dedup.summary())
+
+
+# For display in UI
+FLUX2_PromptDedup.DESCRIPTION = """
+Remove duplicate prompts from a batch (e.g. Prompt Sweep output) so no
+GPU time is spent generating the same image twice.
+
+- Exact: prompts that differ only in whitespace, key order or empty
+  fields count as the same prompt
+- near_duplicates: also drop prompts whose wording overlaps an earlier
+  prompt by at least threshold (MinHash + LSH estimate of word-trigram
+  Jaccard similarity)
+
+The first occurrence is kept and order is preserved. The report output
+lists how many prompts were removed.
+
+Kept prompts are returned together, so the whole batch is held in
+memory. One hash per unique prompt (plus a signature for
+near_duplicates) is also remembered; window > 0 keeps only the most
+recent window prompts, missing duplicates further apart.
+"""
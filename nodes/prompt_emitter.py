@@ -0,0 +1,486 @@
+"""
+Single-pass JSON emitter specialised for the FLUX2 prompt schema
+"""
+
+import copy
+import marshal
+import threading
+from json.encoder import encode_basestring
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import serialization
+from .base import FLUX2BaseNode
+from .records import Record, to_plain
+
+# Top-level fields in assembly order, and the ones holding plain text
+PROMPT_FIELDS = ("scene", "subjects", "style", "color_palette", "lighting",
+                 "mood", "background", "composition", "camera")
+TEXT_FIELDS = frozenset(("scene", "style", "lighting", "mood", "background", "composition"))
+
+INDENT = "  "
+
+
+def build_prompt_dict(fields) -> Dict:
+    """Collect non-empty fields in schema order, stripping text fields"""
+    prompt = {}
+    for name in PROMPT_FIELDS:
+        value = fields.get(name)
+        if value:
+            prompt[name] = value.strip() if name in TEXT_FIELDS else to_plain(value)
+    return prompt
+
+
+class _Unsupported(Exception):
+    """Raised for values the emitter does not encode itself"""
+
+
+def _encode_scalar(value) -> str:
+    """Encode a non-container value exactly like json.dumps"""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        if value == float("inf"):
+            return "Infinity"
+        if value == -float("inf"):
+            return "-Infinity"
+        return float.__repr__(value)
+    raise _Unsupported(type(value).__name__)
+
+
+class PromptEmitter:
+    """
+    Emit the assembled prompt JSON in one traversal.
+    
+    Produces the same text and dict as
+    format_json_output(remove_empty_fields(prompt), pretty) with the
+    standard library backend, but drops empty fields while encoding
+    instead of building a cleaned copy and walking it a second time.
+    Separators and key prefixes are precomputed per nesting depth, and
+    fragments are appended to a single output list that is joined once.
+    Subject and camera records contribute their cached JSON fragments.
+    Inputs the emitter does not understand (non-string keys, custom
+    objects) fall back to the generic path.
+    """
+    
+    def __init__(self, pretty: bool = True):
+        self.pretty = pretty
+        self._keys: Dict[str, str] = {}
+        self._layouts: List[Tuple[str, str, str, str]] = []
+        # Top-level fields use the same layout as any depth-1 member
+        self._layout(1)
+    
+    def _layout(self, depth):
+        """(dict opener, list opener, item separator, closer suffix) for members at depth"""
+        while len(self._layouts) <= depth:
+            level = len(self._layouts)
+            if self.pretty:
+                inner = "\n" + INDENT * level
+                outer = "\n" + INDENT * max(level - 1, 0)
+                self._layouts.append(("{" + inner, "[" + inner, "," + inner, outer))
+            else:
+                self._layouts.append(("{", "[", ", ", ""))
+        return self._layouts[depth]
+    
+    def _key(self, key):
+        """Encoded '"key": ' prefix, cached for the small schema vocabulary"""
+        prefix = self._keys.get(key)
+        if prefix is None:
+            if type(key) is not str:
+                raise _Unsupported("non-string key")
+            prefix = encode_basestring(key) + ": "
+            if len(self._keys) < 1024:
+                self._keys[key] = prefix
+        return prefix
+    
+    def emit(self, **fields) -> Tuple[str, Dict]:
+        """
+        Encode prompt fields given as keyword arguments.
+        
+        Returns:
+            Tuple of (json_string, cleaned prompt dict)
+        """
+        try:
+            return self._emit(fields)
+        except _Unsupported:
+            prompt = FLUX2BaseNode.remove_empty_fields(build_prompt_dict(fields))
+            return FLUX2BaseNode.format_json_output(prompt, pretty=self.pretty), prompt
+    
+    def _emit(self, fields) -> Tuple[str, Dict]:
+        out: List[str] = []
+        prompt: Dict[str, Any] = {}
+        dict_open, _, separator, closer = self._layouts[1]
+        
+        for name in PROMPT_FIELDS:
+            value = fields.get(name)
+            if not value:
+                continue
+            
+            out.append(separator if prompt else dict_open)
+            out.append(self._key(name))
+            if name in TEXT_FIELDS:
+                value = value.strip()
+                if not value:
+                    del out[-2:]
+                    continue
+                out.append(encode_basestring(value))
+            else:
+                value = self._value(value, 1, out)
+                if value is None:
+                    del out[-2:]
+                    continue
+            prompt[name] = value
+        
+        if not prompt:
+            return "{}", prompt
+        out.append(closer + "}")
+        return "".join(out), prompt
+    
+    def _value(self, value, depth, out):
+        """Clean and encode one value into out; returns None when it is dropped"""
+        kind = type(value)
+        if kind is str:
+            if not value or value.isspace():
+                return None
+            out.append(encode_basestring(value))
+            return value
+        if kind is dict:
+            return self._dict(value, depth, out)
+        if kind is list:
+            if not value:
+                return None
+            if all(type(item) is dict or isinstance(item, Record) for item in value):
+                return self._dict_list(value, depth, out)
+            # Lists of plain values are kept exactly as given
+            self._plain(value, depth, out)
+            return value
+        if value is None:
+            return None
+        if isinstance(value, Record):
+            return self._record(value, depth, out)
+        if isinstance(value, (dict, list)):
+            # Subclasses take the generic path to keep isinstance semantics
+            raise _Unsupported(kind.__name__)
+        out.append(_encode_scalar(value))
+        return value
+    
+    def _dict(self, value, depth, out):
+        mark = len(out)
+        dict_open, _, separator, closer = self._layout(depth + 1)
+        cleaned = {}
+        for key, item in value.items():
+            out.append(separator if cleaned else dict_open)
+            out.append(self._key(key))
+            item = self._value(item, depth + 1, out)
+            if item is None:
+                del out[-2:]
+                continue
+            cleaned[key] = item
+        if not cleaned:
+            del out[mark:]
+            return None
+        out.append(closer + "}")
+        return cleaned
+    
+    def _dict_list(self, value, depth, out):
+        mark = len(out)
+        _, list_open, separator, closer = self._layout(depth + 1)
+        cleaned = []
+        for item in value:
+            out.append(separator if cleaned else list_open)
+            if isinstance(item, Record):
+                item = self._record(item, depth + 1, out)
+            else:
+                item = self._dict(item, depth + 1, out)
+            if item is None:
+                del out[-1]
+                continue
+            cleaned.append(item)
+        if not cleaned:
+            del out[mark:]
+            return None
+        out.append(closer + "]")
+        return cleaned
+    
+    def _record(self, record, depth, out):
+        """Splice a record's cached fragment; returns its cleaned dict"""
+        fragment = record.json_fragment(self.pretty, depth)
+        if fragment is None:
+            return None
+        out.append(fragment)
+        return record.cleaned()
+    
+    def _plain(self, value, depth, out):
+        """Encode a value verbatim (no empty-field removal)"""
+        kind = type(value)
+        if kind is str:
+            out.append(encode_basestring(value))
+        elif kind is list or kind is tuple:
+            if not value:
+                out.append("[]")
+                return
+            _, list_open, separator, closer = self._layout(depth + 1)
+            out.append(list_open)
+            first = True
+            for item in value:
+                if not first:
+                    out.append(separator)
+                first = False
+                self._plain(item, depth + 1, out)
+            out.append(closer + "]")
+        elif kind is dict:
+            if not value:
+                out.append("{}")
+                return
+            dict_open, _, separator, closer = self._layout(depth + 1)
+            out.append(dict_open)
+            first = True
+            for key, item in value.items():
+                if not first:
+                    out.append(separator)
+                first = False
+                out.append(self._key(key))
+                self._plain(item, depth + 1, out)
+            out.append(closer + "}")
+        else:
+            out.append(_encode_scalar(value))
+
+
+# Shared emitters for the two output layouts
+PRETTY_EMITTER = PromptEmitter(pretty=True)
+COMPACT_EMITTER = PromptEmitter(pretty=False)
+
+
+def _snapshot(value):
+    """
+    Frozen form of an input, to compare the next call's input with.
+    Strings and records are immutable and kept as they are. Containers
+    are written with marshal (format 2, which has no back-references):
+    in C, and type-exact at every level, so 1 and True, 85 and 85.0 or
+    reordered keys give different bytes although they compare equal.
+    None for values marshal cannot write; those are re-encoded each call.
+    """
+    if type(value) is str or isinstance(value, Record):
+        return value
+    try:
+        return marshal.dumps(value, 2)
+    except ValueError:
+        return None
+
+
+def _unchanged(snapshot, value) -> bool:
+    """True when value encodes exactly like the input snapshot was taken of"""
+    if snapshot is value:
+        return True
+    kind = type(snapshot)
+    if kind is str:
+        return type(value) is str and snapshot == value
+    if kind is not bytes or isinstance(value, Record):
+        # A different record re-splices its own cached fragment cheaply
+        return False
+    try:
+        return snapshot == marshal.dumps(value, 2)
+    except ValueError:
+        return False
+
+
+def _freeze(cleaned):
+    """Cleaned value as kept between calls: strings as they are, else marshalled"""
+    if type(cleaned) is str:
+        return cleaned
+    try:
+        return marshal.dumps(cleaned, 2)
+    except ValueError:
+        return cleaned
+
+
+def _thaw(frozen):
+    """A new copy of a frozen cleaned value, so callers cannot alter the cache"""
+    kind = type(frozen)
+    if kind is bytes:
+        return marshal.loads(frozen)
+    if kind is str:
+        return frozen
+    return copy.deepcopy(frozen)
+
+
+class IncrementalEmitter:
+    """
+    PromptEmitter that reuses the previous call's encoding of every field
+    that did not change.
+    
+    The encoded fragment and cleaned value of each top-level field, and of
+    each subject by position, are kept from the last call. On the next
+    call unchanged fields are spliced in as they are and only the changed
+    ones are encoded, so editing one text field or one subject costs the
+    same however large the subject array is. Strings and records are
+    compared by identity first; other values are compared with a copy
+    taken when they were encoded, so in-place edits are noticed.
+    
+    Output is identical to PromptEmitter.emit; the returned dict is a
+    fresh copy each call. Keep one instance per assembler node (per
+    layout); it holds one entry per field and subject. Calls are
+    serialised by a lock, so an instance may be shared between threads,
+    though concurrent callers with different inputs evict each other's
+    fragments.
+    """
+    
+    def __init__(self, pretty: bool = True):
+        self.pretty = pretty
+        self.emitter = PromptEmitter(pretty)
+        self.hits = 0
+        self.misses = 0
+        # Field name -> (snapshot, fragment or None, frozen cleaned value)
+        self._fields: Dict[str, Tuple[Any, Optional[str], Any]] = {}
+        # Per subject (snapshot, fragment or None, cleaned value), and the
+        # whole array's snapshot, fragment and frozen cleaned list
+        self._subjects: List[Tuple[Any, Optional[str], Any]] = []
+        self._subjects_snapshot = None
+        self._subjects_joined: Tuple[Optional[str], Any] = (None, None)
+        self._lock = threading.Lock()
+    
+    def reset(self):
+        """Forget all cached fragments"""
+        with self._lock:
+            self._reset()
+    
+    def _reset(self):
+        self._fields.clear()
+        self._subjects = []
+        self._subjects_snapshot = None
+        self._subjects_joined = (None, None)
+    
+    def emit(self, **fields) -> Tuple[str, Dict]:
+        """Encode prompt fields like PromptEmitter.emit, reusing unchanged fragments"""
+        with self._lock:
+            try:
+                return self._emit(fields)
+            except _Unsupported:
+                self._reset()
+                return self.emitter.emit(**fields)
+    
+    def _emit(self, fields) -> Tuple[str, Dict]:
+        emitter = self.emitter
+        out: List[str] = []
+        prompt: Dict[str, Any] = {}
+        dict_open, _, separator, closer = emitter._layouts[1]
+        
+        for name in PROMPT_FIELDS:
+            value = fields.get(name)
+            if not value:
+                continue
+            if (name == "subjects" and type(value) is list
+                    and all(type(item) is dict or isinstance(item, Record) for item in value)):
+                fragment, frozen = self._subject_list(value)
+            else:
+                fragment, frozen = self._field(name, value)
+            if fragment is None:
+                continue
+            out.append(separator if prompt else dict_open)
+            out.append(emitter._key(name))
+            out.append(fragment)
+            prompt[name] = _thaw(frozen)
+        
+        if not prompt:
+            return "{}", prompt
+        out.append(closer + "}")
+        return "".join(out), prompt
+    
+    def _field(self, name, value):
+        entry = self._fields.get(name)
+        if entry is not None and _unchanged(entry[0], value):
+            self.hits += 1
+            return entry[1], entry[2]
+        
+        self.misses += 1
+        if name in TEXT_FIELDS:
+            cleaned = value.strip()
+            fragment = encode_basestring(cleaned) if cleaned else None
+        else:
+            parts: List[str] = []
+            cleaned = self.emitter._value(value, 1, parts)
+            fragment = "".join(parts) if cleaned is not None else None
+        frozen = _freeze(cleaned)
+        self._fields[name] = (_snapshot(value), fragment, frozen)
+        return fragment, frozen
+    
+    def _subject_list(self, subjects):
+        """Subjects array fragment spliced from per-subject fragments"""
+        if _unchanged(self._subjects_snapshot, subjects):
+            # Plain dict subjects are compared as one array first
+            self.hits += len(subjects)
+            return self._subjects_joined
+        
+        emitter = self.emitter
+        cached = self._subjects
+        entries = []
+        fragments = []
+        cleaned_items = []
+        changed = len(subjects) != len(cached)
+        
+        for index, subject in enumerate(subjects):
+            entry = cached[index] if index < len(cached) else None
+            if entry is not None and _unchanged(entry[0], subject):
+                self.hits += 1
+            else:
+                self.misses += 1
+                changed = True
+                parts: List[str] = []
+                if isinstance(subject, Record):
+                    cleaned = emitter._record(subject, 2, parts)
+                else:
+                    cleaned = emitter._dict(subject, 2, parts)
+                entry = (_snapshot(subject), "".join(parts) if cleaned is not None else None, cleaned)
+            entries.append(entry)
+            if entry[1] is not None:
+                fragments.append(entry[1])
+                cleaned_items.append(entry[2])
+        
+        self._subjects = entries
+        self._subjects_snapshot = _snapshot(subjects)
+        if changed:
+            if fragments:
+                _, list_open, separator, closer = emitter._layout(2)
+                self._subjects_joined = (list_open + separator.join(fragments) + closer + "]",
+                                         _freeze(cleaned_items))
+            else:
+                self._subjects_joined = (None, None)
+        return self._subjects_joined
+
+
+def _records_only(fields) -> bool:
+    """True when subjects and camera are all pre-encoded records"""
+    subjects = fields.get("subjects")
+    camera = fields.get("camera")
+    if not subjects and not camera:
+        return False
+    if camera and not isinstance(camera, Record):
+        return False
+    return not subjects or (type(subjects) is list
+                            and all(isinstance(subject, Record) for subject in subjects))
+
+
+def emit_prompt(pretty: bool = True, **fields) -> Tuple[str, Dict]:
+    """
+    Assemble prompt fields with empty-field removal.
+    
+    The single-pass emitter replaces the pure-Python stdlib encoder. When
+    a native backend such as orjson is active, cleaning in Python and
+    encoding in C is faster than encoding in Python, so that path is kept
+    unless the structured fields are records with cached fragments.
+    """
+    if (serialization.get_backend().name == serialization.StdlibBackend.name
+            or _records_only(fields)):
+        emitter = PRETTY_EMITTER if pretty else COMPACT_EMITTER
+        return emitter.emit(**fields)
+    prompt = FLUX2BaseNode.remove_empty_fields(build_prompt_dict(fields))
+    return FLUX2BaseNode.format_json_output(prompt, pretty=pretty), prompt
@@ -0,0 +1,250 @@
+"""
+FLUX2_PromptExporter - Stream assembled prompts to disk as JSON Lines
+"""
+
+import gzip
+import json
+import os
+
+from .base import FLUX2BaseNode, FLUX2Types
+
+try:
+    import folder_paths
+except ImportError:
+    # Running outside ComfyUI (tests, scripts)
+    folder_paths = None
+
+
+class JSONLWriter:
+    """
+    Buffered JSON Lines writer with bounded memory.
+    
+    Records are encoded one per line into an in-memory chunk. A chunk is
+    flushed with a single append-mode write once it reaches chunk_records
+    records or chunk_bytes bytes, so records are only ever written whole
+    chunks at a time; a crash or full disk in the middle of a flush can
+    still leave a truncated last line. With compress=True every chunk is
+    written as a self-contained gzip member; concatenated members form a
+    valid .gz file.
+    """
+    
+    def __init__(self, path, compress=False, append=True,
+                 chunk_records=1000, chunk_bytes=1 << 20, fsync=False):
+        self.path = path
+        self.compress = compress
+        self.chunk_records = max(1, chunk_records)
+        self.chunk_bytes = max(1, chunk_bytes)
+        self.fsync = fsync
+        self.records_written = 0
+        
+        self._lines = []
+        self._buffered_bytes = 0
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        if not append:
+            flags |= os.O_TRUNC
+        self._fd = os.open(path, flags, 0o644)
+    
+    @staticmethod
+    def encode_record(record) -> bytes:
+        """Encode one record as a compact JSON line"""
+        if isinstance(record, str):
+            # Already serialized (possibly pretty-printed) JSON text
+            record = json.loads(record)
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        return line.encode("utf-8") + b"\n"
+    
+    def write(self, record):
+        """Buffer one record, flushing the chunk when it is full"""
+        line = self.encode_record(record)
+        self._lines.append(line)
+        self._buffered_bytes += len(line)
+        if len(self._lines) >= self.chunk_records or self._buffered_bytes >= self.chunk_bytes:
+            self.flush()
+    
+    def write_encoded(self, lines):
+        """Buffer already encoded lines (bytes ending in a newline)"""
+        for line in lines:
+            self._lines.append(line)
+            self._buffered_bytes += len(line)
+            if len(self._lines) >= self.chunk_records or self._buffered_bytes >= self.chunk_bytes:
+                self.flush()
+    
+    def write_many(self, records) -> int:
+        """Write every record from an iterable, consuming it lazily"""
+        count = 0
+        for record in records:
+            self.write(record)
+            count += 1
+        return count
+    
+    def flush(self):
+        """Append the buffered chunk to the file in one write"""
+        if not self._lines:
+            return
+        
+        data = b"".join(self._lines)
+        if self.compress:
+            data = gzip.compress(data)
+        
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+        if self.fsync:
+            os.fsync(self._fd)
+        
+        self.records_written += len(self._lines)
+        self._lines = []
+        self._buffered_bytes = 0
+    
+    def close(self):
+        """Flush remaining records and close the file"""
+        if self._fd is None:
+            return
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def iter_records(values):
+    """Flatten json_object inputs (single dicts or lists of dicts)"""
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                if item is not None:
+                    yield item
+        else:
+            yield value
+
+
+class FLUX2_PromptExporter(FLUX2BaseNode):
+    """
+    Append assembled prompts to a JSON Lines file.
+    Accepts single prompts or whole lists from batch nodes.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "json_object": (FLUX2Types.JSON_OBJECT,),
+                "filename": ("STRING", {
+                    "multiline": False,
+                    "default": "flux2_prompts.jsonl"
+                }),
+            },
+            "optional": {
+                "compress": ("BOOLEAN", {
+                    "default": False
+                }),
+                "append": ("BOOLEAN", {
+                    "default": True
+                }),
+                "chunk_records": ("INT", {
+                    "default": 1000,
+                    "min": 1,
+                    "max": 1000000,
+                    "step": 1
+                }),
+            }
+        }
+    
+    # Receive list outputs (e.g. from FLUX2_PromptSweep) in a single call
+    INPUT_IS_LIST = True
+    
+    RETURN_TYPES = ("STRING", "INT")
+    RETURN_NAMES = ("file_path", "records_written")
+    FUNCTION = "export_prompts"
+    OUTPUT_NODE = True
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Output"
+    
+    @staticmethod
+    def resolve_path(filename, compress=False):
+        """
+        Resolve filename inside the ComfyUI output directory (the working
+        directory outside ComfyUI).
+        
+        Raises:
+            ValueError: If the path, absolute or through "..", leads
+                outside the output directory
+        """
+        filename = filename.strip() or "flux2_prompts.jsonl"
+        if compress and not filename.endswith(".gz"):
+            filename = f"{filename}.gz"
+        base = folder_paths.get_output_directory() if folder_paths is not None else os.getcwd()
+        path = os.path.abspath(os.path.join(base, filename))
+        # Compare resolved paths, so symlinks cannot lead out either
+        real_base = os.path.realpath(base)
+        if os.path.commonpath([real_base, os.path.realpath(path)]) != real_base:
+            raise ValueError(f"Export path '{filename}' is outside the output directory {base}")
+        return path
+    
+    def export_prompts(self,
+                       json_object,
+                       filename=("flux2_prompts.jsonl",),
+                       compress=(False,),
+                       append=(True,),
+                       chunk_records=(1000,)):
+        """
+        Write prompts to a JSON Lines file.
+        
+        Args:
+            json_object: List of prompt dicts (INPUT_IS_LIST)
+            filename: Output file inside the ComfyUI output directory
+            compress: Write gzip-compressed chunks (adds .gz)
+            append: Append to an existing file instead of replacing it
+            chunk_records: Records buffered before each flush
+        
+        Returns:
+            UI text plus result tuple of (file_path, records_written)
+        """
+        
+        path = self.resolve_path(filename[0], compress=compress[0])
+        
+        with JSONLWriter(path,
+                         compress=compress[0],
+                         append=append[0],
+                         chunk_records=chunk_records[0]) as writer:
+            writer.write_many(iter_records(json_object))
+        
+        return {
+            "ui": {"text": [f"Wrote {writer.records_written} prompts to {path}"]},
+            "result": (path, writer.records_written),
+        }
+
+
+# For display in UI
+FLUX2_PromptExporter.DESCRIPTION = """
+Append assembled prompts to a JSON Lines file (one prompt per line).
+
+Connect json_object from the Prompt Assembler or json_objects from the
+Prompt Sweep. Prompts are written in chunks, so memory stays bounded
+no matter how many prompts are exported.
+
+Options:
+- filename: Path inside the ComfyUI output directory; paths leading
+  outside it are rejected
+- compress: gzip each chunk (output gets a .gz suffix)
+- append: Add to an existing file instead of replacing it
+- chunk_records: Prompts buffered per disk write
+
+Outputs:
+- file_path: Absolute path of the written file
+- records_written: Number of prompts written
+"""
@@ -0,0 +1,522 @@
+"""
+FLUX2_PromptValidator - Check prompts against the FLUX.2 JSON schema
+"""
+
+import json
+import re
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .base import FLUX2BaseNode, FLUX2Types
+from .prompt_exporter import iter_records
+from .records import to_plain
+
+_STRING = {"type": "string"}
+_STRINGS = {"type": "array", "items": _STRING}
+_POSITIVE = {"type": "number", "exclusiveMinimum": 0}
+
+_SUBJECT = {
+    "type": "object",
+    "properties": {
+        "description": _STRING,
+        "position": _STRING,
+        "action": _STRING,
+        "pose": _STRING,
+        "color_palette": _STRINGS,
+    },
+    "additionalProperties": False,
+}
+
+# The prompt shape documented in course/02-json-schema-anatomy.md, as a
+# JSON Schema (draft 7) so generic validators can check the same thing.
+# Every field is optional, as in the course; unknown keys are rejected
+# because they are almost always misspelled field names.
+FLUX2_SCHEMA: Dict[str, Any] = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "FLUX.2 structured prompt",
+    "type": "object",
+    "properties": {
+        "scene": _STRING,
+        "subjects": {"type": "array", "items": _SUBJECT},
+        "style": _STRING,
+        "color_palette": _STRINGS,
+        "lighting": _STRING,
+        "mood": _STRING,
+        "background": _STRING,
+        "composition": _STRING,
+        "camera": {
+            "type": "object",
+            "properties": {
+                "angle": _STRING,
+                "distance": _STRING,
+                "lens": _STRING,
+                "lens-mm": _POSITIVE,
+                "f-number": _STRING,
+                "ISO": _POSITIVE,
+                "depth_of_field": _STRING,
+                "focus": _STRING,
+            },
+            "additionalProperties": False,
+        },
+    },
+    "additionalProperties": False,
+}
+
+# FLUX2_SCHEMA plus a required description for every subject, for
+# pipelines that treat a subject without one as a mistake
+FLUX2_STRICT_SCHEMA: Dict[str, Any] = dict(FLUX2_SCHEMA, properties=dict(
+    FLUX2_SCHEMA["properties"],
+    subjects={"type": "array", "items": dict(_SUBJECT, required=["description"])},
+))
+
+# Keywords that only document a schema
+_ANNOTATIONS = frozenset(("$schema", "$id", "title", "description", "default", "examples", "$comment"))
+_KEYWORDS = frozenset(("type", "properties", "required", "additionalProperties", "items", "enum",
+                       "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+                       "minLength", "maxLength", "minItems", "maxItems", "pattern"))
+
+# JSON type name -> exact Python types (bool is not a number, as in JSON)
+_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "null": (type(None),),
+    "array": (list, tuple),
+    "object": (dict,),
+}
+
+_INDEX = re.compile(r"\[\d+\]")
+
+Check = Callable[[Any], bool]
+Collect = Callable[[Any, str, List[str]], None]
+
+
+class SchemaError(ValueError):
+    """Raised when a schema uses keywords the compiler does not support"""
+
+
+class PromptValidationError(ValueError):
+    """Raised by SchemaValidator.validate with every problem found"""
+    
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _type_name(value) -> str:
+    if isinstance(value, Mapping):
+        return "object"
+    for name, types in _TYPES.items():
+        if type(value) in types:
+            return name
+    return type(value).__name__
+
+
+def _join(path: str, key: str) -> str:
+    return f"{path}.{key}" if path else key
+
+
+class _Compiler:
+    """
+    Turn one schema node into a (check, collect) pair of closures.
+    
+    check(value) answers valid/invalid with no allocation and stops at the
+    first problem; collect(value, path, errors) walks the whole value and
+    appends a message per problem. Only the keywords a schema node uses
+    become code, so a string field compiles to a single type test.
+    """
+    
+    def compile(self, schema: Dict[str, Any], where: str = "#") -> Tuple[Check, Collect]:
+        unknown = set(schema) - _KEYWORDS - _ANNOTATIONS
+        if unknown:
+            raise SchemaError(f"Unsupported schema keyword(s) at {where}: {', '.join(sorted(unknown))}")
+        
+        kind = schema.get("type")
+        if isinstance(kind, list):
+            types = tuple(t for name in kind for t in self._types(name, where))
+        elif kind is not None:
+            types = self._types(kind, where)
+        else:
+            types = None
+        
+        # Value constraints, each a (test, message) pair
+        tests: List[Tuple[Check, str]] = []
+        if "enum" in schema:
+            options = list(schema["enum"])
+            tests.append((lambda v: v in options, f"must be one of {options}"))
+        for keyword, message, compare in (
+                ("minimum", "must be >= {}", lambda v, bound: v >= bound),
+                ("maximum", "must be <= {}", lambda v, bound: v <= bound),
+                ("exclusiveMinimum", "must be > {}", lambda v, bound: v > bound),
+                ("exclusiveMaximum", "must be < {}", lambda v, bound: v < bound)):
+            if keyword in schema:
+                tests.append((self._numeric(compare, schema[keyword]), message.format(schema[keyword])))
+        for keyword, message, compare, sized in (
+                ("minLength", "must be at least {} characters", lambda n, bound: n >= bound, str),
+                ("maxLength", "must be at most {} characters", lambda n, bound: n <= bound, str),
+                ("minItems", "must have at least {} items", lambda n, bound: n >= bound, (list, tuple)),
+                ("maxItems", "must have at most {} items", lambda n, bound: n <= bound, (list, tuple))):
+            if keyword in schema:
+                tests.append((self._sized(compare, schema[keyword], sized), message.format(schema[keyword])))
+        if "pattern" in schema:
+            search = re.compile(schema["pattern"]).search
+            tests.append((lambda v: not isinstance(v, str) or search(v) is not None,
+                          f"must match {schema['pattern']!r}"))
+        
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            structure = self._object(schema, where)
+        elif "items" in schema:
+            structure = self._array(schema, where)
+        else:
+            structure = None
+        
+        return self._combine(types, kind, tests, structure)
+    
+    @staticmethod
+    def _types(name, where):
+        if name not in _TYPES:
+            raise SchemaError(f"Unknown type {name!r} at {where}")
+        return _TYPES[name]
+    
+    @staticmethod
+    def _numeric(compare, bound) -> Check:
+        return lambda v: type(v) not in (int, float) or compare(v, bound)
+    
+    @staticmethod
+    def _sized(compare, bound, sized) -> Check:
+        return lambda v: not isinstance(v, sized) or compare(len(v), bound)
+    
+    def _object(self, schema, where) -> Tuple[Check, Collect]:
+        properties = {name: self.compile(sub, f"{where}/properties/{name}")
+                      for name, sub in schema.get("properties", {}).items()}
+        checks = {name: pair[0] for name, pair in properties.items()}
+        required = tuple(schema.get("required", ()))
+        additional = schema.get("additionalProperties", True)
+        if isinstance(additional, dict):
+            extra_check, extra_collect = self.compile(additional, f"{where}/additionalProperties")
+        else:
+            extra_check = extra_collect = None
+        
+        def check(value):
+            if not isinstance(value, Mapping):
+                return True
+            get = checks.get
+            for key, item in value.items():
+                test = get(key)
+                if test is None:
+                    if additional is False:
+                        return False
+                    if extra_check is not None and not extra_check(item):
+                        return False
+                elif not test(item):
+                    return False
+            for name in required:
+                if name not in value:
+                    return False
+            return True
+        
+        def collect(value, path, errors):
+            if not isinstance(value, Mapping):
+                return
+            for key, item in value.items():
+                pair = properties.get(key)
+                if pair is not None:
+                    pair[1](item, _join(path, str(key)), errors)
+                elif additional is False:
+                    errors.append(f"{_join(path, str(key))}: unknown field")
+                elif extra_collect is not None:
+                    extra_collect(item, _join(path, str(key)), errors)
+            for name in required:
+                if name not in value:
+                    errors.append(f"{_join(path, name)}: required field is missing")
+        
+        return check, collect
+    
+    def _array(self, schema, where) -> Tuple[Check, Collect]:
+        item_check, item_collect = self.compile(schema["items"], f"{where}/items")
+        
+        def check(value):
+            if type(value) is not list and type(value) is not tuple:
+                return True
+            for item in value:
+                if not item_check(item):
+                    return False
+            return True
+        
+        def collect(value, path, errors):
+            if type(value) is not list and type(value) is not tuple:
+                return
+            for index, item in enumerate(value):
+                item_collect(item, f"{path}[{index}]", errors)
+        
+        return check, collect
+    
+    @staticmethod
+    def _combine(types, kind, tests, structure) -> Tuple[Check, Collect]:
+        is_object = types is not None and dict in types
+        expected = " or ".join(kind) if isinstance(kind, list) else kind
+        
+        def type_ok(value):
+            if types is None or type(value) in types:
+                return True
+            # Records and other read-only mappings count as objects
+            return is_object and isinstance(value, Mapping)
+        
+        structure_check, structure_collect = structure or (None, None)
+        
+        if not tests and structure is None:
+            if types is None:
+                check = lambda value: True
+            elif len(types) == 1 and not is_object:
+                only = types[0]
+                check = lambda value: type(value) is only
+            else:
+                check = type_ok
+        else:
+            def check(value):
+                if not type_ok(value):
+                    return False
+                for test, _ in tests:
+                    if not test(value):
+                        return False
+                return structure_check is None or structure_check(value)
+        
+        def collect(value, path, errors):
+            if not type_ok(value):
+                errors.append(f"{path or 'prompt'}: expected {expected}, got {_type_name(value)}")
+                return
+            for test, message in tests:
+                if not test(value):
+                    errors.append(f"{path or 'prompt'}: {message}")
+            if structure_collect is not None:
+                structure_collect(value, path, errors)
+        
+        return check, collect
+
+
+class BatchReport:
+    """Outcome of validating a batch: per-record errors plus totals by problem"""
+    
+    def __init__(self):
+        self.total = 0
+        self.errors: Dict[int, List[str]] = {}
+        self.problems: Counter = Counter()
+    
+    @property
+    def valid(self) -> int:
+        return self.total - len(self.errors)
+    
+    @property
+    def invalid(self) -> int:
+        return len(self.errors)
+    
+    def add(self, index: int, errors: List[str]):
+        self.errors[index] = errors
+        # Count each kind of problem once per record, with indices removed
+        self.problems.update({_INDEX.sub("[]", error) for error in errors})
+    
+    def summary(self, max_records: int = 10, max_problems: int = 10) -> str:
+        lines = [f"Prompts: {self.total}, valid: {self.valid}, invalid: {self.invalid}"]
+        if self.problems:
+            lines.append("Most common problems (records affected):")
+            lines.extend(f"  {count:>6}  {problem}"
+                         for problem, count in self.problems.most_common(max_problems))
+            lines.append("First invalid records:")
+            for index in list(self.errors)[:max_records]:
+                lines.append(f"  #{index}: " + "; ".join(self.errors[index]))
+            if self.invalid > max_records:
+                lines.append(f"  ... and {self.invalid - max_records} more")
+        return "\n".join(lines)
+
+
+class SchemaValidator:
+    """
+    A schema compiled once into specialized check functions.
+    
+    Valid prompts, the common case, go through the fast boolean check only;
+    the slower pass that builds messages with field paths runs just for
+    the prompts that fail it. Prompts may be dicts, records or JSON text.
+    """
+    
+    def __init__(self, schema: Optional[Dict[str, Any]] = None):
+        self.schema = FLUX2_SCHEMA if schema is None else schema
+        self._check, self._collect = _Compiler().compile(self.schema)
+    
+    @staticmethod
+    def _parse(prompt):
+        """(value, error) for JSON text; other values pass through"""
+        if isinstance(prompt, (str, bytes)):
+            try:
+                return json.loads(prompt), None
+            except ValueError as e:
+                return None, f"prompt: invalid JSON ({e})"
+        return prompt, None
+    
+    def is_valid(self, prompt) -> bool:
+        prompt, error = self._parse(prompt)
+        return error is None and self._check(prompt)
+    
+    def errors(self, prompt) -> List[str]:
+        """Every problem with one prompt, as "field.path: message" strings"""
+        prompt, error = self._parse(prompt)
+        if error is not None:
+            return [error]
+        if self._check(prompt):
+            return []
+        errors: List[str] = []
+        self._collect(prompt, "", errors)
+        return errors
+    
+    def validate(self, prompt):
+        """Return the prompt when valid, otherwise raise PromptValidationError"""
+        errors = self.errors(prompt)
+        if errors:
+            raise PromptValidationError(errors)
+        return prompt
+    
+    def validate_batch(self, prompts: Iterable[Any], report: Optional[BatchReport] = None) -> BatchReport:
+        """Validate many prompts, collecting the errors of each invalid one by position"""
+        if report is None:
+            report = BatchReport()
+        check = self._check
+        for prompt in prompts:
+            if isinstance(prompt, (str, bytes)) or not check(prompt):
+                errors = self.errors(prompt)
+                if errors:
+                    report.add(report.total, errors)
+            report.total += 1
+        return report
+
+
+_validators: Dict[bool, SchemaValidator] = {}
+
+
+def prompt_validator(strict: bool = False) -> SchemaValidator:
+    """
+    Shared validator for FLUX2_SCHEMA (FLUX2_STRICT_SCHEMA with
+    strict=True), compiled on first use
+    """
+    validator = _validators.get(strict)
+    if validator is None:
+        validator = _validators[strict] = SchemaValidator(
+            FLUX2_STRICT_SCHEMA if strict else FLUX2_SCHEMA)
+    return validator
+
+
+class FLUX2_PromptValidator(FLUX2BaseNode):
+    """
+    Check prompts against the FLUX.2 JSON schema before they are used.
+    Accepts prompt objects, lists from batch nodes, or JSON text.
+    """
+    
+    ON_INVALID = ("drop", "keep", "stop")
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "on_invalid": (list(cls.ON_INVALID), {
+                    "default": "drop"
+                }),
+            },
+            "optional": {
+                "json_object": (FLUX2Types.JSON_OBJECT,),
+                "json_text": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "A JSON prompt, a JSON array of prompts, or one prompt per line"
+                }),
+                "strict": ("BOOLEAN", {
+                    "default": False
+                }),
+                "pretty_print": ("BOOLEAN", {
+                    "default": True
+                }),
+            }
+        }
+    
+    # Receive list outputs (e.g. from FLUX2_PromptSweep) in a single call
+    INPUT_IS_LIST = True
+    
+    RETURN_TYPES = ("STRING", FLUX2Types.JSON_OBJECT, "INT", "STRING")
+    RETURN_NAMES = ("json_strings", "json_objects", "valid_count", "report")
+    OUTPUT_IS_LIST = (True, True, False, False)
+    FUNCTION = "validate_prompts"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Core"
+    
+    @staticmethod
+    def split_text(text: str) -> List[Any]:
+        """Prompts in a text widget: one JSON value (or array), else JSON Lines"""
+        text = text.strip()
+        if not text:
+            return []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return [line for line in text.splitlines() if line.strip()]
+        return value if isinstance(value, list) else [value]
+    
+    def validate_prompts(self,
+                         on_invalid=("drop",),
+                         json_object=None,
+                         json_text=("",),
+                         strict=(False,),
+                         pretty_print=(True,)):
+        """
+        Validate every prompt and pass on the ones that may be used.
+        
+        Args:
+            on_invalid: "drop" invalid prompts, "keep" them, or "stop" the
+                workflow with the report as error message
+            json_object: List of prompt dicts (INPUT_IS_LIST)
+            json_text: Prompts as JSON text
+            strict: Also require a description for every subject
+            pretty_print: Format the json_strings output with indentation
+        
+        Returns:
+            Tuple of (json_strings, json_objects, valid_count, report)
+        """
+        prompts = list(iter_records(json_object or []))
+        for text in json_text:
+            prompts.extend(self.split_text(text or ""))
+        
+        report = prompt_validator(strict[0]).validate_batch(prompts)
+        mode = on_invalid[0]
+        if mode == "stop" and report.invalid:
+            raise ValueError("Invalid FLUX.2 prompts\n" + report.summary())
+        
+        kept = []
+        for index, prompt in enumerate(prompts):
+            if mode == "drop" and index in report.errors:
+                continue
+            if isinstance(prompt, (str, bytes)):
+                try:
+                    prompt = json.loads(prompt)
+                except ValueError:
+                    continue
+            kept.append(to_plain(prompt))
+        json_strings = [self.format_json_output(prompt, pretty_print[0]) for prompt in kept]
+        return (json_strings, kept, report.valid, report.summary())
+
+
+# For display in UI
+FLUX2_PromptValidator.DESCRIPTION = """
+Check prompts against the FLUX.2 JSON schema (the nine fields of the
+course schema reference) before generating, e.g. prompts written by an
+LLM agent or pasted from another tool.
+
+Reports wrong types (a number where text is expected), unknown or
+misspelled fields and non-positive lens-mm / ISO values, with the path
+of each problem. Every field is optional; with strict, subjects without
+a description are reported too.
+
+on_invalid:
+- drop: pass on only the valid prompts
+- keep: pass on everything, just report
+- stop: halt the workflow with the report
+
+The report lists how many prompts failed and the most common problems.
+"""
@@ -0,0 +1,331 @@
+"""
+FLUX2_PromptSweep - Expand lists of field values into many prompts per execution
+"""
+
+from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets
+from .prompt_assembler import FLUX2_PromptAssembler
+
+
+class SweepSpace:
+    """
+    Lazy index space over a set of value axes.
+    
+    Axes are combined either by cartesian product (last axis varies fastest,
+    matching itertools.product) or by zip (shortest axis wins). Item k is
+    decoded directly from its index, so nothing is materialized up front.
+    With no axes the space holds one empty item, like an empty product.
+    """
+    
+    MODES = ("cartesian", "zip")
+    
+    def __init__(self, axes, mode="cartesian"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown sweep mode '{mode}', expected one of {self.MODES}")
+        
+        # Axes without values do not take part in the sweep
+        self.mode = mode
+        self.names = [name for name, values in axes if values]
+        self.values = [list(values) for name, values in axes if values]
+        self.sizes = [len(values) for values in self.values]
+        
+        if not self.sizes:
+            self.length = 1
+        elif mode == "zip":
+            self.length = min(self.sizes)
+        else:
+            self.length = 1
+            for size in self.sizes:
+                self.length *= size
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(f"Sweep index {index} out of range (size {self.length})")
+        
+        if self.mode == "zip":
+            return {name: values[index] for name, values in zip(self.names, self.values)}
+        
+        # Mixed-radix decode with the last axis as the least significant digit
+        item = {}
+        for name, values, size in zip(reversed(self.names), reversed(self.values),
+                                      reversed(self.sizes)):
+            index, digit = divmod(index, size)
+            item[name] = values[digit]
+        return {name: item[name] for name in self.names}
+    
+    def __iter__(self):
+        for index in range(self.length):
+            yield self[index]
+
+
+class PromptSweep:
+    """
+    Random-access sequence of assembled prompts.
+    
+    Each item is the assembler output for one point of the sweep space,
+    with the fixed fields shared by every item.
+    """
+    
+    def __init__(self, space, fixed=None, pretty_print=True, remove_empty=True):
+        self.space = space
+        self.fixed = dict(fixed or {})
+        self.pretty_print = pretty_print
+        self.remove_empty = remove_empty
+        self.assembler = FLUX2_PromptAssembler()
+    
+    def __len__(self):
+        return len(self.space)
+    
+    def __getitem__(self, index):
+        fields = dict(self.fixed)
+        fields.update(self.space[index])
+        return self.assembler.assemble_prompt(pretty_print=self.pretty_print,
+                                              remove_empty=self.remove_empty,
+                                              **fields)
+    
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+class FLUX2_PromptSweep(FLUX2BaseNode):
+    """
+    Batch version of the Prompt Assembler.
+    Expands lists of scenes, styles, moods, lighting and cameras into
+    many prompts in a single execution.
+    """
+    
+    # Most prompts one execution may produce; larger sweeps need a window
+    MAX_PROMPTS = 10_000
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "mode": (list(SweepSpace.MODES), {
+                    "default": "cartesian"
+                }),
+            },
+            "optional": {
+                "scene_values": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "One scene per line..."
+                }),
+                "style_values": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "One style per line..."
+                }),
+                "mood_values": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "One mood per line..."
+                }),
+                "lighting_values": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "One lighting description per line..."
+                }),
+                "camera_presets": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "One camera preset name per line (e.g. 'Portrait')..."
+                }),
+                "subjects": (FLUX2Types.SUBJECT_ARRAY, {
+                    "default": None
+                }),
+                "color_palette": (FLUX2Types.COLOR_ARRAY, {
+                    "default": None
+                }),
+                "camera": (FLUX2Types.CAMERA_OBJECT, {
+                    "default": None
+                }),
+                "background": ("STRING", {
+                    "multiline": True,
+                    "default": ""
+                }),
+                "composition": ("STRING", {
+                    "multiline": True,
+                    "default": ""
+                }),
+                "start_index": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 0x7FFFFFFF,
+                    "step": 1
+                }),
+                "max_prompts": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": cls.MAX_PROMPTS,
+                    "step": 1
+                }),
+                "pretty_print": ("BOOLEAN", {
+                    "default": True
+                }),
+                "remove_empty": ("BOOLEAN", {
+                    "default": True
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", FLUX2Types.JSON_OBJECT, "INT")
+    RETURN_NAMES = ("json_strings", "json_objects", "total_combinations")
+    OUTPUT_IS_LIST = (True, True, False)
+    FUNCTION = "sweep_prompts"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Core"
+    
+    @staticmethod
+    def split_values(text):
+        """Split a multiline widget into one value per non-empty line"""
+        if not text:
+            return []
+        return [line.strip() for line in text.splitlines() if line.strip()]
+    
+    @staticmethod
+    def cameras_from_presets(text):
+        """Resolve camera preset names (one per line) into camera objects"""
+        cameras = []
+        for name in FLUX2_PromptSweep.split_values(text):
+            preset = FLUX2Presets.get("camera_presets", name)
+            if preset is None:
+                raise ValueError(f"Unknown camera preset '{name}'")
+            cameras.append(FLUX2Types.create_camera(**preset))
+        return cameras
+    
+    @classmethod
+    def build_sweep(cls,
+                    mode="cartesian",
+                    scene_values="",
+                    style_values="",
+                    mood_values="",
+                    lighting_values="",
+                    camera_presets="",
+                    subjects=None,
+                    color_palette=None,
+                    camera=None,
+                    background="",
+                    composition="",
+                    pretty_print=True,
+                    remove_empty=True):
+        """Build the lazy PromptSweep for the given node inputs."""
+        cameras = cls.cameras_from_presets(camera_presets)
+        space = SweepSpace([
+            ("scene", cls.split_values(scene_values)),
+            ("style", cls.split_values(style_values)),
+            ("mood", cls.split_values(mood_values)),
+            ("lighting", cls.split_values(lighting_values)),
+            ("camera", cameras),
+        ], mode=mode)
+        
+        fixed = {
+            "subjects": cls.subject_list(subjects),
+            "color_palette": color_palette,
+            "background": background,
+            "composition": composition,
+        }
+        if not cameras:
+            fixed["camera"] = camera
+        
+        return PromptSweep(space, fixed, pretty_print=pretty_print, remove_empty=remove_empty)
+    
+    def sweep_prompts(self,
+                      mode="cartesian",
+                      scene_values="",
+                      style_values="",
+                      mood_values="",
+                      lighting_values="",
+                      camera_presets="",
+                      subjects=None,
+                      color_palette=None,
+                      camera=None,
+                      background="",
+                      composition="",
+                      start_index=0,
+                      max_prompts=0,
+                      pretty_print=True,
+                      remove_empty=True):
+        """
+        Assemble one prompt per combination of the swept values.
+        
+        Args:
+            mode: "cartesian" for every combination, "zip" to pair values by line
+            scene_values, style_values, mood_values, lighting_values: One value per line
+            camera_presets: Camera preset names, one per line (overrides camera)
+            subjects, color_palette, camera, background, composition: Shared fields
+            start_index: First combination to produce
+            max_prompts: Number of combinations to produce (0 = all remaining,
+                at most MAX_PROMPTS)
+            pretty_print: Format JSON with indentation
+            remove_empty: Remove empty/null fields from output
+        
+        Returns:
+            Tuple of (json_strings, json_objects, total_combinations)
+        
+        Raises:
+            ValueError: If the window holds more than MAX_PROMPTS prompts
+        """
+        
+        sweep = self.build_sweep(mode=mode,
+                                 scene_values=scene_values,
+                                 style_values=style_values,
+                                 mood_values=mood_values,
+                                 lighting_values=lighting_values,
+                                 camera_presets=camera_presets,
+                                 subjects=subjects,
+                                 color_palette=color_palette,
+                                 camera=camera,
+                                 background=background,
+                                 composition=composition,
+                                 pretty_print=pretty_print,
+                                 remove_empty=remove_empty)
+        
+        total = len(sweep)
+        remaining = max(0, total - start_index)
+        count = remaining if max_prompts <= 0 else min(remaining, max_prompts)
+        if count > self.MAX_PROMPTS:
+            raise ValueError(
+                f"Sweep window holds {count:,} of {total:,} combinations, more than the "
+                f"{self.MAX_PROMPTS:,} one execution can produce; set max_prompts and "
+                f"start_index to take a smaller window")
+        stop = start_index + count
+        
+        json_strings = []
+        json_objects = []
+        for index in range(start_index, stop):
+            json_string, json_object = sweep[index]
+            json_strings.append(json_string)
+            json_objects.append(json_object)
+        
+        return (json_strings, json_objects, total)
+
+
+# For display in UI
+FLUX2_PromptSweep.DESCRIPTION = """
+Assemble many FLUX.2 prompts in one execution.
+
+Enter one value per line for scene, style, mood and lighting, and one
+camera preset name per line. Fields left empty are not swept; with
+nothing swept, one prompt is built from the shared fields.
+
+Modes:
+- cartesian: Every combination of the swept values
+- zip: Pair values line by line (stops at the shortest list)
+
+Use start_index and max_prompts to take a window of a large sweep.
+max_prompts 0 means all remaining combinations; one execution produces
+at most 10,000 prompts and fails with an error rather than trying more.
+Any single combination is computed from its index, so windows deep
+into a large product are cheap.
+
+Outputs:
+- json_strings: List of formatted JSON prompts
+- json_objects: List of prompt dicts
+- total_combinations: Size of the full sweep
+"""
@@ -0,0 +1,290 @@
+"""
+FLUX2_PromptTemplate - Fill placeholder templates from a table of variables
+"""
+
+import csv
+import io
+import re
+from operator import itemgetter
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .base import FLUX2BaseNode, FLUX2Types
+
+# {name} or {name|fallback}; {{ and }} are literal braces
+_TOKEN = re.compile(r"\{\{|\}\}|\{([^{}|]*)(?:\|([^{}]*))?\}|[{}]")
+_NAME = re.compile(r"[A-Za-z_][\w .-]*$")
+
+MEMO_SIZE = 1024
+
+
+class TemplateError(ValueError):
+    """Raised for malformed templates and variables missing from a table"""
+
+
+class PromptTemplate:
+    """
+    A placeholder template parsed once.
+    
+    "{product} on {surface}, {time|golden hour} lighting" is compiled to a
+    %-format pattern ("%s on %s, %s lighting") plus the variable of each
+    slot, so rendering a row is one C-level string format. A placeholder
+    with a |fallback uses the fallback when the variable is missing or
+    empty; the others are required.
+    """
+    
+    __slots__ = ("text", "pattern", "names", "fallbacks")
+    
+    def __init__(self, text: str):
+        self.text = text
+        pieces: List[str] = []
+        names: List[str] = []
+        fallbacks: List[Optional[str]] = []
+        position = 0
+        for match in _TOKEN.finditer(text):
+            pieces.append(text[position:match.start()].replace("%", "%%"))
+            position = match.end()
+            token = match.group(0)
+            if token in ("{{", "}}"):
+                pieces.append(token[0])
+                continue
+            name = match.group(1)
+            if name is None:
+                raise TemplateError(f"Unmatched '{token}' at position {match.start()} in template {text!r}")
+            name = name.strip()
+            if not _NAME.match(name):
+                raise TemplateError(f"Invalid placeholder {token!r} in template {text!r}")
+            pieces.append("%s")
+            names.append(name)
+            fallbacks.append(match.group(2))
+        pieces.append(text[position:].replace("%", "%%"))
+        
+        self.pattern = "".join(pieces)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.fallbacks: Tuple[Optional[str], ...] = tuple(fallbacks)
+    
+    def __repr__(self):
+        return f"PromptTemplate({self.text!r})"
+    
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        """Distinct variable names, in order of first use"""
+        return tuple(dict.fromkeys(self.names))
+    
+    @property
+    def required(self) -> Tuple[str, ...]:
+        """Variables without a fallback"""
+        return tuple(dict.fromkeys(name for name, fallback in zip(self.names, self.fallbacks)
+                                   if fallback is None))
+    
+    def missing(self, columns: Sequence[str]) -> List[str]:
+        """Required variables that are not among columns"""
+        available = set(columns)
+        return [name for name in self.required if name not in available]
+    
+    def bind(self, columns: Sequence[str]) -> Callable[[Sequence[str]], str]:
+        """
+        Renderer for rows given as sequences in the order of columns.
+        
+        Raises:
+            TemplateError: If a required variable is not a column
+        """
+        missing = self.missing(columns)
+        if missing:
+            raise TemplateError(f"Template {self.text!r} uses undefined variable(s): "
+                                f"{', '.join(missing)} (available: {', '.join(columns) or 'none'})")
+        pattern = self.pattern
+        if not self.names:
+            return lambda row: pattern
+        
+        index = {name: i for i, name in reversed(list(enumerate(columns)))}
+        absent = len(columns)  # points at the "" appended below
+        positions = [index.get(name, absent) for name in self.names]
+        defaulted = [(slot, fallback) for slot, fallback in enumerate(self.fallbacks)
+                     if fallback is not None]
+        getter = itemgetter(*positions)
+        single = len(positions) == 1
+        
+        if not defaulted:
+            # Every variable is a column
+            return lambda row: pattern % _as_tuple(getter(row), single)
+        
+        def render(row):
+            values = list(_as_tuple(getter((*row, "")), single))
+            for slot, fallback in defaulted:
+                if values[slot] is None or values[slot] == "":
+                    values[slot] = fallback
+            return pattern % tuple(values)
+        return render
+    
+    def render(self, variables: Mapping[str, str]) -> str:
+        """Fill the template from a mapping (raises TemplateError for missing variables)"""
+        names = list(variables)
+        return self.bind(names)([variables[name] for name in names])
+
+
+def _as_tuple(values, single: bool) -> tuple:
+    return (values,) if single else values
+
+
+_memo: Dict[str, PromptTemplate] = {}
+
+
+def compile_template(text: str) -> PromptTemplate:
+    """Parse a template, reusing the compiled form of recently seen texts"""
+    template = _memo.get(text)
+    if template is None:
+        template = PromptTemplate(text)
+        if len(_memo) >= MEMO_SIZE:
+            _memo.clear()
+        _memo[text] = template
+    return template
+
+
+def parse_variables(table: str) -> Tuple[List[str], List[List[str]]]:
+    """
+    Header and rows of a variables table: CSV text (tab-separated when the
+    header contains tabs) whose first line names the variables. Cells are
+    stripped and short rows are padded with empty values.
+    """
+    lines = table.strip("\n")
+    if not lines.strip():
+        return [], []
+    header_line = lines.split("\n", 1)[0]
+    dialect = "excel-tab" if "\t" in header_line else "excel"
+    reader = csv.reader(io.StringIO(lines), dialect=dialect, skipinitialspace=True)
+    header = [name.strip() for name in next(reader)]
+    rows = []
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        cells = [cell.strip() for cell in row[:len(header)]]
+        cells.extend([""] * (len(header) - len(cells)))
+        rows.append(cells)
+    return header, rows
+
+
+class FLUX2_PromptTemplate(FLUX2BaseNode):
+    """
+    Render scene, style and subject templates once per row of a
+    variables table. Outputs are lists, one entry per row.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "variables": ("STRING", {
+                    "multiline": True,
+                    "default": "product,surface,time\nCeramic mug,oak table,morning",
+                    "placeholder": "Header line with variable names, then one row per prompt"
+                }),
+            },
+            "optional": {
+                "scene_template": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "e.g., {product} on {surface}, {time} lighting"
+                }),
+                "style_template": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "e.g., {medium|Product photography}, {finish} finish"
+                }),
+                "subject_template": ("STRING", {
+                    "multiline": True,
+                    "default": "",
+                    "placeholder": "e.g., {product} with {detail}"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "STRING", FLUX2Types.SUBJECT_OBJECT, "INT")
+    RETURN_NAMES = ("scene", "style", "subject", "row_count")
+    OUTPUT_IS_LIST = (True, True, True, False)
+    FUNCTION = "render_templates"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Core"
+    
+    @staticmethod
+    def compile_all(variables: str, templates: Sequence[str]):
+        """
+        Parse the table and bind every non-empty template to its header.
+        
+        Raises:
+            TemplateError: For malformed templates or undefined variables
+        """
+        header, rows = parse_variables(variables)
+        renderers = [compile_template(text).bind(header) if text and text.strip() else None
+                     for text in templates]
+        return header, rows, renderers
+    
+    def render_templates(self,
+                         variables,
+                         scene_template="",
+                         style_template="",
+                         subject_template=""):
+        """
+        Fill each template from every row of the variables table.
+        
+        Args:
+            variables: CSV table; first line names the variables
+            scene_template: Template for the scene string
+            style_template: Template for the style string
+            subject_template: Template for a subject description
+        
+        Returns:
+            Tuple of (scenes, styles, subjects, row_count), lists with one
+            entry per row ("" / None where no template is given)
+        """
+        _, rows, (scene, style, subject) = self.compile_all(
+            variables, (scene_template, style_template, subject_template))
+        
+        scenes = [scene(row).strip() for row in rows] if scene else [""] * len(rows)
+        styles = [style(row).strip() for row in rows] if style else [""] * len(rows)
+        subjects = [None] * len(rows)
+        if subject:
+            for i, row in enumerate(rows):
+                description = subject(row).strip()
+                if description:
+                    subjects[i] = FLUX2Types.create_subject(description=description)
+        
+        return (scenes, styles, subjects, len(rows))
+    
+    @classmethod
+    def VALIDATE_INPUTS(cls, variables=None, scene_template=None, style_template=None,
+                        subject_template=None, **kwargs):
+        """Report malformed templates and undefined variables before the queue runs"""
+        # Linked inputs are not known yet and arrive as None
+        templates = [text for text in (scene_template, style_template, subject_template)
+                     if text is not None]
+        try:
+            if variables is None:
+                for text in templates:
+                    compile_template(text)
+            else:
+                cls.compile_all(variables, templates)
+        except (TemplateError, csv.Error) as e:
+            return str(e)
+        return True
+
+
+# For display in UI
+FLUX2_PromptTemplate.DESCRIPTION = """
+Fill scene, style and subject templates from a table of variables,
+producing one prompt's worth of strings per row.
+
+Templates use {name} placeholders; {name|fallback} uses the fallback
+when the cell is empty, and {{ }} write literal braces:
+  {product} on {surface}, {time|golden hour} lighting
+
+variables is CSV text (or tab-separated) with the variable names on the
+first line:
+  product,surface,time
+  Ceramic mug,oak table,morning
+  Leather bag,marble slab,
+
+Templates are parsed once and checked against the header before the
+workflow runs, so a misspelled variable is reported up front instead of
+producing broken prompts. Connect the outputs to Prompt Assembler (and
+subject to Subject Array); ComfyUI runs them once per row.
+"""
@@ -0,0 +1,256 @@
+"""
+Immutable records for subjects and cameras
+
+Records are read-only dict subclasses: lookups, iteration and json.dumps
+work exactly as on the plain dicts they replace, at dict speed. On top
+of that they are hashable (usable as cache keys) and cache their JSON
+encoding per output layout, so batch runs that reuse the same subject or
+camera encode it once. to_dict() builds a mutable plain dict for
+consumers that need one.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+INDENT = "  "
+
+
+def _restore(cls, values):
+    """Unpickle a record (see Record.__reduce__)"""
+    return cls._from_values(values)
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is immutable")
+
+
+class Record(dict):
+    """
+    Base class for immutable dict records.
+    
+    Subclasses declare their JSON keys (in output order) in KEYS; None
+    values are left out, so a record holds only the present fields, and
+    list fields are held as tuples. The mutating dict methods raise
+    TypeError. Calling the class wraps a mapping of present fields as is,
+    like dict(); the subject_record and camera_record builders below
+    clean and order the fields first.
+    """
+    
+    # Dict holding the cleaned dict and JSON fragments, set on first use
+    __slots__ = ("_cache",)
+    
+    KEYS: Tuple[str, ...] = ()
+    
+    @classmethod
+    def _from_values(cls, values):
+        """Record from one value per KEYS entry (None = absent)"""
+        return cls({key: tuple(value) if type(value) is list else value
+                    for key, value in zip(cls.KEYS, values) if value is not None})
+    
+    def _values(self) -> Tuple:
+        get = dict.get
+        return tuple(tuple(value) if type(value) is list else value
+                     for value in (get(self, key) for key in self.KEYS))
+    
+    def _cached(self) -> Dict:
+        try:
+            return self._cache
+        except AttributeError:
+            cache = {}
+            _set_cache(self, cache)
+            return cache
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+    
+    def __reduce__(self):
+        return (_restore, (type(self), self._values()))
+    
+    def __hash__(self):
+        return hash((type(self).__name__, self._values()))
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+    
+    def copy(self) -> Dict[str, Any]:
+        """Mutable dict copy, as dict.copy() would give"""
+        return self.to_dict()
+    
+    def to_dict(self, clean: bool = False) -> Dict[str, Any]:
+        """
+        Build a new plain dict of the present fields.
+        With clean=True whitespace-only strings are dropped as well,
+        matching FLUX2BaseNode.remove_empty_fields.
+        """
+        result = {}
+        for key, value in dict.items(self):
+            if type(value) is tuple or type(value) is list:
+                value = list(value)
+            elif clean and isinstance(value, str) and not value.strip():
+                continue
+            result[key] = value
+        return result
+    
+    def cleaned(self) -> Dict[str, Any]:
+        """
+        Shared to_dict(clean=True), built once per record. Used for
+        assembled prompt objects; treat it as read-only.
+        """
+        cache = self._cached()
+        if "clean" not in cache:
+            cache["clean"] = self.to_dict(clean=True)
+        return cache["clean"]
+    
+    def fingerprint(self) -> str:
+        """
+        SHA-256 of the type and field values, computed once per record.
+        Fields hold only strings, numbers and tuples, whose repr is stable
+        across processes, so this is cheaper than hashing the JSON.
+        """
+        cache = self._cached()
+        if "fingerprint" not in cache:
+            canonical = f"{type(self).__name__}{self._values()!r}"
+            cache["fingerprint"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+        return cache["fingerprint"]
+    
+    def json_fragment(self, pretty: bool = True, depth: int = 0) -> Optional[str]:
+        """
+        Cleaned JSON encoding of this record nested depth levels deep, as
+        the prompt emitter would write it; None when nothing is left.
+        Encoded once per layout, then re-indented per depth and cached.
+        """
+        cache = self._cached()
+        cache_key = (pretty, depth)
+        if cache_key in cache:
+            return cache[cache_key]
+        
+        base_key = (pretty, 0)
+        if base_key not in cache:
+            cleaned = self.cleaned()
+            cache[base_key] = json.dumps(cleaned, indent=2 if pretty else None,
+                                         ensure_ascii=False) if cleaned else None
+        base = cache[base_key]
+        
+        # Encoded strings never contain raw newlines, so this only shifts layout
+        fragment = base
+        if base is not None and pretty and depth:
+            fragment = base.replace("\n", "\n" + INDENT * depth)
+        cache[cache_key] = fragment
+        return fragment
+
+
+_set_cache = Record._cache.__set__
+
+
+class SubjectRecord(Record):
+    """Subject with description, position, action, pose and color palette"""
+    
+    __slots__ = ()
+    KEYS = ("description", "position", "action", "pose", "color_palette")
+    
+    # The palette is held as a tuple and handed out as a new list on
+    # every read, so readers cannot change the hash or the cached JSON
+    
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        return list(value) if key == "color_palette" else value
+    
+    def get(self, key, default=None):
+        value = dict.get(self, key, default)
+        return list(value) if key == "color_palette" and value is not None else value
+    
+    def __iter__(self):
+        # Overriding __iter__ makes dict(record) and {**record} read
+        # through __getitem__ instead of copying the stored values
+        return dict.__iter__(self)
+    
+    def values(self) -> List[Any]:
+        return [self[key] for key in dict.__iter__(self)]
+    
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(key, self[key]) for key in dict.__iter__(self)]
+    
+    def __eq__(self, other):
+        return self.to_dict() == other
+    
+    def __ne__(self, other):
+        return self.to_dict() != other
+    
+    __hash__ = Record.__hash__
+
+
+class CameraRecord(Record):
+    """Camera parameters in FLUX.2 prompt key order"""
+    
+    __slots__ = ()
+    KEYS = ("angle", "distance", "lens", "lens-mm", "f-number", "ISO",
+            "depth_of_field", "focus")
+
+
+def subject_record(description: str,
+                   position: Optional[str] = None,
+                   action: Optional[str] = None,
+                   pose: Optional[str] = None,
+                   color_palette: Optional[List[str]] = None) -> SubjectRecord:
+    """Subject record; empty fields are left out"""
+    subject = {"description": description}
+    if position:
+        subject["position"] = position
+    if action:
+        subject["action"] = action
+    if pose:
+        subject["pose"] = pose
+    if color_palette:
+        subject["color_palette"] = tuple(color_palette)
+    return SubjectRecord(subject)
+
+
+def camera_record(angle: Optional[str] = None,
+                  distance: Optional[str] = None,
+                  lens: Optional[str] = None,
+                  lens_mm: Optional[int] = None,
+                  f_number: Optional[str] = None,
+                  iso: Optional[int] = None,
+                  depth_of_field: Optional[str] = None,
+                  focus: Optional[str] = None,
+                  **kwargs) -> CameraRecord:
+    """
+    Camera record; empty fields are left out. Also accepts the lens-mm
+    and f-number keys of camera presets as keyword arguments.
+    """
+    camera = {}
+    if angle:
+        camera["angle"] = angle
+    if distance:
+        camera["distance"] = distance
+    if lens:
+        camera["lens"] = lens
+    lens_mm = lens_mm or kwargs.get("lens-mm")
+    if lens_mm is not None:
+        camera["lens-mm"] = lens_mm
+    f_number = f_number or kwargs.get("f-number")
+    if f_number:
+        camera["f-number"] = f_number
+    if iso is not None:
+        camera["ISO"] = iso
+    if depth_of_field:
+        camera["depth_of_field"] = depth_of_field
+    if focus:
+        camera["focus"] = focus
+    return CameraRecord(camera)
+
+
+def to_plain(value):
+    """Replace records (directly or inside a list) with plain dicts"""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list) and any(isinstance(item, Record) for item in value):
+        return [item.to_dict() if isinstance(item, Record) else item for item in value]
+    return value
@@ -0,0 +1,71 @@
+"""
+Node registry with lazy class resolution
+
+Node modules are only imported when ComfyUI (or a script) first looks up
+one of their classes, so importing the package stays cheap.
+"""
+
+import importlib
+from collections.abc import Mapping
+from typing import Dict, Tuple
+
+# Node name -> (module in this package, class name, display name)
+NODE_SPECS: Dict[str, Tuple[str, str, str]] = {
+    "FLUX2_PromptAssembler": ("prompt_assembler", "FLUX2_PromptAssembler", "FLUX2 Prompt Assembler 🎯"),
+    "FLUX2_SceneBuilder": ("scene_builder", "FLUX2_SceneBuilder", "FLUX2 Scene Builder 🏗️"),
+    "FLUX2_StyleSelector": ("style_selector", "FLUX2_StyleSelector", "FLUX2 Style Selector 🎨"),
+    "FLUX2_SubjectCreator": ("subject_creator", "FLUX2_SubjectCreator", "FLUX2 Subject Creator 👤"),
+    "FLUX2_SubjectArray": ("subject_array", "FLUX2_SubjectArray", "FLUX2 Subject Array 📋"),
+    "FLUX2_SubjectArrayDynamic": ("subject_array", "FLUX2_SubjectArrayDynamic", "FLUX2 Subject Array (Dynamic) 📚"),
+    "FLUX2_CameraRig": ("camera_rig", "FLUX2_CameraRig", "FLUX2 Camera Rig 📷"),
+    "FLUX2_ColorPalette": ("color_palette", "FLUX2_ColorPalette", "FLUX2 Color Palette 🎨"),
+    "FLUX2_ColorPalettePreset": ("color_palette", "FLUX2_ColorPalettePreset", "FLUX2 Color Palette Preset 🌈"),
+    "FLUX2_NearestPalette": ("color_palette", "FLUX2_NearestPalette", "FLUX2 Nearest Palette 🔍"),
+    "FLUX2_ImagePalette": ("image_palette", "FLUX2_ImagePalette", "FLUX2 Image Palette 🖼️"),
+    "FLUX2_PromptSweep": ("prompt_sweep", "FLUX2_PromptSweep", "FLUX2 Prompt Sweep 🔁"),
+    "FLUX2_PromptTemplate": ("prompt_template", "FLUX2_PromptTemplate", "FLUX2 Prompt Template 🧩"),
+    "FLUX2_VariationSampler": ("variation_sampler", "FLUX2_VariationSampler", "FLUX2 Variation Sampler 🎲"),
+    "FLUX2_PromptExporter": ("prompt_exporter", "FLUX2_PromptExporter", "FLUX2 Prompt Exporter 💾"),
+    "FLUX2_PromptDedup": ("prompt_dedup", "FLUX2_PromptDedup", "FLUX2 Prompt Dedup 🧹"),
+    "FLUX2_PromptValidator": ("prompt_schema", "FLUX2_PromptValidator", "FLUX2 Prompt Validator ✅"),
+    "FLUX2_TokenBudget": ("token_budget", "FLUX2_TokenBudget", "FLUX2 Token Budget 🧮"),
+}
+
+
+class LazyNodeMappings(Mapping):
+    """
+    Read-only NODE_CLASS_MAPPINGS that imports node modules on first access.
+    Iterating keys or checking membership never imports anything.
+    """
+    
+    def __init__(self, specs: Dict[str, Tuple[str, str, str]], package: str = __package__):
+        self._specs = specs
+        self._package = package
+        self._classes: Dict[str, type] = {}
+    
+    def __getitem__(self, name):
+        node_class = self._classes.get(name)
+        if node_class is None:
+            module_name, class_name, _ = self._specs[name]
+            module = importlib.import_module(f".{module_name}", self._package)
+            node_class = getattr(module, class_name)
+            self._classes[name] = node_class
+        return node_class
+    
+    def __iter__(self):
+        return iter(self._specs)
+    
+    def __len__(self):
+        return len(self._specs)
+    
+    def __contains__(self, name):
+        return name in self._specs
+    
+    def loaded(self):
+        """Names of the node classes resolved so far"""
+        return list(self._classes)
+
+
+NODE_CLASS_MAPPINGS = LazyNodeMappings(NODE_SPECS)
+
+NODE_DISPLAY_NAME_MAPPINGS = {name: spec[2] for name, spec in NODE_SPECS.items()}
@@ -2,7 +2,7 @@
 FLUX2_SceneBuilder - Define the overall scene context and environment
 """
 
-from .base import FLUX2BaseNode, FLUX2Presets
+from .base import FLUX2BaseNode, FLUX2Presets, cached_input_types
 
 
 class FLUX2_SceneBuilder(FLUX2BaseNode):
@@ -12,8 +12,9 @@ class FLUX2_SceneBuilder(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
-        scene_type_options = ["Custom"] + list(FLUX2Presets.SCENE_TYPES.keys())
+        scene_type_options = ["Custom"] + FLUX2Presets.names("scene_types")
         
         return {
             "required": {
@@ -89,7 +90,7 @@ class FLUX2_SceneBuilder(FLUX2BaseNode):
                 scene = custom_description.strip()
         else:
             # Use preset
-            scene = FLUX2Presets.SCENE_TYPES.get(scene_type, "")
+            scene = FLUX2Presets.get("scene_types", scene_type, "")
         
         # Build additional context parts
         context_parts = []
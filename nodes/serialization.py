@@ -0,0 +1,134 @@
+"""
+JSON serialization backends for FLUX2 prompt output
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibBackend:
+    """Reference backend built on the standard library json module"""
+    
+    name = "json"
+    
+    def dumps(self, data: Any, pretty: bool = True, canonical: bool = False,
+              default: Optional[Callable] = None) -> str:
+        if canonical and not pretty:
+            return json.dumps(data, sort_keys=True, separators=(",", ":"),
+                              ensure_ascii=False, default=default)
+        if pretty:
+            return json.dumps(data, indent=2, sort_keys=canonical,
+                              ensure_ascii=False, default=default)
+        return json.dumps(data, ensure_ascii=False, default=default)
+
+
+class OrjsonBackend:
+    """
+    Native backend using orjson when it is installed.
+    Output is byte-identical to StdlibBackend for prompt data (strings,
+    ints, lists, dicts); only float exponents and NaN are spelled
+    differently. Anything orjson cannot encode (non-string keys, integers
+    beyond 64 bits) falls back to the standard library.
+    """
+    
+    name = "orjson"
+    
+    def __init__(self):
+        self.fallback = StdlibBackend()
+    
+    def dumps(self, data: Any, pretty: bool = True, canonical: bool = False,
+              default: Optional[Callable] = None) -> str:
+        option = 0
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if canonical:
+            option |= orjson.OPT_SORT_KEYS
+        elif not pretty:
+            # orjson is always compact; keep the stdlib ", " / ": " spacing
+            return self.fallback.dumps(data, pretty=False, default=default)
+        try:
+            return orjson.dumps(data, default=default, option=option).decode("utf-8")
+        except TypeError:
+            return self.fallback.dumps(data, pretty=pretty, canonical=canonical,
+                                       default=default)
+
+
+# Registered backends, fastest first
+BACKENDS: Dict[str, Any] = {}
+if orjson is not None:
+    BACKENDS[OrjsonBackend.name] = OrjsonBackend()
+BACKENDS[StdlibBackend.name] = StdlibBackend()
+
+_active_backend = None
+
+
+def register_backend(backend, preferred: bool = False):
+    """Register an additional backend (an object with name and dumps())"""
+    global _active_backend
+    BACKENDS.pop(backend.name, None)
+    if preferred:
+        others = list(BACKENDS.items())
+        BACKENDS.clear()
+        BACKENDS[backend.name] = backend
+        BACKENDS.update(others)
+    else:
+        BACKENDS[backend.name] = backend
+    _active_backend = None
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Return a serialization backend.
+    
+    Resolution order: explicit name, FLUX2_JSON_BACKEND environment
+    variable, then the fastest registered backend ("auto").
+    """
+    global _active_backend
+    if name is None:
+        if _active_backend is not None:
+            return _active_backend
+        requested = os.environ.get("FLUX2_JSON_BACKEND", "auto").strip().lower()
+    else:
+        requested = name.lower()
+    
+    if requested in ("", "auto"):
+        backend = next(iter(BACKENDS.values()))
+    elif requested in BACKENDS:
+        backend = BACKENDS[requested]
+    else:
+        raise ValueError(f"Unknown JSON backend '{requested}', available: {list(BACKENDS)}")
+    
+    if name is None:
+        _active_backend = backend
+    return backend
+
+
+def set_backend(name: Optional[str]):
+    """Select the process-wide backend (None re-reads the environment)"""
+    global _active_backend
+    _active_backend = None
+    if name is not None:
+        _active_backend = get_backend(name)
+
+
+def dumps(data: Any, pretty: bool = True, canonical: bool = False,
+          default: Optional[Callable] = None, backend: Optional[str] = None) -> str:
+    """
+    Serialize data to a JSON string.
+    
+    Args:
+        data: JSON-compatible data
+        pretty: Indent with two spaces
+        canonical: Sort keys; combined with pretty=False this gives the
+                   compact canonical form (",", ":" separators)
+        default: Fallback for objects the encoder does not support
+        backend: Backend name, or None for the active backend
+    """
+    return get_backend(backend).dumps(data, pretty=pretty, canonical=canonical,
+                                      default=default)
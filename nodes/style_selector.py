@@ -2,7 +2,7 @@
 FLUX2_StyleSelector - Choose artistic style and rendering approach
 """
 
-from .base import FLUX2BaseNode, FLUX2Presets
+from .base import FLUX2BaseNode, FLUX2Presets, cached_input_types
 
 
 class FLUX2_StyleSelector(FLUX2BaseNode):
@@ -12,13 +12,14 @@ class FLUX2_StyleSelector(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
-        style_categories = ["Custom"] + list(FLUX2Presets.STYLE_CATEGORIES.keys())
+        style_categories = ["Custom"] + FLUX2Presets.names("style_categories")
         
         # Build comprehensive preset list with category prefixes
         all_presets = [""]  # Keep empty option for flexibility
-        for category, presets in FLUX2Presets.STYLE_CATEGORIES.items():
-            for preset in presets:
+        for category in FLUX2Presets.names("style_categories"):
+            for preset in FLUX2Presets.get("style_categories", category, []):
                 all_presets.append(f"{category}: {preset}")
         
         return {
@@ -81,7 +82,7 @@ class FLUX2_StyleSelector(FLUX2BaseNode):
                 style = custom_style.strip()
         else:
             # Get presets for this category
-            presets = FLUX2Presets.STYLE_CATEGORIES.get(style_category, [])
+            presets = FLUX2Presets.get("style_categories", style_category, [])
             
             if style_preset and presets:
                 # Strip category prefix if present (format: "Category: preset")
@@ -115,7 +116,7 @@ class FLUX2_StyleSelector(FLUX2BaseNode):
     @classmethod
     def get_style_presets(cls, style_category):
         """Get available presets for a category (for UI updates)"""
-        return FLUX2Presets.STYLE_CATEGORIES.get(style_category, [])
+        return FLUX2Presets.get("style_categories", style_category, [])
     
     # Description for display in UI
     DESCRIPTION = """
@@ -143,10 +144,11 @@ class FLUX2_StyleSelectorAdvanced(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
         return {
             "required": {
-                "style_category": (list(FLUX2Presets.STYLE_CATEGORIES.keys()), {
+                "style_category": (FLUX2Presets.names("style_categories"), {
                     "default": "Photorealistic"
                 }),
                 "preset_index": ("INT", {
@@ -196,7 +198,7 @@ class FLUX2_StyleSelectorAdvanced(FLUX2BaseNode):
             return (style, preset_list)
         
         # Get presets for category
-        presets = FLUX2Presets.STYLE_CATEGORIES.get(style_category, [])
+        presets = FLUX2Presets.get("style_categories", style_category, [])
         
         if not presets:
             style = f"{style_category} style"
@@ -2,9 +2,106 @@
 FLUX2_SubjectArray - Collect multiple subjects into an ordered array
 """
 
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional
+
 from .base import FLUX2BaseNode, FLUX2Types
 
 
+class SubjectArray(Sequence):
+    """
+    Immutable subject array that shares storage with the array it extends.
+    
+    Each array holds only the subjects it added plus a pointer to its
+    parent, so a chain of array nodes never re-copies the subjects
+    collected upstream. Subject dicts are shared, not copied, and must
+    not be mutated once collected. Consumers that need a real list
+    (JSON encoding) call FLUX2BaseNode.subject_list().
+    """
+    
+    __slots__ = ("_parent", "_items", "_length")
+    
+    def __init__(self, items: Iterable[Dict] = (), parent: Optional[Sequence] = None):
+        if parent is not None and not isinstance(parent, SubjectArray):
+            # Plain lists from other nodes become the root of the chain
+            parent = SubjectArray(parent)
+        if parent is not None and not parent:
+            parent = None
+        self._parent = parent
+        self._items = tuple(items)
+        self._length = len(self._items) + (len(parent) if parent is not None else 0)
+    
+    def extend(self, items: Iterable[Dict]) -> "SubjectArray":
+        """Return a new array with items appended; self is shared, not copied"""
+        items = tuple(items)
+        if not items:
+            return self
+        return SubjectArray(items, parent=self)
+    
+    def _segments(self) -> List[tuple]:
+        """Item tuples from the root of the chain to this array"""
+        segments = []
+        node = self
+        while node is not None:
+            if node._items:
+                segments.append(node._items)
+            node = node._parent
+        segments.reverse()
+        return segments
+    
+    def __len__(self):
+        return self._length
+    
+    def __iter__(self):
+        for segment in self._segments():
+            yield from segment
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("subject index out of range")
+        # Walk back from the newest segment
+        node = self
+        end = self._length
+        while True:
+            start = end - len(node._items)
+            if index >= start:
+                return node._items[index - start]
+            end = start
+            node = node._parent
+    
+    def __eq__(self, other):
+        if isinstance(other, (SubjectArray, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return f"SubjectArray({list(self)!r})"
+    
+    def to_list(self) -> List[Dict]:
+        return list(self)
+
+
+def summarize_subjects(subjects, width: int = 50) -> str:
+    """One line per subject, descriptions truncated to width characters"""
+    count = len(subjects)
+    if count == 0:
+        return "No subjects provided"
+    summary_lines = [f"Total subjects: {count}"]
+    for i, subject in enumerate(subjects, 1):
+        desc = subject.get("description", "No description")
+        # Truncate long descriptions
+        if len(desc) > width:
+            desc = desc[:width - 3] + "..."
+        summary_lines.append(f"{i}. {desc}")
+    return "\n".join(summary_lines)
+
+
 class FLUX2_SubjectArray(FLUX2BaseNode):
     """
     Collect multiple subject objects into an ordered array.
@@ -40,6 +137,9 @@ class FLUX2_SubjectArray(FLUX2BaseNode):
                 "subject_8": (FLUX2Types.SUBJECT_OBJECT, {
                     "default": None
                 }),
+                "always_refresh": ("BOOLEAN", {
+                    "default": False
+                }),
             }
         }
     
@@ -57,12 +157,14 @@ class FLUX2_SubjectArray(FLUX2BaseNode):
                         subject_5=None,
                         subject_6=None,
                         subject_7=None,
-                        subject_8=None):
+                        subject_8=None,
+                        always_refresh=False):
         """
         Collect subject objects into an array.
         
         Args:
             subject_1 through subject_8: Subject objects
+            always_refresh: Force re-execution on every queue (see IS_CHANGED)
         
         Returns:
             Tuple of (subjects_array, count, summary)
@@ -75,28 +177,14 @@ class FLUX2_SubjectArray(FLUX2BaseNode):
             if subject is not None:
                 subjects.append(subject)
         
-        # Count subjects
-        count = len(subjects)
-        
-        # Create summary
-        if count == 0:
-            summary = "No subjects provided"
-        else:
-            summary_lines = [f"Total subjects: {count}"]
-            for i, subject in enumerate(subjects, 1):
-                desc = subject.get("description", "No description")
-                # Truncate long descriptions
-                if len(desc) > 50:
-                    desc = desc[:47] + "..."
-                summary_lines.append(f"{i}. {desc}")
-            summary = "\n".join(summary_lines)
-        
-        return (subjects, count, summary)
+        return (subjects, len(subjects), summarize_subjects(subjects))
     
     @classmethod
-    def IS_CHANGED(cls, **kwargs):
-        # Always execute to ensure updates propagate
-        return float("nan")
+    def IS_CHANGED(cls, always_refresh=False, **kwargs):
+        # Fingerprint the connected subjects instead of forcing a re-run
+        if always_refresh:
+            return float("nan")
+        return cls.fingerprint_inputs(**kwargs)
 
 
 # For display in UI
@@ -106,6 +194,11 @@ Collect multiple subject objects into an ordered array.
 Connect up to 8 subjects to this node. Empty slots are automatically 
 filtered out, and subjects are maintained in order.
 
+For more than 8 subjects use the Subject Array (Dynamic) node.
+
+The node only re-runs when the connected subjects change. Enable
+always_refresh to force execution on every queue.
+
 Outputs:
 - subjects: Array of subject objects for prompt assembly
 - subject_count: Number of subjects in array
@@ -122,6 +215,89 @@ SubjectCreator (plant) → subject_3
 """
 
 
+
+class FLUX2_SubjectArrayDynamic(FLUX2BaseNode):
+    """
+    Variable-length subject array.
+    Accepts any number of subject_N inputs and can extend an upstream
+    SUBJECT_ARRAY without copying it.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        # The web extension adds subject_2, subject_3, ... as slots are connected
+        return {
+            "required": {},
+            "optional": {
+                "subjects_in": (FLUX2Types.SUBJECT_ARRAY,),
+                "subject_1": (FLUX2Types.SUBJECT_OBJECT,),
+                "always_refresh": ("BOOLEAN", {
+                    "default": False
+                }),
+            }
+        }
+    
+    RETURN_TYPES = (FLUX2Types.SUBJECT_ARRAY, "INT", "STRING")
+    RETURN_NAMES = ("subjects", "subject_count", "summary")
+    FUNCTION = "extend_subjects"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Subjects"
+    
+    @staticmethod
+    def numbered_subjects(inputs) -> List[Dict]:
+        """subject_N inputs in numeric order, skipping unconnected slots"""
+        numbered = []
+        for name, subject in inputs.items():
+            suffix = name[len("subject_"):]
+            if name.startswith("subject_") and suffix.isdigit() and subject is not None:
+                numbered.append((int(suffix), subject))
+        numbered.sort(key=lambda pair: pair[0])
+        return [subject for _, subject in numbered]
+    
+    def extend_subjects(self, subjects_in=None, always_refresh=False, **subjects):
+        """
+        Append subjects to an (optional) upstream array.
+        
+        Args:
+            subjects_in: Array to extend (shared, never copied)
+            always_refresh: Force re-execution on every queue (see IS_CHANGED)
+            **subjects: subject_1, subject_2, ... in any number
+        
+        Returns:
+            Tuple of (subjects_array, count, summary)
+        """
+        
+        if not isinstance(subjects_in, SubjectArray):
+            subjects_in = SubjectArray(subjects_in or ())
+        array = subjects_in.extend(self.numbered_subjects(subjects))
+        return (array, len(array), summarize_subjects(array))
+    
+    @classmethod
+    def IS_CHANGED(cls, always_refresh=False, **kwargs):
+        if always_refresh:
+            return float("nan")
+        return cls.fingerprint_inputs(**kwargs)
+
+
+FLUX2_SubjectArrayDynamic.DESCRIPTION = """
+Collect any number of subjects into an ordered array.
+
+A new subject slot appears each time the last one is connected. Connect
+another Subject Array to subjects_in to append to it: chained arrays
+share the upstream subjects instead of copying them, so crowd or catalog
+scenes can be built from as many arrays as needed.
+
+Outputs:
+- subjects: Array of subject objects for prompt assembly
+- subject_count: Total number of subjects, including subjects_in
+- summary: Quick overview of all subjects
+
+Example workflow:
+SubjectArray (people) → subjects_in
+SubjectCreator (stage) → subject_1
+→ SubjectArray (Dynamic) → PromptAssembler
+"""
+
 # Alternative version with priority ordering
 class FLUX2_SubjectArrayAdvanced(FLUX2BaseNode):
     """
@@ -2,7 +2,7 @@
 FLUX2_SubjectCreator - Define individual subjects with detailed properties
 """
 
-from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets
+from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets, cached_input_types
 
 
 class FLUX2_SubjectCreator(FLUX2BaseNode):
@@ -12,6 +12,7 @@ class FLUX2_SubjectCreator(FLUX2BaseNode):
     """
     
     @classmethod
+    @cached_input_types
     def INPUT_TYPES(cls):
         # Get position vocabulary for hints
         positions = FLUX2Presets.POSITION_VOCABULARY
@@ -126,15 +127,10 @@ class FLUX2_SubjectCreator(FLUX2BaseNode):
             if position_parts:
                 final_position = " ".join(position_parts)
         
-        # Collect colors
-        colors = []
-        for color in [color_1, color_2, color_3, color_4]:
-            if color and color.strip():
-                color_clean = color.strip()
-                # Validate and format hex colors
-                if color_clean.startswith('#') or all(c in '0123456789ABCDEFabcdef' for c in color_clean.replace('#', '')):
-                    color_clean = self.format_hex_color(color_clean)
-                colors.append(color_clean)
+        # Collect colors: hex codes and CSS names are normalized to #RRGGBB,
+        # other color descriptions are kept as written
+        colors, _ = self.normalize_colors([color_1, color_2, color_3, color_4],
+                                          keep_unknown=True)
         
         # Create subject using base class helper
         subject = FLUX2Types.create_subject(
@@ -166,7 +162,7 @@ Optional:
 - position: Where in frame (use helpers or manual)
 - action: Dynamic movement or activity
 - pose: Static positioning or body language
-- colors: Up to 4 color specifications (hex or names)
+- colors: Up to 4 color specifications (hex or names; #f00 and CSS names like "navy" become #RRGGBB)
 
 Position Helpers:
 - Horizontal: left, center, right, etc.
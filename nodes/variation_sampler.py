@@ -0,0 +1,257 @@
+"""
+FLUX2_VariationSampler - Seeded unique samples from the product of preset tables
+"""
+
+import random
+from typing import Any, Dict, List, Optional
+
+from .base import FLUX2BaseNode, FLUX2Types, FLUX2Presets
+from .color_palette import FLUX2_ColorPalettePreset
+from .prompt_sweep import SweepSpace
+
+_MASK64 = (1 << 64) - 1
+
+# Dimensions that can be varied, in output order
+DIMENSIONS = ("scene", "style", "camera", "mood", "palette", "position")
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer: a fast, well-distributed 64-bit hash of an int"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class IndexPermutation:
+    """
+    Seeded bijection of range(size) onto itself.
+    
+    A balanced Feistel network permutes the smallest even-width bit domain
+    covering size; results outside range(size) are encrypted again (cycle
+    walking) until they land inside, which keeps the mapping a bijection.
+    Item k is computed from (seed, k) alone, so drawing n unique indices
+    from a space of billions costs O(n) time and no memory.
+    """
+    
+    def __init__(self, size: int, seed: int, rounds: int = 4):
+        if size < 0:
+            raise ValueError(f"Permutation size must be non-negative, got {size}")
+        self.size = size
+        self.seed = seed
+        bits = max(2, (size - 1).bit_length())
+        self._half = (bits + 1) // 2
+        self._mask = (1 << self._half) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(64) for _ in range(rounds)]
+    
+    def __len__(self):
+        return self.size
+    
+    def __getitem__(self, index: int) -> int:
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"Permutation index {index} out of range (size {self.size})")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+    
+    def index_of(self, value: int) -> int:
+        """Inverse mapping: the index whose item is value"""
+        if not 0 <= value < self.size:
+            raise ValueError(f"{value} is not in range({self.size})")
+        index = self._decrypt(value)
+        while index >= self.size:
+            index = self._decrypt(index)
+        return index
+    
+    def _encrypt(self, value: int) -> int:
+        half, mask = self._half, self._mask
+        left, right = value >> half, value & mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & mask)
+        return (left << half) | right
+    
+    def _decrypt(self, value: int) -> int:
+        half, mask = self._half, self._mask
+        left, right = value >> half, value & mask
+        for key in reversed(self._keys):
+            left, right = right ^ (_mix(left ^ key) & mask), left
+        return (left << half) | right
+
+
+def preset_axes(dimensions=DIMENSIONS) -> List:
+    """
+    (name, values) axes of the preset tables for the chosen dimensions.
+    Position is split into its horizontal, vertical and depth vocabularies.
+    """
+    axes = []
+    if "scene" in dimensions:
+        axes.append(("scene", [FLUX2Presets.get("scene_types", name, "")
+                               for name in FLUX2Presets.names("scene_types")]))
+    if "style" in dimensions:
+        axes.append(("style", [style
+                               for category in FLUX2Presets.names("style_categories")
+                               for style in FLUX2Presets.get("style_categories", category, [])]))
+    if "camera" in dimensions:
+        axes.append(("camera", FLUX2Presets.names("camera_presets")))
+    if "mood" in dimensions:
+        axes.append(("mood", [FLUX2Presets.get("mood_presets", name, name)
+                              for name in FLUX2Presets.names("mood_presets")]))
+    if "palette" in dimensions:
+        axes.append(("palette", FLUX2Presets.names(
+            "palettes", builtin=FLUX2_ColorPalettePreset.PALETTE_PRESETS)))
+    if "position" in dimensions:
+        vocabulary = FLUX2Presets.POSITION_VOCABULARY
+        axes.extend((f"position_{part}", vocabulary[part])
+                    for part in ("horizontal", "vertical", "depth"))
+    return axes
+
+
+class VariationSampler:
+    """
+    Unique random combinations of preset values.
+    
+    The cartesian product of the preset axes is a lazy SweepSpace; sample k
+    of a seed is the combination at IndexPermutation(seed)[k]. Samples of
+    one seed never repeat until the whole space is exhausted, and any one
+    of them is reproducible from (seed, index) without drawing the others.
+    """
+    
+    def __init__(self, seed: int, dimensions=DIMENSIONS):
+        self.seed = seed
+        self.dimensions = tuple(name for name in DIMENSIONS if name in dimensions)
+        self.space = SweepSpace(preset_axes(self.dimensions))
+        self.permutation = IndexPermutation(len(self.space), seed)
+    
+    def __len__(self):
+        return len(self.space)
+    
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        item = self.space[self.permutation[index]]
+        sample: Dict[str, Any] = {name: None for name in DIMENSIONS}
+        for name in ("scene", "style", "mood"):
+            if name in item:
+                sample[name] = item[name]
+        if "camera" in item:
+            sample["camera"] = FLUX2Types.create_camera(
+                **FLUX2Presets.get("camera_presets", item["camera"]))
+        if "palette" in item:
+            sample["palette"] = list(FLUX2Presets.get(
+                "palettes", item["palette"], [], builtin=FLUX2_ColorPalettePreset.PALETTE_PRESETS))
+        if "position_horizontal" in item:
+            sample["position"] = ", ".join((item["position_horizontal"],
+                                            item["position_vertical"],
+                                            item["position_depth"]))
+        return sample
+    
+    def sample(self, start: int = 0, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """count samples from index start (all remaining when count is None)"""
+        stop = len(self) if count is None else min(len(self), start + count)
+        return [self[index] for index in range(start, stop)]
+
+
+class FLUX2_VariationSampler(FLUX2BaseNode):
+    """
+    Draw unique random combinations of scene, style, camera, mood,
+    palette and subject position presets from a seed.
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "seed": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 0xFFFFFFFFFFFFFFFF
+                }),
+                "count": ("INT", {
+                    "default": 8,
+                    "min": 1,
+                    "max": 4096,
+                    "step": 1
+                }),
+            },
+            "optional": {
+                "start_index": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 0x7FFFFFFF,
+                    "step": 1
+                }),
+                "vary_scene": ("BOOLEAN", {"default": True}),
+                "vary_style": ("BOOLEAN", {"default": True}),
+                "vary_camera": ("BOOLEAN", {"default": True}),
+                "vary_mood": ("BOOLEAN", {"default": True}),
+                "vary_palette": ("BOOLEAN", {"default": True}),
+                "vary_position": ("BOOLEAN", {"default": True}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "STRING", FLUX2Types.CAMERA_OBJECT, "STRING",
+                    FLUX2Types.COLOR_ARRAY, "STRING", "INT", "INT")
+    RETURN_NAMES = ("scene", "style", "camera", "mood", "color_palette", "position",
+                    "sample_index", "total_combinations")
+    OUTPUT_IS_LIST = (True, True, True, True, True, True, True, False)
+    FUNCTION = "sample_variations"
+    
+    CATEGORY = "FLUX2_Prompt_Builder/Core"
+    
+    def sample_variations(self,
+                          seed=0,
+                          count=8,
+                          start_index=0,
+                          vary_scene=True,
+                          vary_style=True,
+                          vary_camera=True,
+                          vary_mood=True,
+                          vary_palette=True,
+                          vary_position=True):
+        """
+        Draw count unique preset combinations for a seed.
+        
+        Args:
+            seed: Selects the random order of the combinations
+            count: Number of samples to draw
+            start_index: First sample index (continue an earlier draw)
+            vary_*: Include the dimension; disabled ones output ""/None
+        
+        Returns:
+            Tuple of (scenes, styles, cameras, moods, color_palettes,
+            positions, sample_indices, total_combinations)
+        """
+        enabled = {"scene": vary_scene, "style": vary_style, "camera": vary_camera,
+                   "mood": vary_mood, "palette": vary_palette, "position": vary_position}
+        sampler = VariationSampler(seed, [name for name in DIMENSIONS if enabled[name]])
+        stop = min(len(sampler), start_index + count)
+        indices = list(range(start_index, stop))
+        samples = [sampler[index] for index in indices]
+        
+        return ([sample["scene"] or "" for sample in samples],
+                [sample["style"] or "" for sample in samples],
+                [sample["camera"] for sample in samples],
+                [sample["mood"] or "" for sample in samples],
+                [sample["palette"] for sample in samples],
+                [sample["position"] or "" for sample in samples],
+                indices,
+                len(sampler))
+
+
+# For display in UI
+FLUX2_VariationSampler.DESCRIPTION = """
+Draw random, never-repeating combinations of the built-in presets:
+scene type, style, camera preset, mood, color palette and subject
+position (horizontal, vertical and depth vocabulary).
+
+The combinations of all enabled dimensions form one large virtual list
+(total_combinations) that is shuffled by seed without being built.
+Samples of a seed never repeat, and sample N of a seed is always the
+same combination, so a good variation can be recreated from its seed
+and sample_index alone. Raise start_index to continue a draw.
+
+Outputs are lists with one entry per sample; connect them to Prompt
+Assembler (and position to Subject Creator) to get one prompt each.
+"""
@@ -0,0 +1,409 @@
+"""
+Headless evaluator for the FLUX2 nodes of a ComfyUI workflow file
+
+Loads a saved workflow (the UI format with "nodes" and "links", or the API
+format exported with "Save (API)"), keeps the FLUX2 nodes and the links
+between them, and executes just those node classes in dependency order.
+No ComfyUI server, GPU or torch is needed, so CI and batch jobs can
+regenerate the prompts of workflows kept under version control.
+
+Inputs linked from nodes that cannot run headlessly (random text
+modifiers, image loaders, ...) fall back to the value saved in the
+file's widgets, or to overrides passed by the caller.
+
+Run with:
+    python -m nodes.workflow_eval examples/FLUX2-JSON-t2i-Akira-Plan-example-v12.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .base import FLUX2Types
+from .registry import NODE_CLASS_MAPPINGS
+
+logger = logging.getLogger(__name__)
+
+WIDGET_TYPES = {"INT", "FLOAT", "STRING", "BOOLEAN"}
+# Frontend-only nodes that forward a value without running on the server
+REROUTE_TYPES = {"Reroute"}
+PRIMITIVE_TYPES = {"PrimitiveNode"}
+# LiteGraph node modes
+MODE_ALWAYS = 0
+MODE_NEVER = 2
+MODE_BYPASS = 4
+
+
+class WorkflowError(ValueError):
+    """Raised when a workflow cannot be evaluated"""
+
+
+def widget_inputs(node_class) -> List[Tuple[str, str, Dict]]:
+    """
+    (name, type, options) of the inputs shown as widgets, in the order the
+    frontend stores their values in widgets_values. A combo's type is "COMBO".
+    """
+    widgets = []
+    input_types = node_class.INPUT_TYPES()
+    for section in ("required", "optional"):
+        for name, spec in input_types.get(section, {}).items():
+            kind = spec[0]
+            options = spec[1] if len(spec) > 1 else {}
+            if isinstance(kind, (list, tuple)):
+                widgets.append((name, "COMBO", dict(options, choices=list(kind))))
+            elif kind in WIDGET_TYPES:
+                widgets.append((name, kind, options))
+    return widgets
+
+
+def _stored_values(name: str, kind: str, options: Dict) -> int:
+    """Entries a widget takes in widgets_values (seeds carry a control value)"""
+    if kind == "INT" and (options.get("control_after_generate") or name in ("seed", "noise_seed")):
+        return 2
+    return 1
+
+
+def _fits(value: Any, kind: str, options: Dict) -> bool:
+    if kind == "COMBO":
+        return value in options["choices"]
+    if kind == "BOOLEAN":
+        return isinstance(value, bool)
+    if kind == "INT":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if kind == "FLOAT":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def map_widgets(node_class, values: List[Any]) -> Dict[str, Any]:
+    """
+    Input name -> value for a node's saved widgets_values.
+    
+    Values are positional, but workflows saved by an older version of a
+    node hold fewer or more values than it has widgets today, and some
+    frontends store stray values for widgets converted to inputs. Values
+    are therefore aligned in order with the widgets whose type accepts
+    them, matching as many as possible (positionally when all fit) and
+    leaving unmatched widgets at their defaults.
+    """
+    slots = []
+    for name, kind, options in widget_inputs(node_class):
+        slots.append((name, kind, options))
+        slots.extend([None] * (_stored_values(name, kind, options) - 1))
+    
+    def fits(i, j):
+        return slots[j] is None or _fits(values[i], *slots[j][1:])
+    
+    # best[i][j]: most values from values[i:] placed on slots[j:]
+    rows, columns = len(values), len(slots)
+    best = [[0] * (columns + 1) for _ in range(rows + 1)]
+    for i in range(rows - 1, -1, -1):
+        for j in range(columns - 1, -1, -1):
+            matched = best[i + 1][j + 1] + 1 if fits(i, j) else 0
+            best[i][j] = max(matched, best[i][j + 1], best[i + 1][j])
+    
+    mapped = {}
+    i = j = 0
+    while i < rows and j < columns:
+        if fits(i, j) and best[i][j] == best[i + 1][j + 1] + 1:
+            if slots[j] is not None:
+                mapped[slots[j][0]] = values[i]
+            i += 1
+            j += 1
+        elif best[i][j] == best[i][j + 1]:
+            j += 1
+        else:
+            i += 1
+    if best[0][0] < min(rows, columns):
+        logger.debug("Aligned %d of %d widget values of %s", best[0][0], rows, node_class.__name__)
+    return mapped
+
+
+class WorkflowNode:
+    """One node to execute: its class, widget values and incoming links"""
+    
+    __slots__ = ("id", "type", "mode", "widgets", "links")
+    
+    def __init__(self, node_id: str, node_type: str, mode: int = MODE_ALWAYS):
+        self.id = node_id
+        self.type = node_type
+        self.mode = mode
+        self.widgets: Dict[str, Any] = {}
+        # Input name -> (source node id, output slot)
+        self.links: Dict[str, Tuple[str, int]] = {}
+
+
+class Workflow:
+    """
+    The FLUX2 subgraph of a workflow, ready to execute.
+    
+    Nodes whose class is not a FLUX2 node are not run. Their outputs are
+    replaced by the saved widget value of the input they feed (or an
+    override), and the frontend-only Reroute and PrimitiveNode nodes are
+    resolved to the value they forward.
+    """
+    
+    def __init__(self, data: Mapping[str, Any], node_classes: Mapping[str, type] = NODE_CLASS_MAPPINGS):
+        self.node_classes = node_classes
+        self.nodes: Dict[str, WorkflowNode] = {}
+        if "nodes" in data and isinstance(data["nodes"], list):
+            self._load_ui(data)
+        else:
+            self._load_api(data)
+    
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "Workflow":
+        """Load a workflow JSON file"""
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise WorkflowError(f"{path} is not valid JSON: {e}") from e
+        return cls(data, **kwargs)
+    
+    def _load_ui(self, data):
+        saved = {str(node["id"]): node for node in data["nodes"]}
+        # link id -> (source node id, source slot)
+        sources = {}
+        for link in data.get("links") or []:
+            if isinstance(link, dict):
+                sources[link["id"]] = (str(link["origin_id"]), link["origin_slot"])
+            else:
+                sources[link[0]] = (str(link[1]), link[2])
+        
+        def resolve(link_id):
+            """Follow reroutes back to the node producing a link's value"""
+            seen = set()
+            while link_id in sources and link_id not in seen:
+                seen.add(link_id)
+                node_id, slot = sources[link_id]
+                node = saved.get(node_id)
+                if node is None or node["type"] not in REROUTE_TYPES:
+                    return node_id, slot
+                inputs = node.get("inputs") or []
+                link_id = inputs[0].get("link") if inputs else None
+            return None
+        
+        for node_id, node in saved.items():
+            if node["type"] not in self.node_classes:
+                continue
+            entry = WorkflowNode(node_id, node["type"], node.get("mode", MODE_ALWAYS))
+            values = node.get("widgets_values") or []
+            if isinstance(values, dict):
+                entry.widgets.update(values)
+            elif values:
+                entry.widgets.update(map_widgets(self.node_classes[node["type"]], values))
+            
+            for node_input in node.get("inputs") or []:
+                if node_input.get("link") is None:
+                    continue
+                source = resolve(node_input["link"])
+                if source is None:
+                    continue
+                source_node = saved.get(source[0])
+                if source_node is None:
+                    continue
+                if source_node["type"] in self.node_classes:
+                    entry.links[node_input["name"]] = source
+                elif source_node["type"] in PRIMITIVE_TYPES and source_node.get("widgets_values"):
+                    entry.widgets[node_input["name"]] = source_node["widgets_values"][0]
+                # Any other source keeps the widget value saved for the input
+            self.nodes[node_id] = entry
+    
+    def _load_api(self, data):
+        for node_id, node in data.items():
+            if not isinstance(node, Mapping) or node.get("class_type") not in self.node_classes:
+                continue
+            entry = WorkflowNode(str(node_id), node["class_type"])
+            for name, value in (node.get("inputs") or {}).items():
+                if (isinstance(value, list) and len(value) == 2 and isinstance(value[1], int)
+                        and not isinstance(value[1], bool)):
+                    source = data.get(str(value[0]))
+                    if isinstance(source, Mapping) and source.get("class_type") in self.node_classes:
+                        entry.links[name] = (str(value[0]), value[1])
+                else:
+                    entry.widgets[name] = value
+            self.nodes[entry.id] = entry
+    
+    def order(self) -> List[str]:
+        """Ids of the nodes to execute, each after the nodes it reads from"""
+        pending = {node_id: {source for source, _ in node.links.values() if source in self.nodes}
+                   for node_id, node in self.nodes.items()}
+        ordered = []
+        ready = sorted((node_id for node_id, sources in pending.items() if not sources), key=_id_key)
+        dependents: Dict[str, List[str]] = {}
+        for node_id, sources in pending.items():
+            for source in sources:
+                dependents.setdefault(source, []).append(node_id)
+        
+        while ready:
+            node_id = ready.pop(0)
+            ordered.append(node_id)
+            for dependent in sorted(dependents.get(node_id, ()), key=_id_key):
+                pending[dependent].discard(node_id)
+                if not pending[dependent]:
+                    ready.append(dependent)
+        
+        if len(ordered) != len(self.nodes):
+            cycle = sorted(set(self.nodes) - set(ordered), key=_id_key)
+            raise WorkflowError(f"Workflow has a cycle between nodes {', '.join(cycle)}")
+        return ordered
+    
+    def execute(self, overrides: Optional[Mapping[Any, Mapping[str, Any]]] = None) -> Dict[str, Tuple[List, ...]]:
+        """
+        Run the FLUX2 nodes.
+        
+        Args:
+            overrides: Optional {node id: {input name: value}} replacing saved
+                widget values or supplying inputs from nodes that are not run
+        
+        Returns:
+            Node id -> tuple with one list of values per output, as ComfyUI
+            keeps them (several values when a list output fans out)
+        """
+        overrides = {str(node_id): values for node_id, values in (overrides or {}).items()}
+        results: Dict[str, Tuple[List, ...]] = {}
+        
+        for node_id in self.order():
+            node = self.nodes[node_id]
+            node_class = self.node_classes[node.type]
+            if node.mode == MODE_NEVER:
+                continue
+            
+            inputs: Dict[str, List] = {name: [value] for name, value in node.widgets.items()}
+            for name, (source, slot) in node.links.items():
+                outputs = results.get(source)
+                if outputs is not None and slot < len(outputs):
+                    inputs[name] = outputs[slot]
+                else:
+                    # Source muted or bypassed: the input is left unconnected
+                    inputs.pop(name, None)
+            for name, value in overrides.get(node_id, {}).items():
+                inputs[name] = [value]
+            
+            if node.mode == MODE_BYPASS:
+                results[node_id] = self._bypass(node, inputs)
+                continue
+            
+            try:
+                results[node_id] = run_node(node_class, inputs)
+            except Exception as e:
+                raise WorkflowError(f"Node {node_id} ({node.type}) failed: {e}") from e
+        return results
+    
+    def _bypass(self, node: WorkflowNode, inputs: Mapping[str, List]) -> Tuple[List, ...]:
+        """A bypassed node passes the first linked input of each output's type through"""
+        outputs = []
+        for kind in self.node_classes[node.type].RETURN_TYPES:
+            passed = []
+            for name, (source, slot) in node.links.items():
+                source_types = self.node_classes[self.nodes[source].type].RETURN_TYPES
+                if name in inputs and slot < len(source_types) and source_types[slot] == kind:
+                    passed = inputs[name]
+                    break
+            outputs.append(passed)
+        return tuple(outputs)
+    
+    def prompts(self, results: Optional[Mapping[str, Tuple[List, ...]]] = None, **kwargs) -> List[Dict]:
+        """
+        Prompt dicts produced by the workflow: the FLUX2_JSON outputs of
+        nodes whose prompts are not consumed by another FLUX2 node, in
+        node id order.
+        """
+        if results is None:
+            results = self.execute(**kwargs)
+        consumed = {link for node in self.nodes.values() for link in node.links.values()}
+        prompts = []
+        for node_id in sorted(results, key=_id_key):
+            return_types = self.node_classes[self.nodes[node_id].type].RETURN_TYPES
+            for slot, kind in enumerate(return_types):
+                if (kind == FLUX2Types.JSON_OBJECT and (node_id, slot) not in consumed
+                        and slot < len(results[node_id])):
+                    prompts.extend(results[node_id][slot])
+        return prompts
+
+
+def _id_key(node_id: str):
+    return (0, int(node_id), "") if node_id.isdigit() else (1, 0, node_id)
+
+
+def run_node(node_class, inputs: Mapping[str, List]) -> Tuple[List, ...]:
+    """
+    Call a node the way ComfyUI does: once with whole lists when it sets
+    INPUT_IS_LIST, otherwise once per element of the longest input list
+    (shorter lists repeat their last value). Outputs flagged in
+    OUTPUT_IS_LIST are concatenated, the others collected per call.
+    """
+    instance = node_class()
+    function = getattr(instance, node_class.FUNCTION)
+    return_count = len(node_class.RETURN_TYPES)
+    output_is_list = getattr(node_class, "OUTPUT_IS_LIST", None) or (False,) * return_count
+    
+    if getattr(node_class, "INPUT_IS_LIST", False):
+        calls = [dict(inputs)]
+    else:
+        inputs = {name: values for name, values in inputs.items() if values}
+        count = max((len(values) for values in inputs.values()), default=1)
+        calls = [{name: values[min(i, len(values) - 1)] for name, values in inputs.items()}
+                 for i in range(count)]
+    
+    outputs: Tuple[List, ...] = tuple([] for _ in range(return_count))
+    for kwargs in calls:
+        result = function(**kwargs)
+        if isinstance(result, dict):
+            result = result.get("result", ())
+        for slot, value in enumerate(result[:return_count]):
+            if output_is_list[slot]:
+                outputs[slot].extend(value)
+            else:
+                outputs[slot].append(value)
+    return outputs
+
+
+def evaluate_workflow(path: str, overrides: Optional[Mapping[Any, Mapping[str, Any]]] = None) -> List[Dict]:
+    """Prompt dicts produced by the FLUX2 nodes of a workflow file"""
+    return Workflow.load(path).prompts(overrides=overrides)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Evaluate the FLUX2 nodes of ComfyUI workflow files "
+                                                 "and print the prompts they produce")
+    parser.add_argument("workflows", nargs="+", help="Workflow JSON files (UI or API format)")
+    parser.add_argument("--set", action="append", default=[], metavar="NODE.INPUT=VALUE",
+                        help="Override an input; VALUE is parsed as JSON when possible")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="One compact prompt per line instead of pretty-printed JSON")
+    args = parser.parse_args(argv)
+    
+    overrides: Dict[str, Dict[str, Any]] = {}
+    for item in args.set:
+        target, separator, value = item.partition("=")
+        node_id, dot, name = target.partition(".")
+        if not separator or not dot:
+            parser.error(f"--set expects NODE.INPUT=VALUE, got {item!r}")
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+        overrides.setdefault(node_id, {})[name] = value
+    
+    status = 0
+    for path in args.workflows:
+        try:
+            prompts = evaluate_workflow(path, overrides)
+        except (OSError, WorkflowError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        for prompt in prompts:
+            if args.jsonl:
+                print(json.dumps(prompt, ensure_ascii=False, separators=(",", ":")))
+            else:
+                print(json.dumps(prompt, ensure_ascii=False, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Test script for the command-line batch generator
+"""
+
+import csv
+import gzip
+import json
+import os
+import tempfile
+
+from nodes.batch_generate import RowMapper, flatten_row, generate, iter_rows, main
+
+ROWS = [
+    {"scene.scene_type": "Urban Street", "scene.time_of_day": "Night",
+     "subject.description": "Red motorcycle", "subject.color_1": "#ff0000",
+     "subject2.description": "Rider", "camera.preset": "Portrait", "camera.lens_mm": "85",
+     "mood": "Tense", "color_palette": "red; #00f", "notes": "ignored"},
+    {"scene.scene_type": "", "scene.time_of_day": "", "subject.description": "Lighthouse",
+     "subject.color_1": "", "subject2.description": "", "camera.preset": "", "camera.lens_mm": "",
+     "mood": "", "color_palette": "", "notes": ""},
+]
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_prompts(lines):
+    return [json.loads(line) for chunk in lines for line in chunk]
+
+
+def test_row_mapping():
+    """Columns map onto node inputs with widget types applied"""
+    print("=== Testing Batch Generate - Column Mapping ===\n")
+    
+    mapper = RowMapper(list(ROWS[0]))
+    assert mapper.ignored == ["notes"]
+    inputs = mapper.node_inputs(ROWS[0])
+    assert inputs[("camera", 0)] == {"preset": "Portrait", "lens_mm": 85}
+    assert inputs[("subject", 1)] == {"description": "Red motorcycle", "color_1": "#ff0000"}
+    assert ("subject", 2) in inputs and ("scene", 0) in inputs
+    assert mapper.node_inputs(ROWS[1]) == {("subject", 1): {"description": "Lighthouse"}}
+    
+    prompts = read_prompts(lines for lines, _ in generate(ROWS))
+    first, second = prompts
+    assert [subject["description"] for subject in first["subjects"]] == ["Red motorcycle", "Rider"]
+    assert first["subjects"][0]["color_palette"] == ["#FF0000"]
+    assert first["color_palette"] == ["#FF0000", "#0000FF"]
+    assert first["camera"]["lens-mm"] == 85 and first["mood"] == "Tense"
+    assert "night" in first["scene"].lower()
+    assert second == {"subjects": [{"description": "Lighthouse"}]}
+    print(f"  {len(prompts)} prompts, first has {len(first)} fields\n")
+
+
+def test_jsonl_rows_and_errors():
+    """Nested JSON rows are flattened; bad rows are reported, not fatal"""
+    print("=== Testing Batch Generate - JSON Lines ===\n")
+    
+    row = {"scene": "Harbor at dawn", "subjects": [{"description": "Boat"}, {"description": "Gull"}],
+           "camera": {"preset": "Landscape", "iso": 100}}
+    assert flatten_row(row) == {"scene": "Harbor at dawn", "subject1.description": "Boat",
+                                "subject2.description": "Gull", "camera.preset": "Landscape",
+                                "camera.iso": 100}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rows.jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(row) + "\n\n")
+            f.write(json.dumps({"camera": {"lens_mm": "wide"}}) + "\n")
+            f.write(json.dumps({"mood": "Calm"}) + "\n")
+        rows = list(iter_rows(path))
+    assert len(rows) == 3
+    
+    results = list(generate(rows, chunk_rows=2))
+    assert [len(lines) for lines, _ in results] == [1, 1]
+    assert results[0][1] and results[0][1][0].startswith("row 2:")
+    prompts = read_prompts(lines for lines, _ in results)
+    assert prompts[0]["scene"] == "Harbor at dawn" and prompts[1] == {"mood": "Calm"}
+    print(f"  Error reported: {results[0][1][0]}\n")
+
+
+def test_process_pool_keeps_order():
+    """Output order is the input order whatever the number of workers"""
+    print("=== Testing Batch Generate - Process Pool ===\n")
+    
+    rows = [{"subject.description": f"Subject {i}", "mood": f"Mood {i % 7}"} for i in range(300)]
+    serial = [line for lines, _ in generate(rows, workers=1, chunk_rows=16) for line in lines]
+    pooled = [line for lines, _ in generate(iter(rows), workers=2, chunk_rows=16) for line in lines]
+    assert pooled == serial
+    assert json.loads(serial[-1])["subjects"][0]["description"] == "Subject 299"
+    print(f"  {len(pooled)} prompts identical across 1 and 2 workers\n")
+
+
+def test_command_line():
+    """CLI reads CSV files and writes (compressed) JSON Lines"""
+    print("=== Testing Batch Generate - CLI ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "rows.csv")
+        output = os.path.join(tmp, "prompts.jsonl.gz")
+        write_csv(source, ROWS)
+        assert main([source, source, "-o", output, "--workers", "1"]) == 0
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            prompts = [json.loads(line) for line in f]
+    assert len(prompts) == 4
+    assert prompts[2] == prompts[0]
+    print(f"  CLI wrote {len(prompts)} prompts\n")
+
+
+def run_all_tests():
+    """Run all batch generator tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Batch Generate - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_row_mapping()
+    test_jsonl_rows_and_errors()
+    test_process_pool_keeps_order()
+    test_command_line()
+    
+    print("=" * 60)
+    print("All batch generator tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
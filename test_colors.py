@@ -0,0 +1,90 @@
+"""
+Test script for the shared color normalization engine
+"""
+
+from nodes import colors
+from nodes.base import FLUX2BaseNode
+from nodes.color_palette import FLUX2_ColorPalette, FLUX2_ColorPalettePreset
+from nodes.subject_creator import FLUX2_SubjectCreator
+
+
+def test_normalize_color():
+    """Hex codes, shorthand and CSS names normalize to #RRGGBB"""
+    print("=== Testing Colors - Normalization ===\n")
+    
+    cases = {
+        "#ff0000": "#FF0000",
+        "  00ff00 ": "#00FF00",
+        "#f0a": "#FF00AA",
+        "abc": "#AABBCC",
+        "red": "#FF0000",
+        "Dark Slate Gray": "#2F4F4F",
+        "light_goldenrod-yellow": "#FAFAD2",
+        "RebeccaPurple": "#663399",
+        "#red": None,
+        "#GGGGGG": None,
+        "12345": None,
+        "warm beige": None,
+        "": None,
+    }
+    for value, expected in cases.items():
+        assert colors.normalize_color(value) == expected, value
+    assert colors.normalize_color(None) is None
+    assert colors.normalize_hex("navy") is None
+    assert len(colors.CSS_COLORS) == 148
+    print(f"  {len(cases)} cases normalized\n")
+
+
+def test_normalize_colors_batch():
+    """Batches skip blanks and report unrecognized entries by position"""
+    print("=== Testing Colors - Batch ===\n")
+    
+    values = ["#FFF", "", "navy", "   ", "warm beige", None, "#12"]
+    normalized, unknown = colors.normalize_colors(values)
+    assert normalized == ["#FFFFFF", "#000080"]
+    assert unknown == [(5, "warm beige"), (7, "#12")]
+    
+    kept, _ = colors.normalize_colors(values, keep_unknown=True)
+    assert kept == ["#FFFFFF", "#000080", "warm beige", "#12"]
+    print(f"  {normalized} + unknown {unknown}\n")
+
+
+def test_nodes_use_engine():
+    """Palette and subject nodes produce normalized colors"""
+    print("=== Testing Colors - Nodes ===\n")
+    
+    palette, preview = FLUX2_ColorPalette().create_palette(
+        color_1="f00", color_2="teal", color_3="not a color")
+    assert palette == ["#FF0000", "#008080"]
+    assert "Color 3: 'not a color' (invalid)" in preview
+    
+    (subject,) = FLUX2_SubjectCreator().create_subject(
+        description="Cat", color_1="#abc", color_2="Navy", color_3="soft ginger")
+    assert subject["color_palette"] == ["#AABBCC", "#000080", "soft ginger"]
+    
+    preset, _ = FLUX2_ColorPalettePreset().load_preset("Earth Tones")
+    assert preset == FLUX2_ColorPalettePreset.PALETTE_PRESETS["Earth Tones"]
+    
+    assert FLUX2BaseNode.validate_hex_color("#fff")
+    assert not FLUX2BaseNode.validate_hex_color("red")
+    assert FLUX2BaseNode.format_hex_color("fff") == "#FFFFFF"
+    print(f"  {palette} / {subject['color_palette']}\n")
+
+
+def run_all_tests():
+    """Run all color tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Colors - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_normalize_color()
+    test_normalize_colors_batch()
+    test_nodes_use_engine()
+    
+    print("=" * 60)
+    print("All color tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,147 @@
+"""
+Test script for the HTTP batch assembly endpoint
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from nodes import http_api
+from nodes.batch_generate import PromptBuilder, flatten_row
+from nodes.http_api import ROUTE, STREAM_MIN, assemble_stream, create_app, register_routes
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestClient, TestServer
+except ImportError:
+    web = None
+
+
+def make_specs(count):
+    return [{"scene": f"Photo studio, set {index}",
+             "style": "Film noir",
+             "subjects": [{"description": f"Detective {index}", "position": "left"}],
+             "camera": {"preset": "Portrait"}}
+            for index in range(count)]
+
+
+def collect(specs, **kwargs):
+    async def run():
+        return b"".join([piece async for piece in assemble_stream(specs, **kwargs)])
+    return json.loads(run_async(run()))
+
+
+def run_async(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_stream_matches_batch_builder():
+    """Streamed prompts equal batch_generate's, in order, with errors by index"""
+    print("=== Testing HTTP Assemble - Stream Body ===\n")
+    
+    specs = make_specs(40)
+    specs[7] = ["not", "an", "object"]
+    specs[21] = {"camera": {"lens_mm": "wide"}}
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        body = collect(specs, executor=executor, workers=3, chunk_specs=4)
+    
+    builder = PromptBuilder()
+    assert len(body["prompts"]) == 40
+    assert body["prompts"][0] == json.loads(builder.build(flatten_row(specs[0])))
+    assert body["prompts"][39]["scene"].endswith("set 39")
+    assert body["prompts"][7] is None and body["prompts"][21] is None
+    assert [error["index"] for error in body["errors"]] == [7, 21]
+    assert "expected a JSON object" in body["errors"][0]["error"]
+    
+    assert collect([]) == {"prompts": [], "errors": []}
+    print("  40 specs in order, 2 errors reported\n")
+
+
+def test_unknown_keys():
+    """Keys matching no node input fail their spec; layouts are cached boundedly"""
+    print("=== Testing HTTP Assemble - Unknown Keys ===\n")
+    
+    specs = [{"scene": "Studio", f"extra_{index}": "x"} for index in range(PromptBuilder.CACHE_SIZE + 50)]
+    specs.append({"scene": "Studio", "camera": {"lens_size": 85}})
+    _, errors = http_api.assemble_chunk(0, specs)
+    assert len(errors) == len(specs)
+    assert errors[0] == {"index": 0, "error": "Unknown keys: extra_0"}
+    assert errors[-1]["error"] == "Unknown keys: camera.lens_size"
+    assert len(http_api._local.builder._mappers) == PromptBuilder.CACHE_SIZE
+    print(f"  {len(errors)} unknown-key specs reported\n")
+
+
+def test_http_route():
+    """The aiohttp stand-in answers small and streamed batches"""
+    print("=== Testing HTTP Assemble - Route ===\n")
+    
+    if web is None:
+        print("  aiohttp not installed, skipped\n")
+        return
+    
+    async def run():
+        async with TestClient(TestServer(create_app())) as client:
+            response = await client.post(ROUTE, json=make_specs(3))
+            assert response.status == 200
+            small = await response.json()
+            assert "chunked" not in response.headers.get("Transfer-Encoding", "")
+            
+            response = await client.post(ROUTE, json=make_specs(STREAM_MIN + 10))
+            assert response.status == 200
+            assert response.headers.get("Transfer-Encoding") == "chunked"
+            large = await response.json()
+            
+            bad = await client.post(ROUTE, json={"scene": "not a list"})
+            invalid = await client.post(ROUTE, data=b"[{")
+            return small, large, bad.status, invalid.status
+    
+    # Parse every body on the thread pool
+    inline_max = http_api.PARSE_INLINE_MAX
+    http_api.PARSE_INLINE_MAX = 0
+    try:
+        small, large, bad, invalid = run_async(run())
+    finally:
+        http_api.PARSE_INLINE_MAX = inline_max
+    assert len(small["prompts"]) == 3 and small["errors"] == []
+    assert len(large["prompts"]) == STREAM_MIN + 10
+    assert large["prompts"][STREAM_MIN]["scene"].endswith(f"set {STREAM_MIN}")
+    assert bad == 400 and invalid == 400
+    print(f"  {STREAM_MIN + 10} prompts streamed\n")
+
+
+def test_register_routes():
+    """Routes are added to a given table; without ComfyUI nothing happens"""
+    print("=== Testing HTTP Assemble - Registration ===\n")
+    
+    if web is None:
+        assert register_routes() is False
+        print("  aiohttp not installed, skipped\n")
+        return
+    
+    routes = web.RouteTableDef()
+    assert register_routes(routes)
+    assert [(route.method, route.path) for route in routes] == [("POST", ROUTE)]
+    assert register_routes() is False
+    assert http_api.AssembleHandler().workers == http_api.WORKERS
+    
+    # Without aiohttp the standalone server fails with the same clear error
+    http_api.web = None
+    try:
+        for start in (create_app, lambda: http_api.main([])):
+            try:
+                start()
+            except ImportError as e:
+                assert "aiohttp is required" in str(e)
+            else:
+                raise AssertionError("expected ImportError")
+    finally:
+        http_api.web = web
+    print("  Route added to the table\n")
+
+
+if __name__ == "__main__":
+    test_stream_matches_batch_builder()
+    test_unknown_keys()
+    test_http_route()
+    test_register_routes()
+    print("All HTTP assemble tests passed!")
@@ -0,0 +1,79 @@
+"""
+Test script for palette extraction from IMAGE batches
+"""
+
+from nodes import image_palette
+from nodes.image_palette import FLUX2_ImagePalette, extract_palette
+
+np = image_palette.np
+
+
+def striped_image(colors, height=64, width=96):
+    """[1, H, W, 3] float image of equal-width vertical stripes"""
+    image = np.zeros((1, height, width, 3), dtype=np.float32)
+    stripe = width // len(colors)
+    for i, color in enumerate(colors):
+        rgb = [int(color[j:j + 2], 16) / 255.0 for j in (1, 3, 5)]
+        image[0, :, i * stripe:(i + 1) * stripe] = rgb
+    return image
+
+
+def test_extracts_dominant_colors():
+    """Flat color regions come back exactly, largest share first"""
+    print("=== Testing Image Palette - Dominant Colors ===\n")
+    
+    if np is None:
+        print("  numpy not installed, skipping\n")
+        return
+    colors = ["#FF0000", "#00FF00", "#0000FF"]
+    image = striped_image(colors)
+    image[0, :, :48] = [1.0, 0.0, 0.0]  # Red covers half, green a sixth
+    expected = ["#FF0000", "#0000FF", "#00FF00"]
+    
+    for method in ("median_cut", "kmeans"):
+        palette = extract_palette(image, num_colors=3, method=method)
+        assert [code for code, _ in palette] == expected, (method, palette)
+        assert abs(palette[0][1] - 0.5) < 1e-6
+        assert abs(sum(share for _, share in palette) - 1.0) < 1e-6
+    
+    # Fewer distinct colors than requested returns only those
+    assert [code for code, _ in extract_palette(image, num_colors=8)] == expected
+    print(f"  {palette}\n")
+
+
+def test_node_downsamples_batches():
+    """Large batches are strided to max_pixels and still cover every image"""
+    print("=== Testing Image Palette - Node ===\n")
+    
+    if np is None:
+        print("  numpy not installed, skipping\n")
+        return
+    first = striped_image(["#112233"], height=1080, width=1920)
+    second = striped_image(["#FFEEDD"], height=1080, width=1920)
+    batch = np.concatenate([first, second])
+    
+    pixels = image_palette.sample_pixels(batch, max_pixels=4096)
+    assert 2048 <= len(pixels) <= 4096
+    
+    colors, info = FLUX2_ImagePalette().extract_palette(batch, num_colors=4, max_pixels=4096)
+    assert sorted(colors) == ["#112233", "#FFEEDD"]
+    assert "(50%)" in info
+    print(f"  {len(pixels)} sampled pixels -> {colors}\n")
+
+
+def run_all_tests():
+    """Run all image palette tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Image Palette - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_extracts_dominant_colors()
+    test_node_downsamples_batches()
+    
+    print("=" * 60)
+    print("All image palette tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
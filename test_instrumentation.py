@@ -0,0 +1,113 @@
+"""
+Test script for optional node execution metrics
+"""
+
+import json
+import os
+import tempfile
+
+from nodes import instrumentation
+from nodes.instrumentation import MetricsRegistry, instrument
+from nodes.scene_builder import FLUX2_SceneBuilder
+
+
+class TimedNode:
+    """Plain node class, so FLUX2_METRICS in the environment cannot pre-wrap it"""
+    
+    RETURN_TYPES = ("STRING", "DICT")
+    FUNCTION = "run"
+    
+    def run(self, text="", fail=False):
+        if fail:
+            raise ValueError("requested failure")
+        return (text, {"text": text})
+
+
+class TimedChild(TimedNode):
+    """Inherits the wrapped function; recorded under its own name"""
+
+
+def test_disabled_by_default():
+    """Without FLUX2_METRICS node functions are not wrapped"""
+    print("=== Testing Instrumentation - Disabled ===\n")
+    
+    if instrumentation.ENABLED:
+        print("  FLUX2_METRICS is set in this environment, skipping\n")
+        return
+    assert not hasattr(FLUX2_SceneBuilder.build_scene, "__flux2_instrumented__")
+    print("  Node functions untouched\n")
+
+
+def test_records_calls_and_errors():
+    """Calls, errors, latency and output size are recorded per node"""
+    print("=== Testing Instrumentation - Recording ===\n")
+    
+    registry = MetricsRegistry()
+    instrument(TimedNode, registry)
+    instrument(TimedNode, registry)  # Wrapping twice is a no-op
+    node = TimedNode()
+    
+    assert node.run(text="hello") == ("hello", {"text": "hello"})
+    TimedChild().run(text="child")
+    try:
+        node.run(fail=True)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    
+    nodes = registry.snapshot()["nodes"]
+    assert nodes["TimedNode"]["calls"] == 2
+    assert nodes["TimedNode"]["errors"] == 1
+    assert nodes["TimedNode"]["latency_seconds"]["count"] == 2
+    # "hello" (5) + '{"text": "hello"}' (17)
+    assert nodes["TimedNode"]["output_bytes"]["sum"] == 22
+    assert nodes["TimedChild"]["calls"] == 1
+    print(f"  Recorded {sum(n['calls'] for n in nodes.values())} calls\n")
+
+
+def test_export_formats():
+    """Snapshots export as Prometheus text or JSON depending on extension"""
+    print("=== Testing Instrumentation - Export ===\n")
+    
+    registry = MetricsRegistry()
+    registry.record("FLUX2_Test", 0.002, 300)
+    registry.record("FLUX2_Test", 0.2, 5000)
+    
+    text = registry.to_prometheus()
+    assert 'flux2_node_calls_total{node="FLUX2_Test"} 2' in text
+    assert 'flux2_node_latency_seconds_bucket{node="FLUX2_Test",le="0.0025"} 1' in text
+    assert 'flux2_node_latency_seconds_bucket{node="FLUX2_Test",le="+Inf"} 2' in text
+    assert 'flux2_node_output_bytes_count{node="FLUX2_Test"} 2' in text
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "metrics.json")
+        registry.write(json_path)
+        with open(json_path, encoding="utf-8") as handle:
+            snapshot = json.load(handle)
+        assert snapshot["nodes"]["FLUX2_Test"]["output_bytes"]["buckets"]["+Inf"] == 2
+        
+        prom_path = os.path.join(tmp, "metrics.prom")
+        registry.write(prom_path)
+        with open(prom_path, encoding="utf-8") as handle:
+            assert handle.read() == text
+    print("  Prometheus and JSON snapshots written\n")
+
+
+def run_all_tests():
+    """Run all instrumentation tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Instrumentation - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_disabled_by_default()
+    test_records_calls_and_errors()
+    test_export_formats()
+    
+    print("=" * 60)
+    print("All instrumentation tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
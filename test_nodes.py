@@ -255,6 +255,70 @@ def test_prompt_assembler():
     print("✓ PromptAssembler tests passed!")
 
 
+def test_is_changed_fingerprint():
+    """Test content fingerprints used by IS_CHANGED"""
+    print("\n" + "="*60)
+    print("Testing IS_CHANGED Fingerprints")
+    print("="*60)
+    
+    camera_a = {"angle": "Eye level", "lens-mm": 85}
+    camera_b = {"lens-mm": 85, "angle": "Eye level"}
+    
+    # Same content in a different key order gives the same fingerprint
+    first = FLUX2_PromptAssembler.IS_CHANGED(scene="Studio", camera=camera_a)
+    second = FLUX2_PromptAssembler.IS_CHANGED(camera=camera_b, scene="Studio")
+    assert first == second
+    print(f"✓ Stable fingerprint: {first[:16]}...")
+    
+    # Changed content gives a new fingerprint
+    changed = FLUX2_PromptAssembler.IS_CHANGED(scene="Office", camera=camera_a)
+    assert changed != first
+    print("✓ Content changes are detected")
+    
+    # Subject order is significant
+    subject_1 = {"description": "Mug"}
+    subject_2 = {"description": "Laptop"}
+    ordered = FLUX2_SubjectArray.IS_CHANGED(subject_1=subject_1, subject_2=subject_2)
+    swapped = FLUX2_SubjectArray.IS_CHANGED(subject_1=subject_2, subject_2=subject_1)
+    assert ordered != swapped
+    print("✓ Subject order is part of the fingerprint")
+    
+    # Opt-in refresh always reports a change (NaN never equals itself)
+    refresh = FLUX2_PromptAssembler.IS_CHANGED(scene="Studio", always_refresh=True)
+    assert refresh != refresh
+    print("✓ always_refresh forces re-execution")
+    
+    print("✓ IS_CHANGED fingerprint tests passed!")
+
+
+def test_input_types_cache():
+    """Test cached INPUT_TYPES and invalidation on preset changes"""
+    print("\n" + "="*60)
+    print("Testing INPUT_TYPES Cache")
+    print("="*60)
+    
+    # Repeated calls return the cached table
+    first = FLUX2_StyleSelector.INPUT_TYPES()
+    assert FLUX2_StyleSelector.INPUT_TYPES() is first
+    assert FLUX2_SceneBuilder.INPUT_TYPES() is FLUX2_SceneBuilder.INPUT_TYPES()
+    print("✓ INPUT_TYPES built once per class")
+    
+    # Changing a preset table and marking it rebuilds the dropdowns
+    FLUX2Presets.SCENE_TYPES["Test Hangar"] = "Aircraft hangar with polished floor"
+    try:
+        FLUX2Presets.mark_changed()
+        options = FLUX2_SceneBuilder.INPUT_TYPES()["required"]["scene_type"][0]
+        assert "Test Hangar" in options
+        assert FLUX2_StyleSelector.INPUT_TYPES() is not first
+        print("✓ Preset changes invalidate the cache")
+    finally:
+        del FLUX2Presets.SCENE_TYPES["Test Hangar"]
+        FLUX2Presets.mark_changed()
+    assert "Test Hangar" not in FLUX2_SceneBuilder.INPUT_TYPES()["required"]["scene_type"][0]
+    
+    print("✓ INPUT_TYPES cache tests passed!")
+
+
 def test_base_utilities():
     """Test base class utilities"""
     print("\n" + "="*60)
@@ -342,6 +406,8 @@ def run_all_tests():
         test_subject_array()
         test_camera_rig()
         test_prompt_assembler()
+        test_is_changed_fingerprint()
+        test_input_types_cache()
         
         print("\n" + "="*60)
         print("✓ ALL TESTS PASSED!")
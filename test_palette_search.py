@@ -0,0 +1,191 @@
+"""
+Test script for perceptual nearest-palette search
+"""
+
+import random
+
+from nodes.base import FLUX2Presets
+from nodes.color_palette import FLUX2_ColorPalettePreset, FLUX2_NearestPalette
+from nodes.colors import delta_e_76, delta_e_2000, hex_to_lab
+from nodes import palette_search
+from nodes.palette_search import LabKDTree, PaletteIndex, palette_distance, preset_palette_index
+
+
+def test_color_difference():
+    """Lab conversion and CIEDE2000 match published reference values"""
+    print("=== Testing Palette Search - Color Difference ===\n")
+    
+    # Sharma, Wu and Dalal (2005) test pairs
+    pairs = [
+        ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+        ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0009), 7.1792),
+        ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+        ((90.8027, -2.0831, 1.4410), (91.1528, -1.6435, 0.0447), 1.4441),
+    ]
+    for first, second, expected in pairs:
+        assert abs(delta_e_2000(first, second) - expected) < 1e-4
+        assert abs(delta_e_2000(second, first) - expected) < 1e-4
+    
+    L, a, b = hex_to_lab("#FF0000")
+    assert abs(L - 53.24) < 0.01 and abs(a - 80.09) < 0.01 and abs(b - 67.20) < 0.01
+    assert hex_to_lab("#FFFFFF")[0] > 99.99
+    print("  Reference pairs reproduced\n")
+
+
+def test_kdtree_matches_brute_force():
+    """KD-tree k-nearest queries agree with a linear scan"""
+    print("=== Testing Palette Search - KD-tree ===\n")
+    
+    rng = random.Random(7)
+    points = [(rng.uniform(0, 100), rng.uniform(-90, 90), rng.uniform(-90, 90))
+              for _ in range(3000)]
+    tree = LabKDTree(points)
+    for _ in range(25):
+        target = (rng.uniform(0, 100), rng.uniform(-90, 90), rng.uniform(-90, 90))
+        expected = sorted(range(len(points)),
+                          key=lambda i: delta_e_76(points[i], target))[:10]
+        assert [index for _, index in tree.nearest(target, 10)] == expected
+    assert len(LabKDTree(points[:3]).nearest(points[0], 10)) == 3
+    print(f"  {len(points)} points, 25 queries agree\n")
+
+
+def test_search_finds_exact_nearest():
+    """The top CIE76 result equals the brute-force nearest palette"""
+    print("=== Testing Palette Search - Index ===\n")
+    
+    rng = random.Random(11)
+    random_color = lambda: "#%06X" % rng.randrange(1 << 24)
+    palettes = {f"Palette {i}": [random_color() for _ in range(rng.randint(2, 6))]
+                for i in range(300)}
+    palettes["Empty"] = ["not a color"]
+    index = PaletteIndex(palettes)
+    assert len(index) == 300
+    
+    for _ in range(20):
+        query = [random_color() for _ in range(4)]
+        labs = [hex_to_lab(code) for code in query]
+        expected = min(palettes, key=lambda name: palette_distance(
+            labs, [hex_to_lab(code) for code in palettes[name]], delta_e_76)
+            if name != "Empty" else float("inf"))
+        assert index.search(query, top_k=1, metric="CIE76")[0][0] == expected
+    
+    matches = index.search(palettes["Palette 42"], top_k=3)
+    assert matches[0] == ("Palette 42", 0.0)
+    assert [distance for _, distance in matches] == sorted(distance for _, distance in matches)
+    assert index.search(["nothing"]) == []
+    print(f"  {len(index)} palettes, exact nearest found\n")
+
+
+def test_vectorized_rerank():
+    """NumPy scoring gives the same matches as the Python one"""
+    print("=== Testing Palette Search - Vectorized Scoring ===\n")
+    
+    np = palette_search.np
+    if np is None:
+        print("  numpy not installed, skipped\n")
+        return
+    
+    rng = random.Random(5)
+    labs = [(rng.uniform(0, 100), rng.uniform(-128, 127), rng.uniform(-128, 127))
+            for _ in range(400)] + [(50.0, 0.0, 0.0), (0.0, 0.0, 0.0)]
+    vectorized = palette_search.delta_e_2000_array(labs[:-1], labs[1:])
+    for (first, second), value in zip(zip(labs, labs[1:]), vectorized):
+        assert abs(delta_e_2000(first, second) - value) < 1e-9
+    
+    random_color = lambda: "#%06X" % rng.randrange(1 << 24)
+    index = PaletteIndex({f"Palette {i}": [random_color() for _ in range(rng.randint(1, 6))]
+                          for i in range(500)})
+    queries = [[random_color() for _ in range(rng.randint(1, 5))] for _ in range(20)]
+    fast = [index.search(query, top_k=4, metric=metric)
+            for query in queries for metric in ("CIEDE2000", "CIE76")]
+    palette_search.np = None
+    try:
+        slow = [index.search(query, top_k=4, metric=metric)
+                for query in queries for metric in ("CIEDE2000", "CIE76")]
+    finally:
+        palette_search.np = np
+    for first, second in zip(fast, slow):
+        assert [name for name, _ in first] == [name for name, _ in second]
+        assert all(abs(a - b) < 1e-9 for (_, a), (_, b) in zip(first, second))
+    print(f"  {len(fast)} searches agree\n")
+
+
+def test_ciede2000_against_brute_force():
+    """CIEDE2000 results are true distances; near matches equal a full scan"""
+    print("=== Testing Palette Search - CIEDE2000 Accuracy ===\n")
+    
+    rng = random.Random(13)
+    random_color = lambda: "#%06X" % rng.randrange(1 << 24)
+    palettes = {f"Palette {i}": [random_color() for _ in range(rng.randint(2, 5))]
+                for i in range(150)}
+    index = PaletteIndex(palettes)
+    labs = {name: [hex_to_lab(code) for code in colors] for name, colors in palettes.items()}
+    
+    def scan(query):
+        query = [hex_to_lab(code) for code in query]
+        return min((palette_distance(query, palette), name) for name, palette in labs.items())
+    
+    def nudge(code):
+        return "#%06X" % (int(code[1:], 16) ^ rng.choice((0x010000, 0x000100, 0x000001)))
+    
+    near = [[nudge(code) for code in palettes[name]] for name in rng.sample(list(palettes), 15)]
+    far = [[random_color() for _ in range(4)] for _ in range(15)]
+    hits = 0
+    for query in near + far:
+        name, distance = index.search(query, top_k=3)[0]
+        query_labs = [hex_to_lab(code) for code in query]
+        assert abs(distance - palette_distance(query_labs, labs[name])) < 1e-9
+        expected_distance, expected = scan(query)
+        assert distance >= expected_distance - 1e-9
+        hits += name == expected
+        if query in near:
+            assert name == expected
+    # Far from every palette the CIE76 shortlist can miss the CIEDE2000 nearest
+    assert hits >= 27
+    print(f"  {hits}/{len(near + far)} nearest palettes match a full scan\n")
+
+
+def test_nearest_palette_node():
+    """The node matches built-in presets and follows preset changes"""
+    print("=== Testing FLUX2_NearestPalette ===\n")
+    
+    node = FLUX2_NearestPalette()
+    metrics = FLUX2_NearestPalette.INPUT_TYPES()["required"]["metric"][0]
+    assert metrics == list(palette_search.METRICS)
+    colors, name, matches = node.find_nearest(top_k=2, colors="#FF4400, gold\ntomato")
+    assert name == "Sunset Warm"
+    assert colors == FLUX2_ColorPalettePreset.PALETTE_PRESETS["Sunset Warm"]
+    assert matches.splitlines()[1].startswith("  1. Sunset Warm")
+    
+    _, name, _ = node.find_nearest(color_palette=["#000080", "#4169E1"], metric="CIE76")
+    assert name == "Ocean Blues"
+    assert node.find_nearest() == ([], "", "No valid colors provided")
+    
+    builtin = FLUX2_ColorPalettePreset.PALETTE_PRESETS
+    index = preset_palette_index(builtin)
+    assert preset_palette_index(builtin) is index
+    FLUX2Presets.mark_changed()
+    assert preset_palette_index(builtin) is not index
+    print(f"  {matches.splitlines()[1].strip()}\n")
+
+
+def run_all_tests():
+    """Run all palette search tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Palette Search - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_color_difference()
+    test_kdtree_matches_brute_force()
+    test_search_finds_exact_nearest()
+    test_vectorized_rerank()
+    test_ciede2000_against_brute_force()
+    test_nearest_palette_node()
+    
+    print("=" * 60)
+    print("All palette search tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
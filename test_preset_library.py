@@ -0,0 +1,176 @@
+"""
+Test script for external preset library directories
+"""
+
+import json
+import os
+import tempfile
+
+from nodes.base import FLUX2Presets
+from nodes.camera_rig import FLUX2_CameraPreset
+from nodes.color_palette import FLUX2_ColorPalettePreset
+from nodes.preset_library import INDEX_FILENAME, PresetLibrary, scan_offsets
+from nodes.scene_builder import FLUX2_SceneBuilder
+
+
+def write_json(path, data, **kwargs):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, **kwargs)
+
+
+def test_scan_offsets():
+    """Offsets point at the exact bytes of each value, including non-ASCII text"""
+    print("=== Testing Preset Offset Scanner ===\n")
+    
+    data = {"Café": "Parisian café terrace ☕", "Plain": ["a", {"b": 1}], "Empty": {}}
+    raw = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    offsets = scan_offsets(raw)
+    
+    assert list(offsets) == list(data)
+    for name, (offset, length) in offsets.items():
+        assert json.loads(raw[offset:offset + length]) == data[name]
+    assert scan_offsets(b" {} ") == {}
+    print(f"  {len(offsets)} values located by byte range\n")
+
+
+def test_lazy_index_and_override():
+    """Names come from the sidecar index; later roots override earlier ones"""
+    print("=== Testing PresetLibrary - Index and Override ===\n")
+    
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        write_json(os.path.join(first, "scene_types", "house.json"),
+                   {"Loft": "Converted warehouse loft", "Rooftop": "City rooftop at dusk"})
+        write_json(os.path.join(second, "scene_types", "override.json"),
+                   {"Rooftop": "Rooftop garden with string lights"})
+        
+        library = PresetLibrary(roots=[first, second], watch_interval=0)
+        assert library.names("scene_types") == ["Loft", "Rooftop"]
+        assert library.get("scene_types", "Rooftop") == "Rooftop garden with string lights"
+        assert library.get("scene_types", "Missing", "fallback") == "fallback"
+        assert library.names("palettes") == []
+        
+        sidecar = os.path.join(first, "scene_types", INDEX_FILENAME)
+        with open(sidecar, encoding="utf-8") as handle:
+            index = json.load(handle)
+        assert set(index["files"]["house.json"]["entries"]) == {"Loft", "Rooftop"}
+        
+        # A fresh library reuses the sidecar instead of rescanning the file
+        fresh = PresetLibrary(roots=[first], watch_interval=0)
+        assert fresh.get("scene_types", "Loft") == "Converted warehouse loft"
+        print("  Index written and reused; later roots win\n")
+
+
+def test_refresh_detects_changes():
+    """Editing a file invalidates the index and notifies listeners"""
+    print("=== Testing PresetLibrary - Change Detection ===\n")
+    
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "mood_presets", "moods.json")
+        write_json(path, {"Brooding": "Dark and brooding"})
+        
+        library = PresetLibrary(roots=[root], watch_interval=0)
+        changes = []
+        library.on_change(lambda: changes.append(1))
+        assert library.names("mood_presets") == ["Brooding"]
+        assert not library.refresh()
+        
+        write_json(path, {"Brooding": "Dark and brooding", "Hopeful": "Light and hopeful"})
+        os.utime(path, ns=(0, 1))
+        assert library.refresh()
+        assert changes == [1]
+        assert library.names("mood_presets") == ["Brooding", "Hopeful"]
+        print("  Edited file picked up after refresh\n")
+
+
+def test_watcher_needs_files():
+    """The polling watcher starts only when a preset directory holds files"""
+    print("=== Testing PresetLibrary - Watcher ===\n")
+    
+    with tempfile.TemporaryDirectory() as root:
+        os.makedirs(os.path.join(root, "scene_types"))
+        library = PresetLibrary(roots=[root], watch_interval=60)
+        assert library.names("scene_types") == []
+        assert library._watcher is None
+        
+        write_json(os.path.join(root, "scene_types", "house.json"), {"Loft": "Brick loft"})
+        library.invalidate()
+        try:
+            assert library.names("scene_types") == ["Loft"]
+            assert library._watcher is not None
+        finally:
+            library.stop_watcher()
+        print("  Watcher started once files exist\n")
+
+
+def test_invalid_preset_shape():
+    """Presets of the wrong type are reported with their file"""
+    print("=== Testing PresetLibrary - Validation ===\n")
+    
+    with tempfile.TemporaryDirectory() as root:
+        write_json(os.path.join(root, "palettes", "bad.json"), {"Broken": "#FF0000"})
+        library = PresetLibrary(roots=[root], watch_interval=0)
+        try:
+            library.get("palettes", "Broken")
+        except ValueError as e:
+            assert "bad.json" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+        print("  Wrong preset type rejected\n")
+
+
+def test_nodes_use_library():
+    """Library presets appear in node dropdowns and resolve at execution"""
+    print("=== Testing Nodes with Preset Library ===\n")
+    
+    original = FLUX2Presets.library
+    with tempfile.TemporaryDirectory() as root:
+        write_json(os.path.join(root, "scene_types", "house.json"),
+                   {"Greenhouse": "Victorian glass greenhouse"})
+        write_json(os.path.join(root, "camera_presets", "house.json"),
+                   {"Portrait": {"angle": "House portrait angle", "lens-mm": 105}})
+        write_json(os.path.join(root, "palettes", "brand.json"),
+                   {"Brand": ["#112233", "#445566"]})
+        
+        FLUX2Presets.library = PresetLibrary(roots=[root], watch_interval=0)
+        FLUX2Presets.mark_changed()
+        try:
+            scene_options = FLUX2_SceneBuilder.INPUT_TYPES()["required"]["scene_type"][0]
+            assert scene_options[-1] == "Greenhouse"
+            assert "Studio" in scene_options
+            
+            palette_options = FLUX2_ColorPalettePreset.INPUT_TYPES()["required"]["preset"][0]
+            assert palette_options[0] == "Vibrant Primary" and palette_options[-1] == "Brand"
+            colors, _ = FLUX2_ColorPalettePreset().load_preset(preset="Brand")
+            assert colors == ["#112233", "#445566"]
+            
+            # House files override built-ins of the same name
+            camera, = FLUX2_CameraPreset().load_preset(preset="Portrait")
+            assert camera["angle"] == "House portrait angle"
+            assert camera["lens-mm"] == 105
+            print(f"  {len(scene_options)} scene types, house presets resolved\n")
+        finally:
+            FLUX2Presets.library = original
+            FLUX2Presets.mark_changed()
+
+
+def run_all_tests():
+    """Run all preset library tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Preset Library - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_scan_offsets()
+    test_lazy_index_and_override()
+    test_refresh_detects_changes()
+    test_watcher_needs_files()
+    test_invalid_preset_shape()
+    test_nodes_use_library()
+    
+    print("=" * 60)
+    print("All preset library tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,150 @@
+"""
+Test script for the persistent assembled-prompt cache
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+
+from nodes import prompt_cache
+from nodes.base import FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.prompt_cache import PromptCache
+
+
+def prompt_inputs(index=0):
+    return dict(scene=f"Harbor at dawn, pier {index}",
+                subjects=[FLUX2Types.create_subject(f"Fisherman {index}", "left side", "hauling nets")],
+                style="Oil painting",
+                camera=FLUX2Types.create_camera(angle="Eye level", lens_mm=50))
+
+
+def write_entries(path, worker, count):
+    cache = PromptCache(path)
+    for index in range(count):
+        key = cache.key(worker=worker, index=index)
+        cache.put(key, f'{{"worker": {worker}, "index": {index}}}', {"worker": worker, "index": index})
+        assert cache.get(key) is not None
+    cache.close()
+
+
+def test_hits_survive_restart():
+    """Entries and counters outlive the cache object that wrote them"""
+    print("=== Testing PromptCache - Persistence ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache", "prompts.db")
+        cache = PromptCache(path)
+        key = cache.key(**prompt_inputs())
+        assert key == cache.key(**dict(reversed(list(prompt_inputs().items()))))
+        assert key != cache.key(**prompt_inputs(1))
+        assert cache.get(key) is None
+        
+        json_string, prompt = FLUX2_PromptAssembler().assemble_prompt(**prompt_inputs())
+        cache.put(key, json_string, prompt)
+        cache.close()
+        
+        reopened = PromptCache(path)
+        assert reopened.get(key) == (json_string, prompt)
+        stats = reopened.stats()
+        assert stats["entries"] == 1 and stats["bytes"] > len(json_string)
+        assert stats["process"]["hits"] == 1 and stats["process"]["misses"] == 0
+        assert stats["total"]["hits"] == 1 and stats["total"]["misses"] == 1
+        assert stats["total"]["writes"] == 1 and stats["hit_rate"] == 0.5
+        reopened.clear()
+        assert reopened.get(key) is None and reopened.stats()["entries"] == 0
+        reopened.close()
+        print("  Hit after reopen; counters totalled across instances\n")
+
+
+def test_eviction():
+    """Old entries expire; the least recently used go when over size"""
+    print("=== Testing PromptCache - Eviction ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PromptCache(os.path.join(tmp, "prompts.db"), max_age=60)
+        cache.put("old", "{}", {})
+        cache._connect().execute("UPDATE prompts SET created = ? WHERE key = 'old'", (time.time() - 120,))
+        assert cache.get("old") is None
+        assert cache.stats()["process"]["expired"] == 1
+        cache.close()
+        
+        cache = PromptCache(os.path.join(tmp, "sized.db"), max_bytes=10_000, max_age=0)
+        payload = "x" * 900
+        for index in range(10):
+            cache.put(f"key{index}", payload, {})
+        # key0 is older than the rest but was just used, so it is kept
+        cache._connect().execute("UPDATE prompts SET accessed = accessed - 1000")
+        cache._connect().execute("UPDATE prompts SET accessed = ? WHERE key = 'key0'", (time.time(),))
+        for index in range(10, 14):
+            cache.put(f"key{index}", payload, {})
+        cache.evict()
+        stats = cache.stats()
+        assert stats["bytes"] <= 9_000 and stats["process"]["evictions"] >= 4
+        assert cache.get("key0") is not None and cache.get("key13") is not None
+        assert cache.get("key1") is None
+        cache.close()
+        print(f"  {stats['entries']} entries, {stats['bytes']} bytes after eviction\n")
+
+
+def test_concurrent_processes():
+    """Several processes write to one cache file without losing entries"""
+    print("=== Testing PromptCache - Multiple Processes ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prompts.db")
+        workers = [multiprocessing.Process(target=write_entries, args=(path, worker, 50))
+                   for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+        
+        cache = PromptCache(path)
+        stats = cache.stats()
+        assert stats["entries"] == 200
+        assert stats["total"]["writes"] == 200 and stats["total"]["hits"] == 200
+        assert cache.get(cache.key(worker=3, index=49)) == ('{"worker": 3, "index": 49}',
+                                                            {"worker": 3, "index": 49})
+        cache.close()
+        print("  200 entries from 4 processes\n")
+
+
+def test_assembler_uses_cache():
+    """With the cache enabled a repeated prompt is read back, not rebuilt"""
+    print("=== Testing PromptCache - Prompt Assembler ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = prompt_cache._shared, prompt_cache._configured
+        os.environ["FLUX2_PROMPT_CACHE"] = os.path.join(tmp, "prompts.db")
+        prompt_cache._configured = False
+        try:
+            cache = prompt_cache.prompt_cache()
+            assert cache is not None and cache.path.startswith(tmp)
+            expected = FLUX2_PromptAssembler().assemble_prompt(**prompt_inputs())
+            
+            # A new node instance, as after a restart
+            assert FLUX2_PromptAssembler().assemble_prompt(**prompt_inputs()) == expected
+            compact = FLUX2_PromptAssembler().assemble_prompt(pretty_print=False, **prompt_inputs())
+            assert compact[1] == expected[1] and compact[0] != expected[0]
+            stats = cache.stats()["process"]
+            assert stats["hits"] == 1 and stats["misses"] == 2 and stats["writes"] == 2
+            cache.close()
+            
+            os.environ["FLUX2_PROMPT_CACHE"] = "0"
+            prompt_cache._configured = False
+            assert prompt_cache.prompt_cache() is None
+        finally:
+            del os.environ["FLUX2_PROMPT_CACHE"]
+            prompt_cache._shared, prompt_cache._configured = saved
+        print("  Second run answered from the cache\n")
+
+
+if __name__ == "__main__":
+    test_hits_survive_restart()
+    test_eviction()
+    test_concurrent_processes()
+    test_assembler_uses_cache()
+    print("All prompt cache tests passed!")
@@ -0,0 +1,145 @@
+"""
+Test script for duplicate and near-duplicate prompt removal
+"""
+
+import json
+import random
+
+from nodes import prompt_dedup
+from nodes.prompt_dedup import (FLUX2_PromptDedup, MinHasher, PromptDeduplicator,
+                                canonical_text, lsh_bands)
+from nodes.prompt_sweep import FLUX2_PromptSweep
+
+HARBOR = ("A quiet harbor at dawn with fishing boats resting on calm water, gulls circling "
+          "above weathered wooden piers while mist lifts slowly from the bay")
+
+
+def test_exact_duplicates():
+    """Whitespace, key order and empty fields do not make prompts distinct"""
+    print("=== Testing Prompt Dedup - Exact ===\n")
+    
+    prompt = {"scene": HARBOR, "style": "Oil painting",
+              "subjects": [{"description": "Old fisherman", "position": "left"}]}
+    variants = [
+        {"style": "Oil  painting ", "subjects": [{"position": "left", "description": "Old fisherman"}],
+         "scene": HARBOR, "mood": ""},
+        json.dumps(prompt, indent=2),
+        dict(prompt, camera={}, color_palette=[]),
+    ]
+    assert len({canonical_text(variant) for variant in variants + [prompt]}) == 1
+    
+    dedup = PromptDeduplicator()
+    assert dedup.check(prompt) is None
+    assert [dedup.check(variant) for variant in variants] == ["exact"] * 3
+    assert dedup.check(dict(prompt, style="Watercolor")) is None
+    assert dedup.unique == 2 and dedup.exact_duplicates == 3
+    print(f"  {dedup.summary().splitlines()[0]}\n")
+
+
+def test_near_duplicates():
+    """MinHash/LSH drops prompts above the similarity threshold only"""
+    print("=== Testing Prompt Dedup - Near Duplicates ===\n")
+    
+    bands, rows = lsh_bands(64, 0.85)
+    assert bands * rows == 64 and abs((1 / bands) ** (1 / rows) - 0.85) < 0.1
+    hasher = MinHasher(num_perm=256)
+    first = hasher.signature("one two three four five six seven eight nine ten")
+    second = hasher.signature("one two three four five six seven eight nine eleven")
+    # 7 of 9 word trigrams shared: Jaccard 7/9 = 0.78
+    assert abs(MinHasher.similarity(first, second) - 7 / 9) < 0.1
+    
+    dedup = PromptDeduplicator(near_duplicates=True, threshold=0.75, num_perm=128)
+    base = {"scene": HARBOR, "style": "Oil painting with rich colors and texture"}
+    assert dedup.check(base) is None
+    assert dedup.check(dict(base, scene=HARBOR.replace("gulls", "seagulls"))) == "near"
+    assert dedup.check(dict(base, scene="A busy night market in Tokyo with neon signs")) is None
+    assert dedup.near_duplicates_found == 1
+    print(f"  {dedup.summary().splitlines()[-1]}\n")
+
+
+def test_minhash_estimates():
+    """Seeded permutations give unbiased Jaccard estimates, with or without NumPy"""
+    print("=== Testing Prompt Dedup - MinHash Estimates ===\n")
+    
+    rng = random.Random(3)
+    words = [f"w{index}" for index in range(2000)]
+    hasher = MinHasher(num_perm=256)
+    errors = []
+    for changed in range(0, 40, 2):
+        base = rng.sample(words, 60)
+        other = base[:60 - changed] + rng.sample([w for w in words if w not in base], changed)
+        # 58 trigrams each, 58 - changed of them shared
+        jaccard = (58 - changed) / (58 + changed)
+        estimate = MinHasher.similarity(hasher.signature(" ".join(base)),
+                                        hasher.signature(" ".join(other)))
+        errors.append(abs(estimate - jaccard))
+    assert max(errors) < 0.12 and sum(errors) / len(errors) < 0.04
+    
+    np = prompt_dedup.np
+    text = " ".join(words[:50])
+    prompt_dedup.np = None
+    try:
+        assert MinHasher(num_perm=64).signature(text) == MinHasher(num_perm=64).signature(text)
+        python_signature = MinHasher(num_perm=64).signature(text)
+    finally:
+        prompt_dedup.np = np
+    assert MinHasher(num_perm=64).signature(text) == python_signature
+    print(f"  Mean error {sum(errors) / len(errors):.3f} over {len(errors)} pairs\n")
+
+
+def test_window_bounds_memory():
+    """With a window only the most recent unique prompts are remembered"""
+    print("=== Testing Prompt Dedup - Window ===\n")
+    
+    dedup = PromptDeduplicator(near_duplicates=True, window=10)
+    prompts = [{"scene": f"Prompt {i} with words {i * 7} {i * 13} {i * 31}"} for i in range(50)]
+    dedup.check({"scene": "first prompt, soon forgotten"})
+    kept = list(dedup.filter(prompts))
+    assert len(kept) == 50
+    assert len(dedup._digests) == len(dedup._signatures) == 10
+    assert sum(len(bucket) for band in dedup._buckets for bucket in band.values()) == 10 * dedup.bands
+    assert dedup.check({"scene": "first prompt, soon forgotten"}) is None
+    print(f"  {len(kept)} kept, {len(dedup._digests)} remembered\n")
+
+
+def test_dedup_node_with_sweep():
+    """Duplicates produced by a sweep are removed, order preserved"""
+    print("=== Testing FLUX2_PromptDedup ===\n")
+    
+    _, objects, total = FLUX2_PromptSweep().sweep_prompts(
+        scene_values="Harbor\nHarbor \nMarket", style_values="Oil painting\nOil  painting")
+    assert total == 6
+    
+    strings, kept, count, report = FLUX2_PromptDedup().dedupe_prompts(
+        [objects], pretty_print=(False,))
+    assert count == 2
+    assert [prompt["scene"] for prompt in kept] == ["Harbor", "Market"]
+    assert json.loads(strings[1]) == kept[1]
+    assert "Exact duplicates removed: 4" in report
+    
+    # With a window of one, only the previous unique prompt is remembered
+    _, kept, count, _ = FLUX2_PromptDedup().dedupe_prompts(
+        [[{"scene": "A"}, {"scene": "B"}, {"scene": "A"}, {"scene": "A"}]], window=(1,))
+    assert [prompt["scene"] for prompt in kept] == ["A", "B", "A"]
+    print(f"  {report.splitlines()[0]}\n")
+
+
+def run_all_tests():
+    """Run all prompt dedup tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Prompt Dedup - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_exact_duplicates()
+    test_near_duplicates()
+    test_minhash_estimates()
+    test_window_bounds_memory()
+    test_dedup_node_with_sweep()
+    
+    print("=" * 60)
+    print("All prompt dedup tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
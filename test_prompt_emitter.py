@@ -0,0 +1,190 @@
+"""
+Test script for the single-pass prompt emitter
+"""
+
+import random
+
+from nodes import serialization
+from nodes.base import FLUX2BaseNode
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.base import FLUX2Types
+from nodes.prompt_emitter import (IncrementalEmitter, PromptEmitter, PROMPT_FIELDS, TEXT_FIELDS,
+                                   build_prompt_dict)
+
+
+def legacy_assemble(fields, pretty):
+    """The original build dict -> remove_empty_fields -> json.dumps path"""
+    prompt = FLUX2BaseNode.remove_empty_fields(build_prompt_dict(fields))
+    return serialization.dumps(prompt, pretty=pretty, backend="json"), prompt
+
+
+def random_value(rng, depth=0):
+    choice = rng.randint(0, 9 if depth < 3 else 5)
+    if choice == 0:
+        return None
+    if choice == 1:
+        return rng.choice(["", "   ", "x", "café \"quoted\"\n", " padded "])
+    if choice == 2:
+        return rng.choice([0, -5, True, False, 1.5, 2 ** 40])
+    if choice == 3:
+        return []
+    if choice == 4:
+        return {}
+    if choice == 5:
+        return f"text {rng.randint(0, 9)}"
+    if choice in (6, 7):
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    if choice == 8:
+        return [{f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 3))}
+                for _ in range(rng.randint(0, 3))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def test_emitter_matches_legacy_path():
+    """Randomized prompts produce identical text and dicts"""
+    print("=== Testing PromptEmitter Equivalence ===\n")
+    
+    rng = random.Random(2024)
+    emitters = {True: PromptEmitter(pretty=True), False: PromptEmitter(pretty=False)}
+    for _ in range(2000):
+        fields = {}
+        for name in PROMPT_FIELDS:
+            if rng.random() < 0.6:
+                if name in TEXT_FIELDS:
+                    fields[name] = rng.choice(["", "  ", "value", " padded "])
+                else:
+                    fields[name] = random_value(rng)
+        for pretty, emitter in emitters.items():
+            assert emitter.emit(**fields) == legacy_assemble(fields, pretty), fields
+    print("  2000 random prompts match in both layouts\n")
+
+
+def test_emitter_fallback():
+    """Values outside the fast path still match via the generic path"""
+    print("=== Testing PromptEmitter Fallback ===\n")
+    
+    fields = {"scene": " Studio ", "camera": {1: "numeric key", "angle": ""}}
+    for pretty in (True, False):
+        assert PromptEmitter(pretty).emit(**fields) == legacy_assemble(fields, pretty)
+    print("  Non-string keys handled by the generic path\n")
+
+
+def test_assembler_output_unchanged():
+    """Assembler output is the same with every serialization backend"""
+    print("=== Testing Assembler Output ===\n")
+    
+    fields = dict(
+        scene=" Studio ",
+        subjects=[{"description": "Mug", "position": "", "color_palette": ["#000000"]},
+                  {"description": "   "}],
+        style="Photorealistic",
+        mood="",
+        camera={"angle": "Eye level", "lens-mm": 85, "focus": None},
+    )
+    assembler = FLUX2_PromptAssembler()
+    try:
+        for backend in serialization.BACKENDS:
+            serialization.set_backend(backend)
+            for pretty in (True, False):
+                result = assembler.assemble_prompt(pretty_print=pretty, **fields)
+                assert result == legacy_assemble(fields, pretty), backend
+            print(f"  {backend}: identical output")
+    finally:
+        serialization.set_backend(None)
+    print()
+
+
+def test_incremental_emitter_matches_full_encode():
+    """Reused fragments never go stale, including after in-place edits"""
+    print("=== Testing IncrementalEmitter Equivalence ===\n")
+    
+    rng = random.Random(7)
+    emitters = {True: IncrementalEmitter(pretty=True), False: IncrementalEmitter(pretty=False)}
+    fields = {"scene": "Studio",
+              "subjects": [{"description": f"Subject {i}", "position": "left"} for i in range(5)],
+              "camera": {"angle": "Eye level"}}
+    for step in range(1500):
+        name = rng.choice(PROMPT_FIELDS)
+        action = rng.random()
+        subjects = fields.get("subjects")
+        if name == "subjects" and type(subjects) is list and subjects and action < 0.5:
+            # Edit, replace, drop or add one subject in place
+            index = rng.randrange(len(subjects))
+            if action < 0.2 and type(subjects[index]) is dict:
+                subjects[index]["action"] = random_value(rng, 2)
+            elif action < 0.3:
+                subjects[index] = FLUX2Types.create_subject(f"Record {step}", rng.choice(["", "right"]))
+            elif action < 0.4:
+                del subjects[index]
+            else:
+                subjects.insert(index, {"description": rng.choice(["", f"Added {step}"])})
+        elif name == "camera" and type(fields.get("camera")) is dict and action < 0.5:
+            fields["camera"]["lens-mm"] = random_value(rng, 1)
+        elif name in TEXT_FIELDS:
+            fields[name] = rng.choice(["", "  ", "value", f" step {step} "])
+        else:
+            fields[name] = random_value(rng)
+        for pretty, emitter in emitters.items():
+            assert emitter.emit(**fields) == legacy_assemble(fields, pretty), fields
+    
+    hits = sum(emitter.hits for emitter in emitters.values())
+    misses = sum(emitter.misses for emitter in emitters.values())
+    assert hits > misses
+    print(f"  1500 edits match in both layouts ({hits} fragments reused, {misses} encoded)\n")
+
+
+def test_assembler_reuses_fragments():
+    """Re-running the assembler with one changed field re-encodes only that field"""
+    print("=== Testing Assembler Fragment Reuse ===\n")
+    
+    assembler = FLUX2_PromptAssembler()
+    subjects = [FLUX2Types.create_subject(f"Subject {i}", "center") for i in range(50)]
+    camera = {"angle": "Low angle", "lens-mm": 35}
+    assembler.assemble_prompt(scene="Harbor at dawn", subjects=subjects, camera=camera)
+    emitter = assembler.incremental_emitter(True)
+    misses = emitter.misses
+    
+    fields = dict(scene="Harbor at dusk", subjects=subjects, camera=camera, pretty_print=True)
+    result = assembler.assemble_prompt(**fields)
+    assert emitter.misses == misses + 1
+    assert result == legacy_assemble(fields, True)
+    
+    # Mutating a dict input in place is noticed
+    camera["lens-mm"] = 85
+    result = assembler.assemble_prompt(**fields)
+    assert result[1]["camera"]["lens-mm"] == 85
+    assert result == legacy_assemble(fields, True)
+    
+    # Numbers of another type encode differently and are not reused
+    camera["lens-mm"] = 85.0
+    assert '"lens-mm": 85.0' in assembler.assemble_prompt(**fields)[0]
+    
+    # The returned object is the caller's own
+    result[1]["camera"]["angle"] = "Edited"
+    result[1]["subjects"][0]["description"] = "Edited"
+    assert assembler.assemble_prompt(**fields) == legacy_assemble(fields, True)
+    print("  Only the changed scene and camera were re-encoded\n")
+
+
+def test_incremental_type_changes():
+    """Equal values of a different type are re-encoded, also inside containers"""
+    print("=== Testing IncrementalEmitter Type Changes ===\n")
+    
+    emitter = IncrementalEmitter(pretty=False)
+    for first, second in [({"iso": 1}, {"iso": True}), ({"lens-mm": 85}, {"lens-mm": 85.0}),
+                          ({"f": 0.0}, {"f": -0.0}), ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+                          ([{"k": [1, 2]}], [{"k": [1, 2.0]}])]:
+        for camera in (first, second):
+            fields = {"scene": "Studio", "camera": camera, "subjects": [{"description": "x"}]}
+            assert emitter.emit(**fields) == legacy_assemble(fields, False), camera
+    print("  Type-changed values re-encoded\n")
+
+
+if __name__ == "__main__":
+    test_emitter_matches_legacy_path()
+    test_emitter_fallback()
+    test_assembler_output_unchanged()
+    test_incremental_emitter_matches_full_encode()
+    test_assembler_reuses_fragments()
+    test_incremental_type_changes()
+    print("All emitter tests passed!")
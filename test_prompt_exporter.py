@@ -0,0 +1,106 @@
+"""
+Test script for FLUX2_PromptExporter and the JSONLWriter
+"""
+
+import gzip
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+from nodes import prompt_exporter
+from nodes.prompt_exporter import FLUX2_PromptExporter, JSONLWriter
+from nodes.prompt_sweep import FLUX2_PromptSweep
+
+
+def read_lines(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle]
+
+
+def test_writer_streams_in_chunks():
+    """Records are flushed in bounded chunks and read back in order"""
+    print("=== Testing JSONLWriter - Chunked Writes ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prompts.jsonl")
+        records = ({"scene": f"Scene {i}", "mood": "Calm"} for i in range(2500))
+        
+        with JSONLWriter(path, chunk_records=100) as writer:
+            writer.write_many(records)
+            # Never more than one chunk held in memory
+            assert len(writer._lines) < 100
+        
+        lines = read_lines(path)
+        assert len(lines) == writer.records_written == 2500
+        assert lines[0] == {"scene": "Scene 0", "mood": "Calm"}
+        assert lines[-1]["scene"] == "Scene 2499"
+        print(f"  Wrote and read back {len(lines)} records\n")
+
+
+def test_writer_gzip_append():
+    """Compressed chunks append as valid gzip members"""
+    print("=== Testing JSONLWriter - Gzip Append ===\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "prompts.jsonl.gz")
+        with JSONLWriter(path, compress=True, chunk_records=7) as writer:
+            writer.write_many({"index": i} for i in range(20))
+        with JSONLWriter(path, compress=True, append=True) as writer:
+            # Pretty-printed json_string input is compacted to one line
+            writer.write('{\n  "index": 20,\n  "note": "café"\n}')
+        
+        lines = read_lines(path)
+        assert [line["index"] for line in lines] == list(range(21))
+        assert lines[-1]["note"] == "café"
+        print(f"  {len(lines)} records across appended gzip members\n")
+
+
+def test_exporter_node_with_sweep():
+    """Node writes every prompt from a sweep list in one call"""
+    print("=== Testing FLUX2_PromptExporter ===\n")
+    
+    _, json_objects, total = FLUX2_PromptSweep().sweep_prompts(
+        scene_values="Studio\nOffice\nKitchen",
+        mood_values="Calm\nBold"
+    )
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Stand-in for ComfyUI's folder_paths module
+        original = prompt_exporter.folder_paths
+        prompt_exporter.folder_paths = SimpleNamespace(get_output_directory=lambda: tmp)
+        try:
+            path = os.path.join(tmp, "sweep.jsonl")
+            node = FLUX2_PromptExporter()
+            result = node.export_prompts(json_object=[json_objects], filename=["sweep.jsonl"],
+                                         append=[False])
+            file_path, count = result["result"]
+            assert file_path == path
+            assert count == total == 6
+            assert read_lines(path) == json_objects
+            
+            # Replacing rather than appending
+            node.export_prompts(json_object=[json_objects[0]], filename=[path], append=[False])
+            assert read_lines(path) == [json_objects[0]]
+            
+            # Paths leading out of the output directory are rejected
+            assert node.resolve_path("runs/../a.jsonl") == os.path.join(tmp, "a.jsonl")
+            for outside in ("../escape.jsonl", "runs/../../escape.jsonl",
+                            os.path.join(os.path.dirname(tmp), "escape.jsonl")):
+                try:
+                    node.resolve_path(outside)
+                except ValueError as e:
+                    assert "outside the output directory" in str(e)
+                else:
+                    raise AssertionError(f"{outside} was accepted")
+        finally:
+            prompt_exporter.folder_paths = original
+        print(f"  {result['ui']['text'][0]}\n")
+
+
+if __name__ == "__main__":
+    test_writer_streams_in_chunks()
+    test_writer_gzip_append()
+    test_exporter_node_with_sweep()
+    print("All exporter tests passed!")
@@ -0,0 +1,170 @@
+"""
+Test script for the compiled FLUX2 schema validator
+"""
+
+import json
+import random
+
+from nodes.base import FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.prompt_schema import (FLUX2_PromptValidator, FLUX2_SCHEMA, FLUX2_STRICT_SCHEMA,
+                                 PromptValidationError, SchemaError, SchemaValidator,
+                                 prompt_validator)
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+
+def test_valid_prompts():
+    """Assembler output, records and JSON text are valid"""
+    print("=== Testing Schema Validator - Valid Prompts ===\n")
+    
+    validator = prompt_validator()
+    json_string, prompt = FLUX2_PromptAssembler().assemble_prompt(
+        scene="Studio",
+        subjects=[FLUX2Types.create_subject("Mug", "center", color_palette=["#000000"])],
+        color_palette=["#FFFFFF", "warm white"],
+        camera=FLUX2Types.create_camera(angle="Eye level", lens_mm=85, f_number="f/2.0", iso=200))
+    assert validator.is_valid(prompt) and validator.is_valid(json_string)
+    assert validator.errors({}) == []
+    # Records are checked without converting them to dicts
+    assert validator.is_valid({"subjects": [FLUX2Types.create_subject("Mug", "left")],
+                               "camera": FLUX2Types.create_camera(lens_mm=50)})
+    assert validator.validate(prompt) is prompt
+    # Every field is optional, a subject's description included, unless strict
+    subjects_only = {"subjects": [{"position": "left", "pose": "seated"}]}
+    assert validator.is_valid(subjects_only)
+    assert prompt_validator(strict=True).errors(subjects_only) == [
+        "subjects[0].description: required field is missing"]
+    print("  Assembled prompts pass\n")
+
+
+def test_errors_have_paths():
+    """Every problem is reported with the path of the offending field"""
+    print("=== Testing Schema Validator - Errors ===\n")
+    
+    validator = prompt_validator(strict=True)
+    errors = validator.errors({
+        "scene": 5,
+        "subjects": [{"description": "ok"}, {"position": "left", "color_palette": "#FF0000"}],
+        "colour_palette": ["#000000"],
+        "camera": {"lens-mm": "85mm", "ISO": 0, "flash": True},
+    })
+    assert errors == [
+        "scene: expected string, got number",
+        "subjects[1].color_palette: expected array, got string",
+        "subjects[1].description: required field is missing",
+        "colour_palette: unknown field",
+        "camera.lens-mm: expected number, got string",
+        "camera.ISO: must be > 0",
+        "camera.flash: unknown field",
+    ], errors
+    assert validator.errors("[1, 2]") == ["prompt: expected object, got array"]
+    assert validator.errors("{'scene': 1}")[0].startswith("prompt: invalid JSON")
+    try:
+        validator.validate({"camera": {"ISO": True}})
+        assert False, "booleans are not numbers"
+    except PromptValidationError as e:
+        assert e.errors == ["camera.ISO: expected number, got boolean"]
+    
+    try:
+        SchemaValidator({"type": "object", "patternProperties": {}})
+        assert False, "unsupported keywords are rejected when compiling"
+    except SchemaError:
+        pass
+    for line in errors:
+        print(f"  {line}")
+    print()
+
+
+def test_batch_report():
+    """Batches keep per-record errors and count problems across records"""
+    print("=== Testing Schema Validator - Batches ===\n")
+    
+    prompts = [{"scene": "ok"}, {"camera": {"lens-mm": "50"}}, '{"scene": "text"}',
+               {"subjects": [{"pose": "x"}, {"pose": "y"}]}, {"camera": {"lens-mm": "35"}}]
+    report = prompt_validator(strict=True).validate_batch(prompts)
+    assert (report.total, report.valid, report.invalid) == (5, 2, 3)
+    assert sorted(report.errors) == [1, 3, 4]
+    assert report.errors[3] == ["subjects[0].description: required field is missing",
+                                "subjects[1].description: required field is missing"]
+    # Counted once per record, with array indices folded together
+    assert report.problems["camera.lens-mm: expected number, got string"] == 2
+    assert report.problems["subjects[].description: required field is missing"] == 1
+    
+    # Reports can be extended chunk by chunk, keeping absolute positions
+    report = prompt_validator(strict=True).validate_batch(prompts[:2])
+    prompt_validator(strict=True).validate_batch(prompts[2:], report)
+    assert report.total == 5 and sorted(report.errors) == [1, 3, 4]
+    print(report.summary())
+    print()
+
+
+def test_validator_node():
+    """The node drops, keeps or stops on invalid prompts"""
+    print("=== Testing FLUX2_PromptValidator Node ===\n")
+    
+    node = FLUX2_PromptValidator()
+    good = {"scene": "Harbor"}
+    text = "\n".join([json.dumps({"style": "Film"}), json.dumps({"mood": 3}), "not json"])
+    
+    strings, objects, valid_count, report = node.validate_prompts(
+        on_invalid=["drop"], json_object=[good, {"scene": ["x"]}], json_text=[text], pretty_print=[False])
+    assert objects == [good, {"style": "Film"}] and valid_count == 2
+    assert strings == ['{"scene": "Harbor"}', '{"style": "Film"}']
+    assert "invalid: 3" in report
+    
+    _, objects, _, _ = node.validate_prompts(on_invalid=["keep"], json_text=[json.dumps([good, {"mood": 3}])])
+    assert objects == [good, {"mood": 3}]
+    
+    nameless = {"subjects": [{"position": "left"}]}
+    _, objects, _, _ = node.validate_prompts(json_object=[nameless])
+    assert objects == [nameless]
+    _, objects, _, _ = node.validate_prompts(json_object=[nameless], strict=[True])
+    assert objects == []
+    
+    try:
+        node.validate_prompts(on_invalid=["stop"], json_object=[{"camera": "wide"}])
+        assert False, "stop mode raises"
+    except ValueError as e:
+        assert "camera: expected object, got string" in str(e)
+    print("  drop / keep / stop behave as documented\n")
+
+
+def test_matches_jsonschema():
+    """Same verdict as a generic JSON Schema validator on random prompts"""
+    print("=== Testing Schema Validator vs jsonschema ===\n")
+    
+    if jsonschema is None:
+        print("  jsonschema not installed, skipped\n")
+        return
+    rng = random.Random(3)
+    values = ["x", 1, 0, -2.5, True, None, [], ["a"], ["a", 1], {}, {"description": "d"},
+              {"description": 1}, {"position": "p"}, {"description": "d", "extra": 1}]
+    for schema in (FLUX2_SCHEMA, FLUX2_STRICT_SCHEMA):
+        generic = jsonschema.Draft7Validator(schema)
+        validator = SchemaValidator(schema)
+        for _ in range(2500):
+            prompt = {}
+            for name in ("scene", "subjects", "color_palette", "camera", "mood", "colour"):
+                if rng.random() < 0.5:
+                    if name == "subjects":
+                        prompt[name] = [rng.choice(values) for _ in range(rng.randint(0, 3))]
+                    elif name == "camera":
+                        prompt[name] = {rng.choice(["lens-mm", "ISO", "angle", "zoom"]): rng.choice(values)}
+                    else:
+                        prompt[name] = rng.choice(values)
+            assert validator.is_valid(prompt) == generic.is_valid(prompt), prompt
+            assert (validator.errors(prompt) == []) == generic.is_valid(prompt), prompt
+    print("  5000 random prompts get the same verdict\n")
+
+
+if __name__ == "__main__":
+    test_valid_prompts()
+    test_errors_have_paths()
+    test_batch_report()
+    test_validator_node()
+    test_matches_jsonschema()
+    print("All schema validator tests passed!")
@@ -0,0 +1,124 @@
+"""
+Test script for FLUX2_PromptSweep batch assembly
+"""
+
+import itertools
+import json
+
+from nodes.prompt_sweep import FLUX2_PromptSweep, SweepSpace
+
+
+def test_sweep_space_cartesian():
+    """Index decoding matches itertools.product order"""
+    print("=== Testing SweepSpace - Cartesian ===\n")
+    
+    scenes = ["Studio", "Office", "Kitchen"]
+    moods = ["Calm", "Bold"]
+    styles = ["Film", "Digital", "Oil", "Ink"]
+    space = SweepSpace([("scene", scenes), ("mood", moods), ("style", styles)])
+    
+    expected = list(itertools.product(scenes, moods, styles))
+    assert len(space) == len(expected) == 24
+    for index, combo in enumerate(expected):
+        item = space[index]
+        assert (item["scene"], item["mood"], item["style"]) == combo
+    assert space[-1] == {"scene": "Kitchen", "mood": "Bold", "style": "Ink"}
+    print(f"  {len(space)} combinations decoded in product order\n")
+
+
+def test_sweep_space_zip_and_empty_axes():
+    """Zip pairs values and empty axes are ignored"""
+    print("=== Testing SweepSpace - Zip ===\n")
+    
+    space = SweepSpace([("scene", ["A", "B", "C"]), ("mood", ["x", "y"]), ("style", [])],
+                       mode="zip")
+    assert len(space) == 2
+    assert list(space) == [{"scene": "A", "mood": "x"}, {"scene": "B", "mood": "y"}]
+    print(f"  Zip items: {list(space)}\n")
+    
+    try:
+        space[2]
+        assert False, "expected IndexError"
+    except IndexError:
+        print("  Out of range index rejected\n")
+    
+    # Nothing to vary: one empty combination, as in itertools.product()
+    for mode in SweepSpace.MODES:
+        space = SweepSpace([("scene", []), ("mood", [])], mode=mode)
+        assert len(space) == 1 and list(space) == [{}]
+
+
+def test_sweep_random_access_large_product():
+    """Item k of a huge product is produced without materializing it"""
+    print("=== Testing SweepSpace - Random Access ===\n")
+    
+    axis = [str(i) for i in range(1000)]
+    space = SweepSpace([("a", axis), ("b", axis), ("c", axis), ("d", axis)])
+    assert len(space) == 10 ** 12
+    assert space[123456789012] == {"a": "123", "b": "456", "c": "789", "d": "12"}
+    print(f"  Item 123456789012 of {len(space)}: {space[123456789012]}\n")
+
+
+def test_sweep_node():
+    """Node returns one assembled prompt per combination"""
+    print("=== Testing FLUX2_PromptSweep ===\n")
+    
+    node = FLUX2_PromptSweep()
+    json_strings, json_objects, total = node.sweep_prompts(
+        mode="cartesian",
+        scene_values="Studio\nOffice\n",
+        mood_values="Calm\nBold",
+        camera_presets="Portrait\nMacro",
+        background="Plain grey wall",
+        pretty_print=False
+    )
+    assert total == 8
+    assert len(json_strings) == len(json_objects) == 8
+    assert json_objects[0]["scene"] == "Studio"
+    assert json_objects[0]["mood"] == "Calm"
+    assert json_objects[0]["camera"]["lens-mm"] == 85
+    assert json_objects[1]["camera"]["lens-mm"] == 100
+    assert json_objects[-1]["scene"] == "Office"
+    assert all(obj["background"] == "Plain grey wall" for obj in json_objects)
+    assert json.loads(json_strings[3]) == json_objects[3]
+    print(f"  First prompt: {json_strings[0]}\n")
+    
+    # Windowing into the sweep
+    json_strings, json_objects, total = node.sweep_prompts(
+        scene_values="Studio\nOffice",
+        mood_values="Calm\nBold",
+        start_index=2,
+        max_prompts=1
+    )
+    assert total == 4
+    assert json_objects == [{"scene": "Office", "mood": "Calm"}]
+    print(f"  Window [2:3]: {json_objects}\n")
+    
+    # "All remaining" is capped instead of running for ever
+    axis = "\n".join(str(i) for i in range(1000))
+    try:
+        node.sweep_prompts(scene_values=axis, mood_values=axis)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "1,000,000" in str(e) and "max_prompts" in str(e)
+    json_strings, _, total = node.sweep_prompts(scene_values=axis, mood_values=axis,
+                                                start_index=999_990)
+    assert total == 10 ** 6 and len(json_strings) == 10
+    _, json_objects, _ = node.sweep_prompts(scene_values="A\nB", start_index=5)
+    assert json_objects == []
+    print("  Oversized window rejected\n")
+    
+    # With nothing swept the shared fields still make one prompt
+    json_strings, json_objects, total = node.sweep_prompts(background="Plain grey wall",
+                                                           composition="Centered")
+    assert total == 1 and len(json_strings) == 1
+    assert json_objects == [{"background": "Plain grey wall", "composition": "Centered"}]
+    print(f"  Nothing swept: {json_objects}\n")
+
+
+if __name__ == "__main__":
+    test_sweep_space_cartesian()
+    test_sweep_space_zip_and_empty_axes()
+    test_sweep_random_access_large_product()
+    test_sweep_node()
+    print("All sweep tests passed!")
@@ -0,0 +1,107 @@
+"""
+Test script for placeholder templates and FLUX2_PromptTemplate
+"""
+
+import json
+
+from nodes.batch_generate import generate
+from nodes.prompt_template import (FLUX2_PromptTemplate, TemplateError, compile_template,
+                                   parse_variables)
+
+
+def test_compile_and_render():
+    """Templates compile once and render rows by column position"""
+    print("=== Testing Prompt Template - Compile ===\n")
+    
+    template = compile_template("{product} on {surface}, {time|golden hour} lighting, 100% {{sharp}}")
+    assert compile_template(template.text) is template
+    assert template.variables == ("product", "surface", "time")
+    assert template.required == ("product", "surface")
+    
+    render = template.bind(["surface", "product", "time"])
+    assert render(["oak", "Mug", "morning"]) == "Mug on oak, morning lighting, 100% {sharp}"
+    assert render(["oak", "Mug", ""]) == "Mug on oak, golden hour lighting, 100% {sharp}"
+    # Fallback variables may be missing from the table altogether
+    assert template.bind(["product", "surface"])(["Bag", "marble"]).startswith("Bag on marble, golden hour")
+    assert compile_template("{a}-{a}").render({"a": "x"}) == "x-x"
+    print(f"  Pattern: {template.pattern!r}\n")
+
+
+def test_errors_at_compile_time():
+    """Malformed templates and undefined variables fail before rendering"""
+    print("=== Testing Prompt Template - Errors ===\n")
+    
+    for text in ["{product", "product}", "{}", "{9lives}"]:
+        try:
+            compile_template(text)
+            assert False, f"{text!r} should not compile"
+        except TemplateError:
+            pass
+    
+    try:
+        compile_template("{product} on {surfce}").bind(["product", "surface"])
+        assert False, "Undefined variable should raise"
+    except TemplateError as e:
+        assert "surfce" in str(e)
+        print(f"  {e}")
+    
+    message = FLUX2_PromptTemplate.VALIDATE_INPUTS("product\nMug", "{product} {colour}")
+    assert isinstance(message, str) and "colour" in message
+    assert FLUX2_PromptTemplate.VALIDATE_INPUTS("product\nMug", "{product}") is True
+    # Linked variables are unknown during validation
+    assert FLUX2_PromptTemplate.VALIDATE_INPUTS(None, "{product} {colour}") is True
+    print(f"  VALIDATE_INPUTS: {message}\n")
+
+
+def test_template_node():
+    """The node renders one scene/style/subject per table row"""
+    print("=== Testing FLUX2_PromptTemplate ===\n")
+    
+    header, _ = parse_variables("product\tsurface\nMug\toak")
+    assert header == ["product", "surface"]
+    header, rows = parse_variables("product,surface\nMug,oak\n\n\"Bag, leather\",marble,extra\nLamp")
+    assert rows == [["Mug", "oak"], ["Bag, leather", "marble"], ["Lamp", ""]]
+    
+    scenes, styles, subjects, count = FLUX2_PromptTemplate().render_templates(
+        "product,surface\nMug,oak\nLamp,",
+        scene_template="{product} on {surface|a plain table}",
+        subject_template="{product}")
+    assert count == 2
+    assert scenes == ["Mug on oak", "Lamp on a plain table"]
+    assert styles == ["", ""]
+    assert [subject["description"] for subject in subjects] == ["Mug", "Lamp"]
+    print(f"  Scenes: {scenes}\n")
+
+
+def test_batch_templates():
+    """The batch generator fills columns from templates"""
+    print("=== Testing Prompt Template - Batch Rows ===\n")
+    
+    rows = [{"product": "Mug", "surface": "oak", "mood": "Calm"},
+            {"product": "Bag", "surface": "marble", "mood": ""}]
+    templates = {"scene": "{product} on {surface}", "subject.description": "{product}, studio lit"}
+    prompts = [json.loads(line) for lines, _ in generate(rows, templates=templates) for line in lines]
+    assert prompts[0] == {"scene": "Mug on oak", "subjects": [{"description": "Mug, studio lit"}],
+                          "mood": "Calm"}
+    assert prompts[1]["scene"] == "Bag on marble"
+    print(f"  {len(prompts)} prompts from templates\n")
+
+
+def run_all_tests():
+    """Run all prompt template tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Prompt Template - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_compile_and_render()
+    test_errors_at_compile_time()
+    test_template_node()
+    test_batch_templates()
+    
+    print("=" * 60)
+    print("All prompt template tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
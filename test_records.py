@@ -0,0 +1,142 @@
+"""
+Test script for the immutable subject and camera records
+"""
+
+import json
+import pickle
+
+from nodes.base import FLUX2Presets, FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.prompt_emitter import emit_prompt
+from nodes.records import CameraRecord, SubjectRecord
+
+
+def test_record_behaves_like_mapping():
+    """Records read like the dicts they replace and cannot be mutated"""
+    print("=== Testing Records - Mapping Interface ===\n")
+    
+    subject = FLUX2Types.create_subject("Woman in red coat", position="left",
+                                        color_palette=["#FF0000"])
+    expected = {"description": "Woman in red coat", "position": "left",
+                "color_palette": ["#FF0000"]}
+    assert isinstance(subject, SubjectRecord)
+    assert dict(subject) == expected and subject == expected
+    assert list(subject) == ["description", "position", "color_palette"]
+    assert subject.get("pose") is None and "pose" not in subject
+    assert subject["color_palette"] == ["#FF0000"]
+    
+    # Returned lists are copies; the record itself is frozen
+    subject["color_palette"].append("#000000")
+    assert subject["color_palette"] == ["#FF0000"]
+    try:
+        subject.position = "right"
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("expected AttributeError")
+    print(f"  {subject!r}\n")
+
+
+def test_hash_eq_and_pickle():
+    """Equal records hash alike and survive a pickle round-trip"""
+    print("=== Testing Records - Hashing and Pickle ===\n")
+    
+    first = FLUX2Types.create_subject("Dog", action="running", color_palette=["#AA7744"])
+    second = FLUX2Types.create_subject("Dog", action="running", color_palette=["#AA7744"])
+    other = FLUX2Types.create_subject("Dog", action="sleeping")
+    assert first == second and hash(first) == hash(second)
+    assert first != other
+    assert len({first, second, other}) == 2
+    
+    first.json_fragment()  # Populate the cache before pickling
+    restored = pickle.loads(pickle.dumps(first))
+    assert restored == first and hash(restored) == hash(first)
+    assert restored.json_fragment() == first.json_fragment()
+    print("  Hash, equality and pickle consistent\n")
+
+
+def test_palette_cannot_leak():
+    """No way of reading a record hands out its stored palette"""
+    print("=== Testing Records - Palette Copies ===\n")
+    
+    subject = FLUX2Types.create_subject("Snowman", color_palette=["#FFFFFF"])
+    key, fingerprint = hash(subject), subject.fingerprint()
+    fragment = subject.json_fragment(pretty=False)
+    
+    dict(subject)["color_palette"].append("#000000")
+    {**subject}["color_palette"].append("#000000")
+    dict(subject.items())["color_palette"].append("#000000")
+    list(subject.values())[-1].append("#000000")
+    subject.copy()["color_palette"].append("#000000")
+    subject.to_dict()["color_palette"].append("#000000")
+    
+    assert hash(subject) == key and subject.fingerprint() == fingerprint
+    assert subject.json_fragment(pretty=False) == fragment
+    assert subject == {"description": "Snowman", "color_palette": ["#FFFFFF"]}
+    prompt_json, _ = FLUX2_PromptAssembler().assemble_prompt(subjects=[subject],
+                                                             pretty_print=False)
+    assert json.loads(prompt_json)["subjects"][0]["color_palette"] == ["#FFFFFF"]
+    print(f"  {fragment}\n")
+
+
+def test_camera_from_preset():
+    """create_camera keeps the preset key names and drops ISO as before"""
+    print("=== Testing Records - Camera Presets ===\n")
+    
+    preset = FLUX2Presets.CAMERA_PRESETS["Portrait"]
+    camera = FLUX2Types.create_camera(**preset)
+    assert isinstance(camera, CameraRecord)
+    assert dict(camera) == {key: value for key, value in preset.items() if key != "ISO"}
+    
+    explicit = FLUX2Types.create_camera(angle="low angle", lens_mm=35, f_number="f/2.8")
+    assert list(explicit) == ["angle", "lens-mm", "f-number"]
+    print(f"  {dict(camera)}\n")
+
+
+def test_emitted_json_matches_dicts():
+    """Prompts built from records are byte-identical to dict-built prompts"""
+    print("=== Testing Records - Emitted JSON ===\n")
+    
+    subjects = [FLUX2Types.create_subject("Chef", position="  ", pose="arms crossed"),
+                FLUX2Types.create_subject("Sous chef", color_palette=["#FFFFFF", "#333333"])]
+    camera = FLUX2Types.create_camera(angle="eye level", lens_mm=50, focus="sharp")
+    plain_subjects = [subject.to_dict() for subject in subjects]
+    plain_camera = camera.to_dict()
+    
+    for pretty in (True, False):
+        for remove_empty in (True, False):
+            from_records = emit_prompt(scene="Kitchen", subjects=subjects, camera=camera,
+                                       pretty=pretty, remove_empty=remove_empty)
+            from_dicts = emit_prompt(scene="Kitchen", subjects=plain_subjects,
+                                     camera=plain_camera, pretty=pretty,
+                                     remove_empty=remove_empty)
+            assert from_records == from_dicts
+    
+    # Whitespace-only fields are dropped like in remove_empty_fields
+    prompt_json, prompt_obj = FLUX2_PromptAssembler().assemble_prompt(
+        scene="Kitchen", subjects=subjects, camera=camera)
+    assert "position" not in prompt_obj["subjects"][0]
+    assert json.loads(prompt_json) == prompt_obj
+    assert type(prompt_obj["camera"]) is dict
+    print("  Record and dict prompts identical\n")
+
+
+def run_all_tests():
+    """Run all record tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Records - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_record_behaves_like_mapping()
+    test_hash_eq_and_pickle()
+    test_palette_cannot_leak()
+    test_camera_from_preset()
+    test_emitted_json_matches_dicts()
+    
+    print("=" * 60)
+    print("All record tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,105 @@
+"""
+Test script for lazy node registration
+"""
+
+import os
+import subprocess
+import sys
+
+from nodes.registry import NODE_CLASS_MAPPINGS, NODE_DISPLAY_NAME_MAPPINGS, NODE_SPECS
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_mappings_resolve():
+    """Every registered name resolves to a node class with the expected API"""
+    print("=== Testing Node Registry - Resolution ===\n")
+    
+    assert set(NODE_CLASS_MAPPINGS) == set(NODE_DISPLAY_NAME_MAPPINGS) == set(NODE_SPECS)
+    for name, node_class in NODE_CLASS_MAPPINGS.items():
+        assert node_class.__name__ == name
+        assert hasattr(node_class, node_class.FUNCTION)
+        assert isinstance(node_class.INPUT_TYPES(), dict)
+    assert NODE_CLASS_MAPPINGS["FLUX2_SceneBuilder"] is NODE_CLASS_MAPPINGS["FLUX2_SceneBuilder"]
+    print(f"  {len(NODE_CLASS_MAPPINGS)} nodes resolved\n")
+
+
+def test_package_import_is_lazy():
+    """Importing the package loads no node modules until a class is looked up"""
+    print("=== Testing Node Registry - Lazy Import ===\n")
+    
+    probe = f"""
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location(
+    "flux2_pack", {os.path.join(ROOT, "__init__.py")!r}, submodule_search_locations=[{ROOT!r}])
+package = importlib.util.module_from_spec(spec)
+sys.modules["flux2_pack"] = package
+spec.loader.exec_module(package)
+assert "flux2_pack.nodes.base" not in sys.modules
+assert len(package.NODE_CLASS_MAPPINGS) == {len(NODE_SPECS)}
+assert "FLUX2_CameraRig" in package.NODE_CLASS_MAPPINGS
+assert "flux2_pack.nodes.camera_rig" not in sys.modules
+rig = package.FLUX2_CameraRig
+assert rig is package.NODE_CLASS_MAPPINGS["FLUX2_CameraRig"]
+assert "flux2_pack.nodes.camera_rig" in sys.modules
+assert "flux2_pack.nodes.prompt_sweep" not in sys.modules
+assert "flux2_pack.nodes.http_api" not in sys.modules and "aiohttp" not in sys.modules
+print("ok")
+"""
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+    print("  Node modules imported on first lookup only\n")
+
+
+def test_http_route_under_comfyui():
+    """With ComfyUI's PromptServer present the assemble route is added"""
+    print("=== Testing Node Registry - HTTP Route ===\n")
+    
+    probe = f"""
+import importlib.util, sys, types
+from aiohttp import web
+server = types.ModuleType("server")
+server.PromptServer = types.SimpleNamespace(instance=types.SimpleNamespace(routes=web.RouteTableDef()))
+sys.modules["server"] = server
+spec = importlib.util.spec_from_file_location(
+    "flux2_pack", {os.path.join(ROOT, "__init__.py")!r}, submodule_search_locations=[{ROOT!r}])
+package = importlib.util.module_from_spec(spec)
+sys.modules["flux2_pack"] = package
+spec.loader.exec_module(package)
+routes = server.PromptServer.instance.routes
+assert [(route.method, route.path) for route in routes] == [("POST", "/flux2/assemble")]
+assert "flux2_pack.nodes.base" not in sys.modules
+print("ok")
+"""
+    if aiohttp is None:
+        print("  aiohttp not installed, skipped\n")
+        return
+    result = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
+    print("  Route added to PromptServer\n")
+
+
+def run_all_tests():
+    """Run all registry tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Node Registry - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_mappings_resolve()
+    test_package_import_is_lazy()
+    test_http_route_under_comfyui()
+    
+    print("=" * 60)
+    print("All registry tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,82 @@
+"""
+Test script for the pluggable JSON serialization backends
+"""
+
+import json
+
+from nodes import serialization
+from nodes.base import FLUX2BaseNode
+
+
+PROMPT = {
+    "scene": "Neo-Tokyo highway at night",
+    "subjects": [
+        {
+            "description": "Red motorcycle with \"plasma\" trails",
+            "position": "center foreground",
+            "color_palette": ["#E30B17", "#7DFDFE"]
+        },
+        {"description": "Brutalist towers — café signage", "color_palette": []}
+    ],
+    "style": "1980s anime cel",
+    "camera": {"lens-mm": 35, "f-number": "f/2.8", "ISO": 800},
+    "empty": {}
+}
+
+
+def test_backends_match_stdlib():
+    """Every registered backend produces the stdlib output for prompt data"""
+    print("=== Testing Serialization Backends ===\n")
+    
+    for name in serialization.BACKENDS:
+        for pretty in (True, False):
+            for canonical in (True, False):
+                expected = serialization.dumps(PROMPT, pretty=pretty, canonical=canonical,
+                                               backend="json")
+                actual = serialization.dumps(PROMPT, pretty=pretty, canonical=canonical,
+                                             backend=name)
+                assert actual == expected, (name, pretty, canonical)
+        print(f"  {name}: matches stdlib output")
+    print()
+
+
+def test_canonical_compact_mode():
+    """Canonical compact output sorts keys with minimal separators"""
+    print("=== Testing Canonical Mode ===\n")
+    
+    text = FLUX2BaseNode.format_json_output({"b": 1, "a": [1, 2]}, pretty=False, canonical=True)
+    assert text == '{"a":[1,2],"b":1}'
+    
+    # Default pretty output is unchanged from the original json.dumps call
+    assert FLUX2BaseNode.format_json_output(PROMPT) == json.dumps(PROMPT, indent=2,
+                                                                   ensure_ascii=False)
+    print(f"  Canonical: {text}\n")
+
+
+def test_backend_selection():
+    """Backends can be chosen by name and unknown names are rejected"""
+    print("=== Testing Backend Selection ===\n")
+    
+    try:
+        serialization.set_backend("json")
+        assert serialization.get_backend().name == "json"
+    finally:
+        serialization.set_backend(None)
+    
+    try:
+        serialization.get_backend("no-such-backend")
+        assert False, "expected ValueError"
+    except ValueError as e:
+        print(f"  Rejected: {e}")
+    
+    # Values the native encoder cannot handle fall back to the stdlib
+    big = {"seed": 2 ** 70}
+    assert serialization.dumps(big, pretty=False, canonical=True) == '{"seed":1180591620717411303424}'
+    print(f"  Active backend: {serialization.get_backend().name}\n")
+
+
+if __name__ == "__main__":
+    test_backends_match_stdlib()
+    test_canonical_compact_mode()
+    test_backend_selection()
+    print("All serialization tests passed!")
@@ -0,0 +1,101 @@
+"""
+Test script for SubjectArray structural sharing and the dynamic array node
+"""
+
+import json
+
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.subject_array import FLUX2_SubjectArray, FLUX2_SubjectArrayDynamic, SubjectArray
+
+
+def make_subjects(count, start=0):
+    return [{"description": f"Person {i}", "position": "background"}
+            for i in range(start, start + count)]
+
+
+def test_structural_sharing():
+    """Extending an array shares the parent's subjects instead of copying"""
+    print("=== Testing SubjectArray - Structural Sharing ===\n")
+    
+    first = make_subjects(3)
+    root = SubjectArray(first)
+    child = root.extend(make_subjects(2, start=3))
+    sibling = root.extend(make_subjects(1, start=10))
+    
+    assert len(root) == 3 and len(child) == 5 and len(sibling) == 4
+    assert child._parent is root and sibling._parent is root
+    assert child[0] is first[0]
+    assert child[-1]["description"] == "Person 4"
+    assert sibling[3]["description"] == "Person 10"
+    assert child == make_subjects(5)
+    assert root.extend([]) is root
+    assert child[1:3] == make_subjects(2, start=1)
+    try:
+        child[5]
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("expected IndexError")
+    print(f"  {len(child)} subjects over {len(child._segments())} shared segments\n")
+
+
+def test_dynamic_node_chain():
+    """Dynamic nodes accept any subject_N and append to upstream arrays"""
+    print("=== Testing FLUX2_SubjectArrayDynamic ===\n")
+    
+    node = FLUX2_SubjectArrayDynamic()
+    crowd = {f"subject_{i}": subject for i, subject in enumerate(make_subjects(40), 1)}
+    crowd["subject_7"] = None  # Unconnected slot
+    subjects, count, summary = node.extend_subjects(**crowd)
+    assert count == 39
+    assert subjects[6]["description"] == "Person 7"
+    
+    # Chain from the fixed 8-slot node and from another dynamic node
+    fixed, _, _ = FLUX2_SubjectArray().collect_subjects(subject_1={"description": "Stage"})
+    stage, _, _ = node.extend_subjects(subjects_in=fixed, subject_1={"description": "Lights"})
+    chained, count, summary = node.extend_subjects(subjects_in=stage, subject_10=subjects[0],
+                                                   subject_2=subjects[1])
+    assert count == 4
+    assert [s["description"] for s in chained] == ["Stage", "Lights", "Person 1", "Person 0"]
+    assert chained._parent is stage
+    assert summary.startswith("Total subjects: 4")
+    print(f"  {count} subjects after chaining\n")
+
+
+def test_assembler_accepts_shared_arrays():
+    """Assembler output and fingerprints match an equivalent plain list"""
+    print("=== Testing Assembler with SubjectArray ===\n")
+    
+    subjects = SubjectArray(make_subjects(2)).extend(make_subjects(2, start=2))
+    plain = make_subjects(4)
+    assembler = FLUX2_PromptAssembler()
+    
+    for remove_empty in (True, False):
+        shared_json, shared_obj = assembler.assemble_prompt(scene="Crowd", subjects=subjects,
+                                                            remove_empty=remove_empty)
+        plain_json, plain_obj = assembler.assemble_prompt(scene="Crowd", subjects=plain,
+                                                          remove_empty=remove_empty)
+        assert shared_json == plain_json
+        assert json.loads(shared_json) == plain_obj
+    assert (FLUX2_PromptAssembler.IS_CHANGED(subjects=subjects)
+            == FLUX2_PromptAssembler.IS_CHANGED(subjects=plain))
+    print("  Shared arrays assemble like plain lists\n")
+
+
+def run_all_tests():
+    """Run all subject array tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Subject Array - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_structural_sharing()
+    test_dynamic_node_chain()
+    test_assembler_accepts_shared_arrays()
+    
+    print("=" * 60)
+    print("All subject array tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
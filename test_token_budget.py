@@ -0,0 +1,126 @@
+"""
+Test script for the token estimator and FLUX2_TokenBudget
+"""
+
+from nodes import token_budget
+from nodes.base import FLUX2Types
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.token_budget import (FLUX2_TokenBudget, HeuristicTokenizer, TokenCounter, VocabTokenizer,
+                                fit_prompt, register_tokenizer, token_counter, tokenizer_names)
+
+
+def long_prompt(subject_count=12):
+    subjects = [FLUX2Types.create_subject(f"Commuter {i} in a long weathered coat carrying an umbrella",
+                                          "left side, middle, foreground", "walking briskly")
+                for i in range(subject_count)]
+    return FLUX2_PromptAssembler().assemble_prompt(
+        scene="Rainy neon street at night with reflections on wet asphalt",
+        subjects=subjects,
+        style="Cinematic movie still with dramatic lighting and atmospheric haze",
+        lighting="Neon signs and car headlights",
+        mood="Tense and suspenseful",
+        composition="Rule of thirds with leading lines along the curb",
+        camera=FLUX2Types.create_camera(angle="Low angle", lens_mm=35, iso=800))
+
+
+def test_tokenizers():
+    """Bundled and heuristic counts agree roughly; fragments sum to the whole"""
+    print("=== Testing Token Estimators ===\n")
+    
+    vocab = VocabTokenizer()
+    assert vocab.tokens('{"scene": "Studio"}') == ["{", '"', "▁scene", '":', '"', "▁studio", '"', "}"]
+    assert vocab.count("") == 0 and HeuristicTokenizer().count("") == 0
+    assert vocab.count("ISO 800") == 4
+    
+    json_string, _ = long_prompt()
+    counter = TokenCounter(vocab)
+    total = counter.count(json_string)
+    assert total == vocab.count(json_string)
+    heuristic = token_counter("heuristic").count(json_string)
+    assert abs(heuristic - total) < total * 0.2, (heuristic, total)
+    
+    # Repeated subject lines are tokenized once
+    counter.count(json_string)
+    info = counter.cache_info()
+    assert info.hits > 3 * info.misses, info
+    print(f"  bundled {total} tokens, heuristic {heuristic}; cache {info.hits} hits / {info.misses} misses\n")
+
+
+def test_pluggable_tokenizers():
+    """Registered tokenizers are used by name; broken ones fall back to the heuristic"""
+    print("=== Testing Tokenizer Registry ===\n")
+    
+    class WordTokenizer:
+        name = "words"
+        
+        def count(self, text):
+            return len(text.split())
+    
+    def missing_file():
+        return VocabTokenizer("/nonexistent/vocab.txt")
+    
+    register_tokenizer("words", WordTokenizer)
+    register_tokenizer("missing", missing_file)
+    try:
+        assert {"bundled", "heuristic", "words", "missing"} <= set(tokenizer_names())
+        assert token_counter("words").count("one two, three\nfour") == 4
+        assert token_counter("missing").name == "heuristic"
+        try:
+            token_counter("no-such-tokenizer")
+            assert False, "unknown names raise"
+        except ValueError:
+            pass
+    finally:
+        for name in ("words", "missing"):
+            token_budget._FACTORIES.pop(name)
+            token_budget._counters.pop(name, None)
+    print("  Custom, missing and unknown tokenizers handled\n")
+
+
+def test_fit_prompt():
+    """Trimming follows the field order and stops as soon as the prompt fits"""
+    print("=== Testing Prompt Trimming ===\n")
+    
+    _, prompt = long_prompt()
+    counter = token_counter()
+    original = counter.count(FLUX2_PromptAssembler().assemble_prompt(**prompt)[0])
+    
+    json_string, trimmed, total, notes = fit_prompt(prompt, original - 40, counter)
+    assert total <= original - 40 and total == counter.count(json_string)
+    assert notes[0].startswith("composition") and "subjects" in trimmed and len(trimmed["subjects"]) == 12
+    assert len(prompt["subjects"]) == 12 and "composition" in prompt
+    
+    json_string, trimmed, total, notes = fit_prompt(prompt, 250, counter)
+    assert total <= 250
+    assert [note.split(":")[0] for note in notes] == ["composition", "lighting", "mood", "subjects"]
+    assert trimmed["scene"] == prompt["scene"] and trimmed["camera"] == prompt["camera"]
+    for note in notes:
+        print(f"  {note}")
+    print()
+
+
+def test_budget_node():
+    """The node passes prompts within budget, flags or trims the others"""
+    print("=== Testing FLUX2_TokenBudget Node ===\n")
+    
+    node = FLUX2_TokenBudget()
+    json_string, prompt = long_prompt(2)
+    result = node.check_budget(prompt, budget=512)
+    assert result[0] == json_string and result[1] == prompt and result[3].endswith("(bundled estimate)")
+    
+    _, prompt = long_prompt()
+    json_string, flagged, count, report = node.check_budget(prompt, budget=300, action="flag")
+    assert flagged == prompt and count > 300 and report.startswith("OVER BUDGET")
+    
+    json_string, trimmed, count, report = node.check_budget(prompt, budget=300, action="trim",
+                                                            pretty_print=False)
+    assert count <= 300 and "\n" not in json_string and report.startswith("Trimmed")
+    print(f"  {report.splitlines()[0]}\n")
+
+
+if __name__ == "__main__":
+    test_tokenizers()
+    test_pluggable_tokenizers()
+    test_fit_prompt()
+    test_budget_node()
+    print("All token budget tests passed!")
@@ -0,0 +1,87 @@
+"""
+Test script for the seeded variation sampler
+"""
+
+from nodes.prompt_assembler import FLUX2_PromptAssembler
+from nodes.variation_sampler import FLUX2_VariationSampler, IndexPermutation, VariationSampler
+from nodes.workflow_eval import map_widgets
+
+
+def test_permutation_is_bijective():
+    """Every size maps range(size) onto itself, and index_of inverts it"""
+    print("=== Testing Index Permutation ===\n")
+    
+    for size in (1, 2, 3, 7, 64, 1000, 4097):
+        for seed in (0, 1, 2 ** 63):
+            permutation = IndexPermutation(size, seed)
+            values = [permutation[index] for index in range(size)]
+            assert sorted(values) == list(range(size)), (size, seed)
+            assert all(permutation.index_of(value) == index for index, value in enumerate(values))
+    
+    assert [IndexPermutation(1000, 1)[i] for i in range(10)] != [IndexPermutation(1000, 2)[i] for i in range(10)]
+    assert [IndexPermutation(1000, 1)[i] for i in range(10)] != list(range(10))
+    try:
+        IndexPermutation(10, 0)[10]
+        assert False, "index past the end should raise"
+    except IndexError:
+        pass
+    print("  Bijective for sizes 1 to 4097\n")
+
+
+def test_samples_are_unique_and_reproducible():
+    """Sample (seed, index) is the same in a fresh sampler and never repeats"""
+    print("=== Testing Variation Sampler ===\n")
+    
+    sampler = VariationSampler(seed=1234)
+    samples = sampler.sample(0, 3000)
+    keys = {tuple(sorted((name, repr(value)) for name, value in sample.items())) for sample in samples}
+    assert len(keys) == len(samples)
+    
+    assert VariationSampler(seed=1234)[2999] == samples[2999]
+    assert VariationSampler(seed=1235)[0] != samples[0]
+    
+    # A small space is exhausted without repeats
+    small = VariationSampler(seed=9, dimensions=("camera", "mood"))
+    assert len(small) == 6 * 15
+    everything = small.sample()
+    assert len({(repr(s["camera"]), s["mood"]) for s in everything}) == len(small)
+    assert all(s["scene"] is None and s["position"] is None for s in everything)
+    print(f"  {len(samples)} unique samples from {len(sampler):,} combinations\n")
+
+
+def test_node_outputs():
+    """The node returns parallel lists that assemble into prompts"""
+    print("=== Testing FLUX2_VariationSampler Node ===\n")
+    
+    node = FLUX2_VariationSampler()
+    scenes, styles, cameras, moods, palettes, positions, indices, total = node.sample_variations(
+        seed=7, count=5, start_index=3, vary_palette=False)
+    assert indices == [3, 4, 5, 6, 7]
+    assert all(len(output) == 5 for output in (scenes, styles, cameras, moods, palettes, positions))
+    assert palettes == [None] * 5 and all(scenes) and all(positions)
+    assert total == len(VariationSampler(7, ("scene", "style", "camera", "mood", "position")))
+    
+    # Continuing a draw gives the same samples as one larger draw
+    first = node.sample_variations(seed=7, count=8, vary_palette=False)
+    assert first[0][3:] == scenes and first[6][3:] == indices
+    
+    json_string, prompt = FLUX2_PromptAssembler().assemble_prompt(
+        scene=scenes[0], style=styles[0], camera=cameras[0], mood=moods[0])
+    assert prompt["camera"]["lens-mm"] > 0 and prompt["mood"] == moods[0]
+    
+    # The end of a small space truncates the draw
+    outputs = node.sample_variations(seed=1, count=100, start_index=85, vary_scene=False,
+                                     vary_style=False, vary_palette=False, vary_position=False)
+    assert outputs[6] == list(range(85, 90)) and outputs[7] == 90
+    
+    # Saved workflows store a control value after the seed widget
+    mapped = map_widgets(FLUX2_VariationSampler, [42, "randomize", 16, 0, True, True, True, True, False, True])
+    assert mapped["seed"] == 42 and mapped["count"] == 16 and mapped["vary_palette"] is False
+    print(f"  Samples 3-7 of seed 7: {positions}\n")
+
+
+if __name__ == "__main__":
+    test_permutation_is_bijective()
+    test_samples_are_unique_and_reproducible()
+    test_node_outputs()
+    print("All variation sampler tests passed!")
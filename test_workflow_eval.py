@@ -0,0 +1,121 @@
+"""
+Test script for the headless workflow evaluator
+"""
+
+import json
+import os
+
+from nodes.camera_rig import FLUX2_CameraRig
+from nodes.workflow_eval import Workflow, WorkflowError, evaluate_workflow, map_widgets
+
+EXAMPLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples")
+
+
+def saved_output(path):
+    """The prompt a ShowText node captured when the workflow last ran"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    for node in data["nodes"]:
+        if node["type"].startswith("ShowText") and node.get("widgets_values"):
+            return json.loads(node["widgets_values"][0])
+    return None
+
+
+def test_examples_reproduce_saved_prompts():
+    """Evaluating example workflows gives the prompts ComfyUI produced"""
+    print("=== Testing Workflow Eval - Examples ===\n")
+    
+    for name in ["FLUX2-JSON-t2i-Akira-Plan-example-v12.json",
+                 "FLUX2-JSON-t2i-Godzilla-example-v12.json",
+                 "FLUX2-JSON-i2i-Akira-Plan-example-v15.json"]:
+        path = os.path.join(EXAMPLES, name)
+        prompts = evaluate_workflow(path)
+        assert prompts == [saved_output(path)], name
+        print(f"  {name}: {len(prompts[0]['subjects'])} subjects")
+    print()
+
+
+def test_map_widgets_aligns_old_values():
+    """Values saved by an older node version land on the right inputs"""
+    print("=== Testing Workflow Eval - Widget Alignment ===\n")
+    
+    # Saved before custom_distance existed
+    old = ["None", "Low angle", "", "Medium shot", 35, "", "f/2.8", 800, "Shallow focus", "", "Eyes", True]
+    mapped = map_widgets(FLUX2_CameraRig, old)
+    assert "custom_distance" not in mapped
+    assert mapped["distance"] == "Medium shot"
+    assert mapped["lens_mm"] == 35 and mapped["iso"] == 800
+    assert mapped["focus"] == "Eyes" and mapped["override_preset"] is True
+    
+    current = ["None", "a", "", "Custom", "far", 50, "", "", 0, "", "", "", False]
+    assert map_widgets(FLUX2_CameraRig, current)["custom_distance"] == "far"
+    print(f"  Mapped {len(mapped)} of {len(old)} saved values\n")
+
+
+def test_api_format_with_lists_and_overrides():
+    """API workflows run list outputs through downstream nodes"""
+    print("=== Testing Workflow Eval - API Format ===\n")
+    
+    workflow = Workflow({
+        "1": {"class_type": "FLUX2_PromptSweep",
+              "inputs": {"mode": "cartesian", "scene_values": "Harbor\nHarbor\nMarket",
+                         "subjects": ["3", 0], "pretty_print": False}},
+        "2": {"class_type": "FLUX2_PromptDedup", "inputs": {"json_object": ["1", 1]}},
+        "3": {"class_type": "FLUX2_SubjectArray", "inputs": {"subject_1": ["4", 0]}},
+        "4": {"class_type": "FLUX2_SubjectCreator", "inputs": {"description": "Lighthouse"}},
+        "5": {"class_type": "SaveImage", "inputs": {"images": ["9", 0]}},
+    })
+    assert workflow.order() == ["4", "3", "1", "2"]
+    
+    results = workflow.execute()
+    assert len(results["1"][1]) == 3
+    prompts = workflow.prompts(results)
+    assert [prompt["scene"] for prompt in prompts] == ["Harbor", "Market"]
+    assert prompts[0]["subjects"][0]["description"] == "Lighthouse"
+    
+    prompts = workflow.prompts(overrides={4: {"description": "Ferry"}, "1": {"scene_values": "Dock"}})
+    assert prompts == [{"scene": "Dock", "subjects": [{"description": "Ferry"}]}]
+    print(f"  Order {workflow.order()}, {len(prompts)} prompt after overrides\n")
+
+
+def test_errors():
+    """Cycles and failing nodes raise WorkflowError"""
+    print("=== Testing Workflow Eval - Errors ===\n")
+    
+    cyclic = Workflow({
+        "1": {"class_type": "FLUX2_SubjectArrayDynamic", "inputs": {"subjects_in": ["2", 0]}},
+        "2": {"class_type": "FLUX2_SubjectArrayDynamic", "inputs": {"subjects_in": ["1", 0]}},
+    })
+    try:
+        cyclic.execute()
+        assert False, "Cycle should raise"
+    except WorkflowError as e:
+        print(f"  Cycle: {e}")
+    
+    broken = Workflow({"1": {"class_type": "FLUX2_SubjectCreator", "inputs": {"position": "left"}}})
+    try:
+        broken.execute()
+        assert False, "Missing required input should raise"
+    except WorkflowError as e:
+        assert "FLUX2_SubjectCreator" in str(e)
+        print(f"  Failure: {e}\n")
+
+
+def run_all_tests():
+    """Run all workflow evaluator tests"""
+    print("\n" + "=" * 60)
+    print("FLUX2 Workflow Eval - Test Suite")
+    print("=" * 60 + "\n")
+    
+    test_examples_reproduce_saved_prompts()
+    test_map_widgets_aligns_old_values()
+    test_api_format_with_lists_and_overrides()
+    test_errors()
+    
+    print("=" * 60)
+    print("All workflow evaluator tests completed!")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -0,0 +1,52 @@
+/**
+ * FLUX2 Subject Array (Dynamic) - grow subject_N slots as they are connected
+ *
+ * Keeps exactly one free subject slot at the end of the node: connecting
+ * the last slot adds the next one, and trailing free slots are removed
+ * when links are disconnected.
+ */
+
+import { app } from "../../scripts/app.js";
+
+const NODE_NAME = "FLUX2_SubjectArrayDynamic";
+const PREFIX = "subject_";
+const SUBJECT_TYPE = "FLUX2_SUBJECT";
+
+function subjectInputs(node) {
+    return (node.inputs || []).filter((input) => input.name.startsWith(PREFIX));
+}
+
+function updateSubjectSlots(node) {
+    const inputs = subjectInputs(node);
+
+    // Drop trailing free slots, keeping one
+    while (inputs.length > 1 && inputs.at(-1).link == null && inputs.at(-2).link == null) {
+        node.removeInput(node.inputs.indexOf(inputs.pop()));
+    }
+
+    const last = inputs.at(-1);
+    if (!last || last.link != null) {
+        const next = last ? parseInt(last.name.slice(PREFIX.length), 10) + 1 : 1;
+        node.addInput(`${PREFIX}${next}`, SUBJECT_TYPE);
+    }
+}
+
+app.registerExtension({
+    name: "FLUX2.SubjectArrayDynamic",
+
+    async beforeRegisterNodeDef(nodeType, nodeData) {
+        if (nodeData.name !== NODE_NAME) {
+            return;
+        }
+
+        const onConnectionsChange = nodeType.prototype.onConnectionsChange;
+        nodeType.prototype.onConnectionsChange = function (type, index, connected, linkInfo, slot) {
+            const result = onConnectionsChange?.apply(this, arguments);
+            if (type === LiteGraph.INPUT && slot?.name?.startsWith(PREFIX)) {
+                // Defer until LiteGraph has finished updating the link
+                requestAnimationFrame(() => updateSubjectSlots(this));
+            }
+            return result;
+        };
+    },
+});